@@ -87,9 +87,21 @@ class HomepageContent(BaseModel):
         )
     ])
     updated_at: datetime = Field(default_factory=datetime.now)
+    revision: int = Field(default=0)  # Incremented on every write
+
+class HomepageContentPartial(BaseModel):
+    # Sparse fieldset of HomepageContent (?fields=); only requested fields are sent
+    id: Optional[str] = None
+    hero: Optional[HomepageHeroContent] = None
+    features: Optional[List[HomepageFeature]] = None
+    testimonials: Optional[List[HomepageTestimonial]] = None
+    demo_items: Optional[List[HomepageDemoItem]] = None
+    updated_at: Optional[datetime] = None
+    revision: Optional[int] = None
 
 class HomepageContentUpdate(BaseModel):
     hero: Optional[HomepageHeroContent] = None
     features: Optional[List[HomepageFeature]] = None
     testimonials: Optional[List[HomepageTestimonial]] = None
-    demo_items: Optional[List[HomepageDemoItem]] = None
\ No newline at end of file
+    demo_items: Optional[List[HomepageDemoItem]] = None
+    revision: Optional[int] = None  # Revision the edit is based on; stale edits get 409
\ No newline at end of file
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class ModelBoundingBox(BaseModel):
+    min: List[float]  # x, y, z
+    max: List[float]
+
+class ModelMetadata(BaseModel):
+    filename: str
+    url: str
+    format: str  # "ply" or "splat"
+    format_version: Optional[str] = None  # PLY format line, e.g. "binary_little_endian 1.0"
+    gaussian_count: int
+    sh_degree: int
+    bounding_box: Optional[ModelBoundingBox] = None  # None for empty models
+    byte_size: int
+    sha256: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class ModelMetadataList(BaseModel):
+    items: List[ModelMetadata] = Field(default_factory=list)
+    total: int
+    limit: int
+    skip: int
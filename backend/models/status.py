@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+import uuid
+
+class StatusCheck(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_name: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class StatusCheckCreate(BaseModel):
+    client_name: str
+
+class StatusCheckPage(BaseModel):
+    items: List[StatusCheck] = Field(default_factory=list)
+    limit: int
+    next_cursor: Optional[str] = None  # Pass as `after` for the next page; None on the last page
+
+class StatusRollup(BaseModel):
+    client_name: str
+    bucket: datetime  # Start of the minute or hour
+    count: int
+
+class StatusRollupList(BaseModel):
+    granularity: str
+    items: List[StatusRollup] = Field(default_factory=list)
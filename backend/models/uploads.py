@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    file_size: int = Field(ge=0)  # Total size in bytes
+    chunk_size: Optional[int] = Field(default=None)  # Server default when omitted
+
+class UploadSessionStatus(BaseModel):
+    session_id: str
+    filename: str
+    file_size: int
+    chunk_size: int
+    chunk_count: int
+    created_at: str
+    received_chunks: List[int] = Field(default_factory=list)
+    missing_chunks: List[int] = Field(default_factory=list)
+    offset: int = Field(default=0)  # Bytes received contiguously from the start
+    complete: bool = Field(default=False)
+
+class DirectUploadCreate(BaseModel):
+    filename: str
+    file_size: int = Field(ge=0)  # Total size in bytes
+
+class DirectUploadPart(BaseModel):
+    part_number: int
+    url: str  # Presigned PUT URL for this part
+
+class DirectUploadSession(BaseModel):
+    upload_id: str
+    key: str
+    part_size: int
+    parts: List[DirectUploadPart] = Field(default_factory=list)
+
+class DirectUploadCompletedPart(BaseModel):
+    part_number: int = Field(ge=1)
+    etag: str  # ETag response header of the part upload
+
+class DirectUploadComplete(BaseModel):
+    filename: str
+    key: str
+    parts: List[DirectUploadCompletedPart] = Field(min_length=1)
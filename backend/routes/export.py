@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from backend.routes.homepage import get_admin_user
+from backend.routes.status import get_database
+from backend.services.export import (
+    EXPORT_SOURCES,
+    EXPORT_MEDIA_TYPES,
+    export_query,
+    export_documents,
+    export_position
+)
+from datetime import datetime
+from typing import Optional, Literal
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: Literal["status_checks", "model_metadata", "assets"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = Query(None, description="Only documents at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only documents before this time"),
+    after_id: Optional[str] = Query(None, description="Only documents after this one (_id, or id for status_checks), e.g. to resume an export"),
+    before_id: Optional[str] = Query(None, description="Only documents before this one (_id, or id for status_checks)"),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Stream a whole collection as NDJSON (one document per line) or CSV.
+    Only accessible to admin users. Documents come in _id order (status
+    checks: oldest first), so an interrupted download resumes with after_id
+    set to the last _id (status checks: id) received.
+    """
+    source = EXPORT_SOURCES[collection]
+    try:
+        query = export_query(
+            source,
+            since=since,
+            until=until,
+            after=await export_position(db, source, after_id) if after_id is not None else None,
+            before=await export_position(db, source, before_id) if before_id is not None else None
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return StreamingResponse(
+        export_documents(db, source, query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{collection}.{format}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no"
+        }
+    )
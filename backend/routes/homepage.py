@@ -1,13 +1,76 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Request, BackgroundTasks, Query
+from fastapi.responses import RedirectResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from backend.models.homepage import HomepageContent, HomepageContentUpdate
-from datetime import datetime
-from typing import Optional
-import uuid
-import base64
+from backend.models.homepage import (
+    HomepageContent,
+    HomepageContentPartial,
+    HomepageContentUpdate,
+    HomepageHeroContent,
+    HomepageFeature,
+    HomepageTestimonial,
+    HomepageDemoItem
+)
+from backend.models.uploads import (
+    UploadSessionCreate,
+    UploadSessionStatus,
+    DirectUploadCreate,
+    DirectUploadSession,
+    DirectUploadComplete
+)
+from backend.models.model_metadata import ModelMetadata, ModelMetadataList
+from backend.services.uploads import (
+    create_upload_session,
+    load_upload_session,
+    write_session_chunk,
+    get_session_status,
+    finalize_upload_session,
+    delete_upload_session,
+    temp_path_for
+)
+from backend.services.asset_store import (
+    store_upload,
+    store_file,
+    release_asset,
+    retain_assets,
+    sync_asset_refs,
+    store_direct_upload,
+    is_asset_filename,
+    asset_url,
+    filename_from_url,
+    IMMUTABLE_CACHE_CONTROL
+)
+from backend.services.file_responses import (
+    ranged_response,
+    content_disposition,
+    media_type_for
+)
+from backend.services.compression import (
+    is_compressible,
+    negotiate_encoding,
+    VARIANT_SUFFIXES
+)
+from backend.services.processing import process_upload, enqueue_processing, tier_filename
+from backend.services.splat import SPLAT_DTYPE
+from backend.services.model_index import list_model_metadata
+from backend.services.content_cache import ContentCache
+from backend.services.json_responses import render_json, rendered_json_response, RenderedJson
+from backend.services.change_watch import watch_collection, WATCH_RETRY_DELAY
+from backend.services.events import Broadcaster, ServerEvent, event_stream
+from backend.services.homepage_store import (
+    HOMEPAGE_SECTIONS,
+    update_homepage_fields,
+    save_published_snapshot,
+    rendered_snapshot,
+    RevisionConflict
+)
+from backend.services.inline_images import is_data_url, store_data_url
+from backend.services.storage import get_storage
+from backend.services.client_hints import select_model_tier, MODEL_TIER_ORDER, MODEL_CLIENT_HINTS
+from starlette.requests import ClientDisconnect
+from pymongo.errors import PyMongoError
+from typing import Optional, List, Literal, Tuple, Union
+import asyncio
 import os
-import aiofiles
 from pathlib import Path
 
 router = APIRouter(prefix="/api/homepage", tags=["homepage"])
@@ -16,6 +79,25 @@ router = APIRouter(prefix="/api/homepage", tags=["homepage"])
 UPLOAD_DIR = Path("/app/uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Maximum size for hero uploads (200MB)
+MAX_UPLOAD_SIZE = 200 * 1024 * 1024
+
+# Homepage content is served from memory. The public cache holds the published
+# snapshot and only changes on publish; the draft cache backs the preview and
+# is invalidated by every edit. The TTL (seconds) bounds staleness from other
+# workers if a change notification is missed.
+HOMEPAGE_CACHE_TTL = float(os.environ.get('HOMEPAGE_CACHE_TTL', '60'))
+published_cache = ContentCache(ttl=HOMEPAGE_CACHE_TTL)
+draft_cache = ContentCache(ttl=HOMEPAGE_CACHE_TTL)
+
+# Version poll interval (seconds) when the database has no change streams
+HOMEPAGE_POLL_INTERVAL = float(os.environ.get('HOMEPAGE_POLL_INTERVAL', '1'))
+
+# Publishes are pushed to open /events streams; idle streams get a heartbeat
+# comment every HOMEPAGE_EVENTS_HEARTBEAT seconds so proxies keep them open
+HOMEPAGE_EVENTS_HEARTBEAT = float(os.environ.get('HOMEPAGE_EVENTS_HEARTBEAT', '15'))
+homepage_events = Broadcaster()
+
 # This would normally be imported from auth, but for now we'll use a simple dependency
 async def get_admin_user():
     # In a real implementation, this would check authentication
@@ -25,27 +107,303 @@ def get_database():
     from backend.server import database
     return database
 
-@router.get("/content", response_model=HomepageContent)
+# Top-level fields a read can select with ?fields=
+HOMEPAGE_FIELDS = ("id",) + HOMEPAGE_SECTIONS + ("updated_at", "revision")
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ?fields= list into a canonical tuple in document
+    order, so every spelling of the same fieldset shares one cache entry.
+    Returns None when the whole document is wanted.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(HOMEPAGE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(HOMEPAGE_FIELDS)}"
+        )
+    if not requested:
+        return None
+    return tuple(name for name in HOMEPAGE_FIELDS if name in requested)
+
+def revision_conflict(e: RevisionConflict) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Homepage content was changed by another edit (now at revision {e.current_revision}); reload and retry"
+    )
+
+async def extract_inline_images(db: AsyncIOMotorDatabase, update_data: dict) -> list:
+    """
+    Replace base64 data URLs in an update with stored /uploads/ URLs, in place.
+    Returns the URLs stored; the caller owns one reference to each.
+    Raises a 400 HTTPException for a data URL that does not decode.
+    """
+    stored_urls = []
+    images = []
+    if update_data.get("hero"):
+        images.append((update_data["hero"], "hero_image_base64"))
+    for item in update_data.get("demo_items") or []:
+        images.append((item, "image_base64"))
+    
+    try:
+        for section, key in images:
+            if is_data_url(section.get(key)):
+                try:
+                    section[key] = await store_data_url(db, UPLOAD_DIR, section[key])
+                except ValueError as e:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Invalid image in {key}: {str(e)}"
+                    )
+                stored_urls.append(section[key])
+    except Exception:
+        await sync_asset_refs(db, UPLOAD_DIR, stored_urls, [])
+        raise
+    return stored_urls
+
+def content_asset_urls(content: HomepageContent) -> list:
+    """
+    Upload URLs referenced by a homepage document.
+    """
+    return [content.hero.hero_image_base64] + [item.image_base64 for item in content.demo_items]
+
+async def load_homepage_content(
+    db: AsyncIOMotorDatabase,
+    fields: Optional[Tuple[str, ...]] = None
+) -> HomepageContent:
+    """
+    Read the homepage document, or default content if none exists.
+    With fields, only those top-level fields are read from Mongo; the others
+    hold their defaults and should not be sent.
+    """
+    projection = None
+    if fields is not None:
+        projection = {"_id": 0, **{name: 1 for name in fields}}
+    
+    # Try to get existing content
+    content = await db.homepage_content.find_one({"id": "main"}, projection)
+    
+    if content:
+        # Convert MongoDB document to Pydantic model
+        if "_id" in content:
+            content["_id"] = str(content["_id"])
+        return HomepageContent(**content)
+    else:
+        # Return default content
+        return HomepageContent(id="main")
+
+async def load_published_content(
+    db: AsyncIOMotorDatabase,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Optional[HomepageContent]:
+    """
+    Read the content of the published snapshot, or None if nothing has been
+    published yet. With fields, only those top-level fields are read.
+    """
+    projection = {"_id": 0, "content": 1}
+    if fields is not None:
+        projection = {"_id": 0, **{f"content.{name}": 1 for name in fields}}
+    
+    snapshot = await db.homepage_published.find_one({"id": "main"}, projection)
+    if snapshot is None:
+        return None
+    return HomepageContent(**snapshot.get("content", {}))
+
+async def load_public_content(
+    db: AsyncIOMotorDatabase,
+    fields: Optional[Tuple[str, ...]] = None
+) -> HomepageContent:
+    content = await load_published_content(db, fields)
+    if content is None:
+        # Until the first publish the public sees the draft, as it always did
+        content = await load_homepage_content(db, fields)
+    return content
+
+async def watch_homepage_changes(db: AsyncIOMotorDatabase):
+    """
+    Keep this worker's homepage caches and event stream in step with edits
+    and publishes from every worker. Runs until cancelled.
+    """
+    published_changed = asyncio.Event()
+    
+    def on_published_change():
+        published_cache.invalidate()
+        published_changed.set()
+    
+    async def read_draft_version():
+        return await db.homepage_content.find_one({"id": "main"}, {"_id": 0, "revision": 1, "updated_at": 1})
+    
+    async def read_published_version():
+        return await db.homepage_published.find_one({"id": "main"}, {"_id": 0, "revision": 1, "published_at": 1})
+    
+    await asyncio.gather(
+        watch_collection(db.homepage_content, draft_cache.invalidate, read_draft_version, HOMEPAGE_POLL_INTERVAL),
+        watch_collection(db.homepage_published, on_published_change, read_published_version, HOMEPAGE_POLL_INTERVAL),
+        announce_published_changes(db, published_changed)
+    )
+
+async def announce_published_changes(db: AsyncIOMotorDatabase, changed: asyncio.Event):
+    """
+    Broadcast an event for every newly published revision, naming the
+    sections it changed. Bursts of changes are read once. Runs until cancelled.
+    """
+    digests = None
+    while True:
+        await changed.wait()
+        changed.clear()
+        try:
+            snapshot = await db.homepage_published.find_one(
+                {"id": "main"}, {"_id": 0, "revision": 1, "sections": 1, "published_at": 1}
+            )
+        except PyMongoError:
+            # Try again shortly; the change is not lost
+            changed.set()
+            await asyncio.sleep(WATCH_RETRY_DELAY)
+            continue
+        if snapshot is None or snapshot["revision"] == homepage_events.last_event_id:
+            continue
+        
+        # The first snapshot this worker sees may differ from anything a client has
+        sections = snapshot.get("sections") or {}
+        changed_sections = [
+            section for section in HOMEPAGE_SECTIONS
+            if digests is None or sections.get(section) != digests.get(section)
+        ]
+        digests = sections
+        homepage_events.publish(ServerEvent(
+            id=snapshot["revision"],
+            event="content",
+            data={
+                "revision": snapshot["revision"],
+                "sections": changed_sections,
+                "published_at": snapshot["published_at"].isoformat()
+            }
+        ))
+
+def resync_homepage_event(latest: ServerEvent) -> ServerEvent:
+    # Stands in for events that are no longer in history: everything may have changed
+    return ServerEvent(id=latest.id, event=latest.event, data={**latest.data, "sections": list(HOMEPAGE_SECTIONS)})
+
+def render_content(content: HomepageContent, fields: Optional[Tuple[str, ...]] = None) -> RenderedJson:
+    if fields is not None:
+        return render_json(content.model_dump(include=set(fields)))
+    return render_json(content)
+
+async def load_rendered_homepage(
+    db: AsyncIOMotorDatabase,
+    fields: Optional[Tuple[str, ...]] = None
+) -> RenderedJson:
+    if fields is None:
+        # The full document is sent as the bytes rendered when it was published
+        snapshot = await db.homepage_published.find_one(
+            {"id": "main"}, {"_id": 0, "body": 1, "digest": 1, "encoded": 1}
+        )
+        if snapshot is not None:
+            return rendered_snapshot(snapshot)
+    
+    content = await load_public_content(db, fields)
+    return await asyncio.to_thread(render_content, content, fields)
+
+async def load_rendered_section(db: AsyncIOMotorDatabase, section: str) -> RenderedJson:
+    content = await load_public_content(db, (section,))
+    return await asyncio.to_thread(render_json, getattr(content, section))
+
+async def load_rendered_draft(db: AsyncIOMotorDatabase) -> RenderedJson:
+    content = await load_homepage_content(db)
+    return await asyncio.to_thread(render_content, content)
+
+async def publish_homepage(
+    db: AsyncIOMotorDatabase,
+    expected_revision: Optional[int] = None
+) -> HomepageContent:
+    """
+    Render the current draft once and swap it in as the published snapshot.
+    The snapshot holds its own references to the files it shows, so later
+    draft edits cannot delete them while they are live.
+    """
+    draft = await load_homepage_content(db)
+    if expected_revision is not None and draft.revision != expected_revision:
+        raise RevisionConflict(draft.revision)
+    
+    urls = content_asset_urls(draft)
+    if not await retain_assets(db, UPLOAD_DIR, urls):
+        # An edit that landed after the read already released one of the files
+        current = await load_homepage_content(db, ("revision",))
+        raise RevisionConflict(current.revision)
+    
+    try:
+        rendered = await asyncio.to_thread(render_json, draft)
+        previous = await save_published_snapshot(db, draft.model_dump(), rendered)
+    except Exception:
+        await sync_asset_refs(db, UPLOAD_DIR, urls, [])
+        raise
+    published_cache.invalidate()
+    
+    if previous is not None:
+        await sync_asset_refs(db, UPLOAD_DIR, content_asset_urls(HomepageContent(**previous["content"])), [])
+    return draft
+
+async def ensure_published_homepage(db: AsyncIOMotorDatabase):
+    """
+    Publish the current draft if nothing has been published yet, so edits
+    made after an upgrade do not go live before the first publish.
+    """
+    if await db.homepage_published.find_one({"id": "main"}, {"_id": 1}) is not None:
+        return
+    try:
+        await publish_homepage(db)
+    except RevisionConflict:
+        # Another worker published first
+        pass
+
+async def warm_homepage(db: AsyncIOMotorDatabase):
+    """
+    Fill the published content cache, and the storage stat cache for the
+    files the homepage shows and their precompressed variants, so the first
+    visitors after a start are served from memory.
+    """
+    await published_cache.get(lambda: load_rendered_homepage(db))
+    for section in HOMEPAGE_SECTIONS:
+        await published_cache.get(lambda: load_rendered_section(db, section), key=("section", section))
+    
+    content = await load_public_content(db)
+    names = []
+    for filename in filter(None, map(filename_from_url, content_asset_urls(content))):
+        names.append(filename)
+        if is_compressible(filename):
+            names.extend(f"{filename}{suffix}" for suffix in VARIANT_SUFFIXES.values())
+    storage = get_storage(UPLOAD_DIR)
+    await asyncio.gather(*(storage.cached_stat(name) for name in names))
+
+@router.get("/content", response_model=Union[HomepageContent, HomepageContentPartial])
 async def get_homepage_content(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return, e.g. hero,revision"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get the current homepage content.
-    Returns default content if none exists.
+    Get the published homepage content.
+    Returns default content if none exists. The full document is sent as the
+    JSON bytes rendered at publish time and kept in the in-process cache,
+    which only changes when a new version is published; draft edits never
+    touch it. Clients revalidate with If-None-Match and get 304 while the
+    content is unchanged.
+    With fields, only those top-level fields are read and returned; each
+    fieldset is cached alongside the full document.
     """
     try:
-        # Try to get existing content
-        content = await db.homepage_content.find_one({"id": "main"})
-        
-        if content:
-            # Convert MongoDB document to Pydantic model
-            content["_id"] = str(content["_id"])
-            return HomepageContent(**content)
-        else:
-            # Return default content
-            default_content = HomepageContent(id="main")
-            return default_content
+        selected = parse_fields(fields)
+        rendered = await published_cache.get(
+            lambda: load_rendered_homepage(db, selected),
+            key=None if selected is None else ("fields", selected)
+        )
+        return rendered_json_response(request, rendered, {"Cache-Control": "no-cache"})
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -59,44 +417,43 @@ async def update_homepage_content(
     current_user: dict = Depends(get_admin_user)
 ):
     """
-    Update homepage content. Only accessible to admin users.
+    Update the homepage draft. Only accessible to admin users.
+    Only the sections provided are written. When revision is given the edit
+    is rejected with 409 if the content changed since that revision.
+    Changes go live with POST /content/publish.
     """
     try:
-        # Get existing content or create default
-        existing_content = await db.homepage_content.find_one({"id": "main"})
-        
-        if existing_content:
-            # Update existing content
-            current_content = HomepageContent(**existing_content)
-        else:
-            # Create new default content
-            current_content = HomepageContent(id="main")
-        
         # Update fields that are provided
-        update_data = content_update.dict(exclude_unset=True)
-        
-        if "hero" in update_data:
-            current_content.hero = content_update.hero
-        if "features" in update_data:
-            current_content.features = content_update.features
-        if "testimonials" in update_data:
-            current_content.testimonials = content_update.testimonials
-        if "demo_items" in update_data:
-            current_content.demo_items = content_update.demo_items
+        update_data = content_update.model_dump(exclude_unset=True)
+        fields = {
+            section: update_data[section]
+            for section in HOMEPAGE_SECTIONS
+            if update_data.get(section) is not None
+        }
         
-        # Update timestamp
-        current_content.updated_at = datetime.now()
+        # Images are stored as files; the document only keeps their URLs
+        stored_urls = await extract_inline_images(db, fields)
+        try:
+            before, after = await update_homepage_fields(db, fields, content_update.revision)
+        except Exception:
+            await sync_asset_refs(db, UPLOAD_DIR, stored_urls, [])
+            raise
+        draft_cache.invalidate()
         
-        # Save to database
-        content_dict = current_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
+        # Reference stored files the edit added and drop those it no longer
+        # points at, counting the references just taken for extracted images as held
+        await sync_asset_refs(
+            db, UPLOAD_DIR,
+            content_asset_urls(HomepageContent(**before)) + stored_urls,
+            content_asset_urls(HomepageContent(**after))
         )
         
-        return current_content
+        return HomepageContent(**after)
         
+    except RevisionConflict as e:
+        raise revision_conflict(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -108,22 +465,24 @@ async def reset_homepage_content(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Reset homepage content to default values.
+    Reset homepage content to default values, both draft and published.
     """
     try:
         # Create default content
         default_content = HomepageContent(id="main")
         
-        # Save to database
-        content_dict = default_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
-        )
+        # Every section goes back to its default; the revision keeps counting
+        fields = {section: value for section, value in default_content.model_dump().items() if section in HOMEPAGE_SECTIONS}
+        before, after = await update_homepage_fields(db, fields)
+        draft_cache.invalidate()
         
-        return default_content
+        await sync_asset_refs(db, UPLOAD_DIR, content_asset_urls(HomepageContent(**before)), [])
+        await publish_homepage(db, after["revision"])
         
+        return HomepageContent(**after)
+        
+    except RevisionConflict as e:
+        raise revision_conflict(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -132,100 +491,375 @@ async def reset_homepage_content(
 
 @router.get("/content/preview", response_model=HomepageContent)
 async def preview_homepage_content(
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Get the homepage draft for preview (public endpoint), including edits
+    that have not been published yet.
+    """
+    try:
+        rendered = await draft_cache.get(lambda: load_rendered_draft(db))
+        return rendered_json_response(request, rendered, {"Cache-Control": "no-cache"})
+            
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving homepage preview: {str(e)}"
+        )
+
+@router.post("/content/publish", response_model=HomepageContent)
+async def publish_homepage_content(
+    revision: Optional[int] = None,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Publish the homepage draft. Only accessible to admin users.
+    Pass the revision that was reviewed to get 409 instead of publishing
+    edits made since.
+    """
+    try:
+        return await publish_homepage(db, revision)
+        
+    except RevisionConflict as e:
+        raise revision_conflict(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error publishing homepage content: {str(e)}"
+        )
+
+@router.get(
+    "/content/{section}",
+    response_model=Union[HomepageHeroContent, List[HomepageFeature], List[HomepageTestimonial], List[HomepageDemoItem]]
+)
+async def get_homepage_section(
+    request: Request,
+    section: Literal["hero", "features", "testimonials", "demo_items"],
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get homepage content for preview (public endpoint).
+    Get a single published homepage section, e.g. only the hero for first
+    paint. Shares the published content cache.
+    """
+    try:
+        rendered = await published_cache.get(
+            lambda: load_rendered_section(db, section),
+            key=("section", section)
+        )
+        return rendered_json_response(request, rendered, {"Cache-Control": "no-cache"})
+            
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving homepage {section}: {str(e)}"
+        )
+
+@router.get("/events")
+async def stream_homepage_events(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Published revision the client already has")
+):
+    """
+    Server-Sent Events stream of homepage publishes.
+    Each `content` event carries the published revision and the sections
+    that changed, so pages refetch those (e.g. /content/hero) instead of
+    polling. Reconnecting clients resume from the Last-Event-ID header;
+    last_event_id does the same for the first connection.
+    """
+    resume_from = last_event_id
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        resume_from = int(header)
+    
+    return StreamingResponse(
+        event_stream(homepage_events, resume_from, HOMEPAGE_EVENTS_HEARTBEAT, resync_homepage_event),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Deliver each event immediately through nginx
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+async def record_hero_upload(
+    db: AsyncIOMotorDatabase,
+    original_filename: Optional[str],
+    stored_filename: str,
+    file_size: int,
+    expected_revision: Optional[int] = None
+) -> dict:
+    """
+    Point the hero section at a stored upload and build the upload response.
+    The caller must already hold a reference to the stored file; it is released
+    again if the homepage cannot be updated (including on RevisionConflict).
+    """
+    # Determine file type
+    if original_filename and original_filename.endswith('.splat'):
+        file_type = "3D Splat Model"
+    elif original_filename and original_filename.endswith('.ply'):
+        file_type = "3D PLY Model"
+    else:
+        file_type = "Image"
+    
+    # Store file path in database (not the file content)
+    file_url = asset_url(stored_filename)
+    
+    try:
+        # Update hero image with file URL (only the file path, not the file content)
+        before, after = await update_homepage_fields(
+            db, {"hero.hero_image_base64": file_url}, expected_revision
+        )
+        draft_cache.invalidate()
+    except Exception:
+        await release_asset(db, UPLOAD_DIR, stored_filename)
+        raise
+    
+    # The previous hero file loses its reference
+    previous_url = before.get("hero", {}).get("hero_image_base64")
+    await sync_asset_refs(db, UPLOAD_DIR, [previous_url], [])
+    
+    return {
+        "message": f"Hero {file_type.lower()} uploaded successfully", 
+        "image_url": file_url, 
+        "file_type": file_type,
+        "file_size": f"{file_size / (1024*1024):.1f}MB",
+        "revision": after["revision"]
+    }
+
+async def schedule_upload_processing(
+    background_tasks: BackgroundTasks,
+    db: AsyncIOMotorDatabase,
+    stored_filename: str
+):
+    """
+    Queue per-upload work (compressed variants, .splat conversion, SPZ
+    encoding): after the response for local storage, otherwise in a
+    processing worker so remote objects are never downloaded here.
     """
-    return await get_homepage_content(db)
+    if get_storage(UPLOAD_DIR).keeps_local_files:
+        background_tasks.add_task(process_upload, db, UPLOAD_DIR, stored_filename)
+    else:
+        await enqueue_processing(db, stored_filename)
 
 @router.post("/upload/hero")
 async def upload_hero_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    revision: Optional[int] = None,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Upload hero image/splat/ply for homepage.
-    Supports files up to 200MB.
+    Supports files up to 200MB. Pass revision to reject the upload with 409
+    if the content changed since it was read.
     """
     try:
-        # Check file size (200MB limit)
-        MAX_SIZE = 200 * 1024 * 1024  # 200MB in bytes
-        
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size > MAX_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size ({file_size / (1024*1024):.1f}MB) exceeds maximum allowed size of 200MB"
-            )
-        
-        # Generate unique filename
-        file_extension = Path(file.filename).suffix if file.filename else ""
-        unique_filename = f"hero_{uuid.uuid4()}{file_extension}"
-        file_path = UPLOAD_DIR / unique_filename
+        # Stream file into the content-addressed store (aborts with 413 once past the limit)
+        stored_filename, file_size = await store_upload(db, UPLOAD_DIR, file, MAX_UPLOAD_SIZE)
         
-        # Save file to disk
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(file_content)
+        result = await record_hero_upload(db, file.filename, stored_filename, file_size, revision)
+        await schedule_upload_processing(background_tasks, db, stored_filename)
+        return result
         
-        # Determine file type
-        if file.filename and file.filename.endswith('.splat'):
-            file_type = "3D Splat Model"
-        elif file.filename and file.filename.endswith('.ply'):
-            file_type = "3D PLY Model"
-        else:
-            file_type = "Image"
-        
-        # Store file path in database (not the file content)
-        file_url = f"/uploads/{unique_filename}"
+    except HTTPException:
+        # Re-raise HTTP exceptions (like file size errors)
+        raise
+    except RevisionConflict as e:
+        raise revision_conflict(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error uploading hero file: {str(e)}"
+        )
+
+@router.post("/upload/hero/sessions", response_model=UploadSessionStatus, status_code=status.HTTP_201_CREATED)
+async def create_hero_upload_session(session_create: UploadSessionCreate):
+    """
+    Start a resumable hero upload.
+    Chunks are then sent with PUT /upload/hero/sessions/{session_id}/chunks/{index}.
+    """
+    session = create_upload_session(
+        UPLOAD_DIR,
+        session_create.filename,
+        session_create.file_size,
+        MAX_UPLOAD_SIZE,
+        session_create.chunk_size
+    )
+    return get_session_status(UPLOAD_DIR, session["session_id"])
+
+@router.get("/upload/hero/sessions/{session_id}", response_model=UploadSessionStatus)
+async def get_hero_upload_session(session_id: str):
+    """
+    Get received chunks and the contiguous offset of a resumable upload.
+    """
+    return get_session_status(UPLOAD_DIR, session_id)
+
+@router.put("/upload/hero/sessions/{session_id}/chunks/{index}")
+async def upload_hero_chunk(session_id: str, index: int, request: Request):
+    """
+    Upload one chunk of a resumable upload as the raw request body.
+    Chunks can be sent in any order and in parallel.
+    """
+    try:
+        return await write_session_chunk(UPLOAD_DIR, session_id, index, request.stream())
+    except ClientDisconnect:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Client disconnected while uploading chunk {index}"
+        )
+
+@router.post("/upload/hero/sessions/{session_id}/complete")
+async def complete_hero_upload_session(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    revision: Optional[int] = None,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Assemble a fully received upload and set it as the hero file.
+    """
+    try:
+        session = load_upload_session(UPLOAD_DIR, session_id)
         
-        # Get existing content
-        existing_content = await db.homepage_content.find_one({"id": "main"})
+        # Assembled file is renamed into the store, never copied
+        assembled_path = temp_path_for(UPLOAD_DIR / "upload")
+        finalize_upload_session(UPLOAD_DIR, session_id, assembled_path)
+        try:
+            stored_filename, file_size = await store_file(
+                db, UPLOAD_DIR, assembled_path, Path(session["filename"]).suffix
+            )
+        finally:
+            assembled_path.unlink(missing_ok=True)
         
-        if existing_content:
-            current_content = HomepageContent(**existing_content)
-        else:
-            current_content = HomepageContent(id="main")
+        result = await record_hero_upload(db, session["filename"], stored_filename, file_size, revision)
+        await schedule_upload_processing(background_tasks, db, stored_filename)
+        return result
         
-        # Update hero image with file URL
-        current_content.hero.hero_image_base64 = file_url
-        current_content.updated_at = datetime.now()
+    except HTTPException:
+        raise
+    except RevisionConflict as e:
+        raise revision_conflict(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error completing hero upload: {str(e)}"
+        )
+
+@router.delete("/upload/hero/sessions/{session_id}")
+async def cancel_hero_upload_session(session_id: str):
+    """
+    Abort a resumable upload and discard its chunks.
+    """
+    delete_upload_session(UPLOAD_DIR, session_id)
+    return {"message": "Upload session cancelled"}
+
+def direct_upload_storage():
+    storage = get_storage(UPLOAD_DIR)
+    if not storage.supports_direct_upload:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads require the s3 storage backend"
+        )
+    return storage
+
+@router.post("/upload/hero/direct", response_model=DirectUploadSession, status_code=status.HTTP_201_CREATED)
+async def create_hero_direct_upload(upload_create: DirectUploadCreate):
+    """
+    Start a hero upload that goes from the browser straight to object storage.
+    PUT each part to its presigned URL, then POST the part ETags to
+    /upload/hero/direct/{upload_id}/complete.
+    """
+    storage = direct_upload_storage()
+    if upload_create.file_size > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE / (1024*1024):.0f}MB"
+        )
+    
+    try:
+        return await storage.create_direct_upload(upload_create.filename, upload_create.file_size)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error starting direct upload: {str(e)}"
+        )
+
+@router.post("/upload/hero/direct/{upload_id}/complete")
+async def complete_hero_direct_upload(
+    upload_id: str,
+    upload_complete: DirectUploadComplete,
+    background_tasks: BackgroundTasks,
+    revision: Optional[int] = None,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Completion callback for a direct upload: assemble the parts, move the
+    object to its content-addressed name and set it as the hero file.
+    """
+    storage = direct_upload_storage()
+    key = upload_complete.key
+    if not storage.is_incoming_key(key):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown upload key"
+        )
+    
+    try:
+        file_size = await storage.complete_direct_upload(
+            upload_id, key, [part.model_dump() for part in upload_complete.parts]
+        )
+        if file_size > MAX_UPLOAD_SIZE:
+            await storage.discard_incoming(key)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE / (1024*1024):.0f}MB"
+            )
         
-        # Save to database (only the file path, not the file content)
-        content_dict = current_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
+        # Hashed and moved inside the bucket; the bytes never reach this worker
+        stored_filename = await store_direct_upload(
+            db, UPLOAD_DIR, key, Path(upload_complete.filename).suffix, file_size
         )
         
-        return {
-            "message": f"Hero {file_type.lower()} uploaded successfully", 
-            "image_url": file_url, 
-            "file_type": file_type,
-            "file_size": f"{file_size / (1024*1024):.1f}MB"
-        }
+        result = await record_hero_upload(db, upload_complete.filename, stored_filename, file_size, revision)
+        await schedule_upload_processing(background_tasks, db, stored_filename)
+        return result
         
     except HTTPException:
-        # Re-raise HTTP exceptions (like file size errors)
         raise
+    except RevisionConflict as e:
+        raise revision_conflict(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error uploading hero file: {str(e)}"
+            detail=f"Error completing direct upload: {str(e)}"
+        )
+
+@router.delete("/upload/hero/direct/{upload_id}")
+async def abort_hero_direct_upload(upload_id: str, key: str):
+    """
+    Abort a direct upload and discard the parts already uploaded.
+    """
+    storage = direct_upload_storage()
+    if not storage.is_incoming_key(key):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown upload key"
         )
+    await storage.abort_direct_upload(upload_id, key)
+    return {"message": "Direct upload aborted"}
 
 @router.post("/upload/demo/{index}")
 async def upload_demo_image(
     index: int,
     file: UploadFile = File(...),
+    revision: Optional[int] = None,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Upload demo image for homepage.
+    The image is stored as a file like hero uploads; the document keeps its URL.
     """
     try:
         # Validate index
@@ -235,74 +869,249 @@ async def upload_demo_image(
                 detail="Demo image index must be between 0 and 2"
             )
         
-        # Read file content
-        file_content = await file.read()
+        # Stream file into the content-addressed store
+        stored_filename, _ = await store_upload(db, UPLOAD_DIR, file, MAX_UPLOAD_SIZE)
+        file_url = asset_url(stored_filename)
         
-        # Convert to base64
-        base64_content = base64.b64encode(file_content).decode('utf-8')
-        data_url = f"data:{file.content_type};base64,{base64_content}"
-        
-        # Get existing content
-        existing_content = await db.homepage_content.find_one({"id": "main"})
-        
-        if existing_content:
-            current_content = HomepageContent(**existing_content)
-        else:
-            current_content = HomepageContent(id="main")
-        
-        # Update demo image
-        if index < len(current_content.demo_items):
-            current_content.demo_items[index].image_base64 = data_url
+        # Update demo image, if that demo item exists
+        try:
+            result = await update_homepage_fields(
+                db,
+                {f"demo_items.{index}.image_base64": file_url},
+                revision,
+                conditions={f"demo_items.{index}": {"$exists": True}}
+            )
+        except Exception:
+            await release_asset(db, UPLOAD_DIR, stored_filename)
+            raise
         
-        current_content.updated_at = datetime.now()
+        if result is None:
+            await release_asset(db, UPLOAD_DIR, stored_filename)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Demo item {index} does not exist"
+            )
         
-        # Save to database
-        content_dict = current_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
-        )
+        draft_cache.invalidate()
+        before, after = result
+        # The previous demo image loses its reference
+        await sync_asset_refs(db, UPLOAD_DIR, [before["demo_items"][index].get("image_base64")], [])
         
-        return {"message": f"Demo image {index} uploaded successfully", "image_url": data_url}
+        return {
+            "message": f"Demo image {index} uploaded successfully",
+            "image_url": file_url,
+            "revision": after["revision"]
+        }
         
+    except RevisionConflict as e:
+        raise revision_conflict(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error uploading demo image: {str(e)}"
         )
 
-@router.get("/uploads/{filename}")
-@router.head("/uploads/{filename}")
-async def serve_uploaded_file(filename: str):
+async def serve_stored_file(request: Request, filename: str, vary: Optional[List[str]] = None):
     """
-    Serve uploaded files from the uploads directory.
-    Supports both GET and HEAD requests.
+    Response for a stored upload with Range, conditional and precompressed
+    variant support, read from the configured storage backend. vary lists
+    extra request headers the choice of filename depended on.
     """
-    file_path = UPLOAD_DIR / filename
+    storage = get_storage(UPLOAD_DIR)
+    stored = await storage.cached_stat(filename)
     
-    if not file_path.exists():
+    if stored is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
     
     # Determine media type based on file extension
-    file_extension = file_path.suffix.lower()
-    media_type_map = {
-        '.ply': 'application/ply',
-        '.splat': 'application/splat',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
-    }
+    media_type = media_type_for(filename)
+    
+    headers = {"Content-Disposition": content_disposition(filename)}
+    vary = list(vary or [])
+    
+    # Content-addressed names never change content, so they can be cached forever
+    # and the name itself is a strong validator
+    content_id = None
+    if is_asset_filename(filename):
+        headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        content_id = filename
+    
+    # Pick a precompressed variant; ranges then apply to the encoded bytes
+    if is_compressible(filename):
+        vary.append("Accept-Encoding")
+        found = await asyncio.gather(*(storage.cached_stat(f"{filename}{suffix}") for suffix in VARIANT_SUFFIXES.values()))
+        variants = {encoding: variant for encoding, variant in zip(VARIANT_SUFFIXES, found) if variant}
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), variants)
+        if encoding:
+            stored = variants[encoding]
+            headers["Content-Encoding"] = encoding
+            if content_id:
+                content_id = f"{content_id}{VARIANT_SUFFIXES[encoding]}"
     
-    media_type = media_type_map.get(file_extension, 'application/octet-stream')
+    if vary:
+        headers["Vary"] = ", ".join(vary)
     
-    return FileResponse(
-        path=file_path,
+    # Backends with their own download URLs (presigned or CDN) serve the bytes
+    if stored.url:
+        redirect_headers = {"Cache-Control": "no-store"}
+        if vary:
+            redirect_headers["Vary"] = headers["Vary"]
+        return RedirectResponse(stored.url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers=redirect_headers)
+    
+    return ranged_response(
+        request,
+        storage.range_reader(stored.name),
+        size=stored.size,
+        mtime=stored.mtime,
+        etag=stored.etag(content_id),
         media_type=media_type,
-        filename=filename
-    )
\ No newline at end of file
+        headers=headers
+    )
+
+@router.get("/uploads/{filename}")
+@router.head("/uploads/{filename}")
+async def serve_uploaded_file(filename: str, request: Request):
+    """
+    Serve uploaded files from the uploads directory.
+    Supports both GET and HEAD requests, single and multi-range requests,
+    and conditional requests (ETag / Last-Modified).
+    3D models are sent precompressed when the client accepts br or gzip.
+    """
+    return await serve_stored_file(request, filename)
+
+@router.get("/models", response_model=ModelMetadataList)
+async def list_models(
+    format: Optional[Literal["ply", "splat"]] = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    skip: int = Query(default=0, ge=0),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    List uploaded 3D models, newest first, with their gaussian count,
+    SH degree, bounding box and size so clients can choose what to fetch.
+    """
+    try:
+        items, total = await list_model_metadata(db, format=format, limit=limit, skip=skip)
+        return ModelMetadataList(items=items, total=total, limit=limit, skip=skip)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing models: {str(e)}"
+        )
+
+@router.get("/models/{filename}/metadata", response_model=ModelMetadata)
+async def get_model_metadata(
+    filename: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Metadata of a single uploaded 3D model.
+    """
+    try:
+        metadata = await db.model_metadata.find_one({"_id": filename})
+        if not metadata:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Model metadata not found"
+            )
+        return ModelMetadata(**metadata)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching model metadata: {str(e)}"
+        )
+
+@router.get("/models/{filename}")
+@router.head("/models/{filename}")
+async def serve_model(
+    filename: str,
+    request: Request,
+    tier: Optional[Literal["full", "medium", "low"]] = None
+):
+    """
+    Serve an uploaded 3D model as .splat at the tier suited to the device.
+    The tier comes from the tier query parameter, or from the Device-Memory,
+    Save-Data and ECT client hints; falls back to the next larger tier when
+    a smaller one was not generated. Models are written most important
+    gaussian first, see /models/{filename}/milestones.
+    """
+    if Path(filename).suffix not in ('.ply', '.splat'):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found"
+        )
+    
+    selected = select_model_tier(request.headers, tier)
+    smaller_tiers = MODEL_TIER_ORDER[1:MODEL_TIER_ORDER.index(selected) + 1]
+    
+    # Every candidate is looked up at once (and cached, see storage.StatCache)
+    storage = get_storage(UPLOAD_DIR)
+    source, converted, *tiers = await asyncio.gather(
+        storage.cached_stat(filename),
+        storage.cached_stat(f"{filename}.splat"),
+        *(storage.cached_stat(tier_filename(filename, candidate)) for candidate in smaller_tiers)
+    )
+    if source is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found"
+        )
+    
+    # Full model: converted .splat when the upload was a PLY, else the upload itself
+    served_tier, served_filename = "full", f"{filename}.splat" if converted else filename
+    
+    # Selected tier first, then each larger one before settling on full
+    for candidate, stored in reversed(list(zip(smaller_tiers, tiers))):
+        if stored:
+            served_tier, served_filename = candidate, tier_filename(filename, candidate)
+            break
+    
+    # An explicit tier is part of the URL; hint-based choices must be keyed on the hints
+    response = await serve_stored_file(request, served_filename, vary=None if tier else list(MODEL_CLIENT_HINTS))
+    response.headers["Accept-CH"] = ", ".join(MODEL_CLIENT_HINTS)
+    response.headers["Content-Location"] = request.app.url_path_for("serve_uploaded_file", filename=served_filename)
+    response.headers["X-Model-Tier"] = served_tier
+    return response
+
+@router.get("/models/{filename}/milestones")
+async def get_model_milestones(
+    filename: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Quality milestones of a model's progressive .splat.
+    The .splat lists gaussians most important first, so each milestone's byte
+    offset marks a prefix that renders with that share of the model's total
+    importance. Offsets refer to the identity encoding; fetch prefixes with a
+    Range request and Accept-Encoding: identity.
+    """
+    try:
+        asset = await db.assets.find_one({"_id": filename}, {"progressive": 1, "variants": 1})
+        if not asset or not asset.get("progressive"):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Model milestones not found"
+            )
+        
+        splat_filename = asset.get("variants", {}).get("splat", f"{filename}.splat")
+        progressive = asset["progressive"]
+        return {
+            "model_url": asset_url(splat_filename),
+            "gaussian_count": progressive["gaussian_count"],
+            "byte_size": progressive["gaussian_count"] * SPLAT_DTYPE.itemsize,
+            "milestones": progressive["milestones"]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching model milestones: {str(e)}"
+        )
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from backend.models.status import StatusCheck, StatusCheckCreate, StatusCheckPage, StatusRollupList
+from backend.services.status_checks import list_status_checks, InvalidCursor
+from backend.services.status_rollups import list_rollups
+from backend.services.batch_writer import BatchWriter
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+router = APIRouter(prefix="/api", tags=["status"])
+
+# Range served when `since` is omitted
+DEFAULT_ROLLUP_RANGE = {
+    "minute": timedelta(days=1),
+    "hour": timedelta(days=30)
+}
+
+def get_database():
+    from backend.server import database
+    return database
+
+def get_status_writer(request: Request) -> Optional[BatchWriter]:
+    # Set up at startup when STATUS_WRITE_BATCHING is on
+    return getattr(request.app.state, "status_writer", None)
+
+def naive_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@router.post("/status", response_model=StatusCheck)
+async def create_status_check(
+    input: StatusCheckCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    writer: Optional[BatchWriter] = Depends(get_status_writer)
+):
+    """
+    Record a status check. With batching on, the response is sent once the
+    batch holding this check has been written.
+    """
+    status_dict = input.model_dump()
+    status_obj = StatusCheck(**status_dict)
+    if writer is not None:
+        await writer.insert(status_obj.model_dump())
+    else:
+        _ = await db.status_checks.insert_one(status_obj.model_dump())
+    return status_obj
+
+@router.get("/status", response_model=StatusCheckPage)
+async def get_status_checks(
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    List status checks, newest first, one page at a time.
+    Follow next_cursor with ?after= until it is null.
+    """
+    try:
+        items, next_cursor = await list_status_checks(db, limit, after)
+        return StatusCheckPage(items=items, limit=limit, next_cursor=next_cursor)
+        
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/status/rollups", response_model=StatusRollupList)
+async def get_status_rollups(
+    granularity: Literal["minute", "hour"] = "hour",
+    since: Optional[datetime] = Query(None, description="Start of the first bucket (UTC)"),
+    until: Optional[datetime] = Query(None, description="End of the range, exclusive (UTC)"),
+    client_name: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Status check counts per client and minute or hour, oldest first.
+    Read from the rollups, so the latest minute or so is not counted yet.
+    """
+    try:
+        until = naive_utc(until) if until else datetime.utcnow()
+        since = naive_utc(since) if since else until - DEFAULT_ROLLUP_RANGE[granularity]
+        if since >= until:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="since must be before until"
+            )
+        
+        items = await list_rollups(db, granularity, since, until, client_name, limit)
+        return StatusRollupList(granularity=granularity, items=items)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reading status rollups: {str(e)}"
+        )
@@ -0,0 +1,134 @@
+"""
+Move base64 data URL images out of the homepage document into the asset store.
+
+Each data URL in hero.hero_image_base64 or demo_items.N.image_base64 is
+written to the upload storage the app uses (UPLOAD_STORAGE) as a
+content-addressed file and replaced by its /uploads/ URL, in the draft and in
+the published snapshot. The snapshot is rewritten in place rather than
+republished, so unpublished draft edits stay unpublished. Safe to re-run: fields already holding URLs are skipped, and a
+field edited (or a snapshot published) while the migration runs is left to
+the newer write.
+
+    python -m backend.scripts.migrate_inline_images [--dry-run]
+"""
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from dotenv import load_dotenv
+from backend.models.homepage import HomepageContent
+from backend.services.asset_store import release_asset, filename_from_url
+from backend.services.homepage_store import update_homepage_fields, apply_set, published_snapshot, HOMEPAGE_ID
+from backend.services.json_responses import render_json
+from backend.services.inline_images import is_data_url, decode_data_url, store_data_url
+from backend.services.storage import create_storage, configure_storage
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+UPLOAD_DIR = Path("/app/uploads")
+
+
+def inline_image_paths(document: dict) -> list:
+    """
+    (dotted path, data URL) for every inline image in a homepage document.
+    """
+    paths = []
+    hero_image = (document.get("hero") or {}).get("hero_image_base64")
+    if is_data_url(hero_image):
+        paths.append(("hero.hero_image_base64", hero_image))
+    for index, item in enumerate(document.get("demo_items") or []):
+        if is_data_url(item.get("image_base64")):
+            paths.append((f"demo_items.{index}.image_base64", item["image_base64"]))
+    return paths
+
+
+async def migrate_inline_images(db: AsyncIOMotorDatabase, upload_dir: Path, dry_run: bool = False) -> int:
+    """
+    Extract inline images to files. Returns the number of fields migrated.
+    """
+    document = await db.homepage_content.find_one({"id": HOMEPAGE_ID})
+    if not document:
+        return 0
+
+    migrated = 0
+    for path, data_url in inline_image_paths(document):
+        media_type, data = decode_data_url(data_url)
+        if dry_run:
+            logger.info(f"Would move {path} ({media_type}, {len(data)} bytes) to a file")
+            continue
+
+        url = await store_data_url(db, upload_dir, data_url)
+        # Only replace the value we read, so a concurrent edit wins
+        result = await update_homepage_fields(db, {path: url}, conditions={path: data_url})
+        if result is None:
+            await release_asset(db, upload_dir, filename_from_url(url))
+            logger.info(f"Skipped {path}: changed during migration")
+            continue
+
+        migrated += 1
+        logger.info(f"Moved {path} ({len(data)} bytes) to {url}")
+
+    return migrated
+
+
+async def migrate_published_snapshot(db: AsyncIOMotorDatabase, upload_dir: Path, dry_run: bool = False) -> int:
+    """
+    Extract inline images from the published snapshot and re-render it.
+    Returns the number of fields migrated.
+    """
+    snapshot = await db.homepage_published.find_one({"id": HOMEPAGE_ID})
+    if not snapshot:
+        return 0
+
+    paths = inline_image_paths(snapshot["content"])
+    if dry_run:
+        for path, data_url in paths:
+            logger.info(f"Would move published {path} ({len(decode_data_url(data_url)[1])} bytes) to a file")
+        return 0
+    if not paths:
+        return 0
+
+    # The snapshot holds its own reference to every file it shows
+    urls = {path: await store_data_url(db, upload_dir, data_url) for path, data_url in paths}
+    content = apply_set(snapshot["content"], urls)
+    rendered = await asyncio.to_thread(render_json, HomepageContent(**content))
+
+    # Only replace the snapshot we read, so a concurrent publish wins
+    replaced = await db.homepage_published.find_one_and_replace(
+        {"id": HOMEPAGE_ID, "published_at": snapshot["published_at"]},
+        published_snapshot(content, rendered)
+    )
+    if replaced is None:
+        for url in urls.values():
+            await release_asset(db, upload_dir, filename_from_url(url))
+        logger.info("Skipped the published snapshot: published again during migration")
+        return 0
+
+    for path, url in urls.items():
+        logger.info(f"Moved published {path} to {url}")
+    return len(urls)
+
+
+async def main(dry_run: bool):
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        db = client[os.environ['DB_NAME']]
+        # Store files where the app serves them from, as server.py does
+        configure_storage(create_storage(os.environ.get('UPLOAD_STORAGE', 'local'), db, UPLOAD_DIR))
+        migrated = await migrate_inline_images(db, UPLOAD_DIR, dry_run)
+        migrated += await migrate_published_snapshot(db, UPLOAD_DIR, dry_run)
+        logger.info(f"Migrated {migrated} inline image(s)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Move inline homepage images into the asset store")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be migrated without writing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,44 @@
+"""
+Build derived files (.splat, device tiers, SPZ, precompressed variants) for
+uploads kept in remote storage.
+
+With UPLOAD_STORAGE=s3 or gridfs the API queues each upload in
+processing_jobs rather than downloading it; run at least one of these
+workers next to the API, with the same environment. Workers take turns
+through a lease on each job, so any number can run.
+
+    python -m backend.scripts.process_uploads
+"""
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from backend.services.processing import ensure_processing_indexes, run_processing_jobs
+from backend.services.storage import create_storage, configure_storage
+from pathlib import Path
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+# Scratch copies are made under here, as in the API
+UPLOAD_DIR = Path("/app/uploads")
+
+
+async def main():
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        db = client[os.environ['DB_NAME']]
+        UPLOAD_DIR.mkdir(exist_ok=True)
+        configure_storage(create_storage(os.environ.get('UPLOAD_STORAGE', 'local'), db, UPLOAD_DIR))
+        await ensure_processing_indexes(db)
+        logger.info("Processing queued uploads")
+        await run_processing_jobs(db, UPLOAD_DIR)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(main())
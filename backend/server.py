@@ -1,14 +1,13 @@
 from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from contextlib import asynccontextmanager
+from typing import Optional
 import os
+import asyncio
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List
-import uuid
-from datetime import datetime
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -16,18 +15,98 @@ load_dotenv(ROOT_DIR / '.env')
 # Import homepage routes
 import sys
 sys.path.append(str(ROOT_DIR))
-from backend.routes.homepage import router as homepage_router
+from backend.routes.homepage import (
+    router as homepage_router,
+    watch_homepage_changes,
+    ensure_published_homepage,
+    warm_homepage,
+    UPLOAD_DIR
+)
+from backend.routes.status import router as status_router
+from backend.routes.export import router as export_router
+from backend.services.model_index import ensure_model_indexes
+from backend.services.status_checks import (
+    ensure_status_collection,
+    ensure_status_indexes,
+    create_status_writer,
+    STATUS_WRITE_BATCHING
+)
+from backend.services.status_rollups import ensure_rollup_indexes, run_rollup_job
+from backend.services.homepage_store import ensure_homepage_indexes
+from backend.services.processing import ensure_processing_indexes
+from backend.services.storage import create_storage, configure_storage
+from backend.services.mongo import create_mongo_client, warm_pool
 
-# MongoDB connection
+# MongoDB connection, opened in the lifespan below (pool settings: services/mongo.py)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-database = client[os.environ['DB_NAME']]
+db_name = os.environ['DB_NAME']
+client: Optional[AsyncIOMotorClient] = None
+database: Optional[AsyncIOMotorDatabase] = None
+
+
+async def create_indexes(db: AsyncIOMotorDatabase):
+    # Idempotent, so every worker runs it on every start
+    await ensure_model_indexes(db)
+    await ensure_homepage_indexes(db)
+    await ensure_status_collection(db)
+    await ensure_status_indexes(db)
+    await ensure_rollup_indexes(db)
+    await ensure_processing_indexes(db)
+
+async def warm_up(db: AsyncIOMotorDatabase):
+    # Open the pool and fill the homepage and stat caches before the first
+    # request; a failure here only means the first requests do it instead
+    try:
+        await warm_pool(client)
+        await warm_homepage(db)
+    except Exception as e:
+        logger.warning(f"Warmup incomplete: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, database
+    client = create_mongo_client(mongo_url)
+    database = client[db_name]
+    app.state.status_writer = None
+    app.state.background_tasks = []
+    
+    try:
+        # Where uploads are published and served from: "local", "gridfs" or "s3"
+        configure_storage(create_storage(os.environ.get('UPLOAD_STORAGE', 'local'), database, UPLOAD_DIR))
+        
+        await create_indexes(database)
+        # Data, not schema: publishes the draft once if nothing is published yet
+        await ensure_published_homepage(database)
+        await warm_up(database)
+        
+        # Coalesce POST /api/status inserts into batches when enabled
+        if STATUS_WRITE_BATCHING:
+            app.state.status_writer = create_status_writer(database)
+            app.state.status_writer.start()
+        
+        app.state.background_tasks = [
+            # Invalidate this worker's caches when any worker writes
+            asyncio.create_task(watch_homepage_changes(database)),
+            # Count status checks into status_rollups; workers take turns via a lease
+            asyncio.create_task(run_rollup_job(database))
+        ]
+        
+        yield
+    finally:
+        # Write queued status checks before the connection goes away
+        if app.state.status_writer is not None:
+            await app.state.status_writer.close()
+        for task in app.state.background_tasks:
+            task.cancel()
+        await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+        client.close()
 
 # Create the main app with increased file size limits
 app = FastAPI(
     title="TAST3D API",
     description="Restaurant 3D Menu API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure maximum request size (200MB)
@@ -37,50 +116,33 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the homepage viewer to tell which model tier and file it got
+    expose_headers=["X-Model-Tier", "Content-Location"],
     max_age=3600
 )
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Define Models
-class StatusCheck(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-class StatusCheckCreate(BaseModel):
-    client_name: str
-
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "Hello World"}
 
-@api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
-    status_obj = StatusCheck(**status_dict)
-    _ = await database.status_checks.insert_one(status_obj.dict())
-    return status_obj
-
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await database.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
-
 # Include the router in the main app
 app.include_router(api_router)
 
 # Include homepage routes
 app.include_router(homepage_router)
+
+# Include status check routes
+app.include_router(status_router)
+
+# Include collection export routes
+app.include_router(export_router)
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
@@ -0,0 +1,279 @@
+from fastapi import UploadFile
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from backend.services.uploads import stream_upload_to_temp, temp_path_for, hash_file
+from backend.services.storage import get_storage
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+import asyncio
+import os
+import re
+
+# Content-addressed asset store
+#
+# Files are stored once under <upload_dir>/<sha256><ext>; identical bytes map to
+# the same name, so public URLs are immutable and safe to cache forever.
+# Reference counts live in the `assets` collection, keyed by filename.
+# Files derived from an asset are stored as <name>.<suffix> and share its lifetime.
+# Committed files are published to the configured storage backend (see storage.py).
+#
+# The last release marks the record `deleting` before it removes the file and
+# drops the record only afterwards. A new upload of the same bytes cannot take
+# a reference to a marked record, so it waits for the file to be gone and then
+# stores it again instead of keeping a name whose file is about to vanish.
+ASSET_NAME_RE = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]+)*$")
+EXTENSION_RE = re.compile(r"^\.[a-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+ASSET_DELETE_WAIT = 0.05  # Seconds between checks on a record being deleted
+# A deletion marker older than this belongs to a release that died halfway
+ASSET_DELETE_TIMEOUT = timedelta(minutes=5)
+
+
+class AssetBusy(RuntimeError):
+    """Raised when an asset stays marked for deletion for too long."""
+
+
+def asset_filename(digest: str, extension: str = "") -> str:
+    """
+    Public filename for a digest, e.g. <sha256>.ply
+    Extensions other than a dot and [a-z0-9]+ (after trimming and
+    lowercasing) are dropped, so the name stays a valid asset name.
+    """
+    extension = extension.strip().lower()
+    if not EXTENSION_RE.match(extension):
+        extension = ""
+    return f"{digest}{extension}"
+
+
+def is_asset_filename(filename: str) -> bool:
+    """
+    Whether a filename was produced by the content-addressed store.
+    """
+    return bool(ASSET_NAME_RE.match(filename))
+
+
+def asset_url(filename: str) -> str:
+    return f"/uploads/{filename}"
+
+
+def filename_from_url(url: Optional[str]) -> Optional[str]:
+    """
+    Stored asset filename for an /uploads/ URL, or None for anything else
+    (external links, data URLs, legacy uuid uploads).
+    """
+    if not url or not url.startswith("/uploads/"):
+        return None
+    filename = url[len("/uploads/"):]
+    return filename if is_asset_filename(filename) else None
+
+
+def commit_asset(upload_dir: Path, temp_path: Path, filename: str) -> Path:
+    """
+    Move a finished temp file to its content-addressed name.
+    If the bytes are already stored the temp file is discarded instead.
+    """
+    dest_path = upload_dir / filename
+    if dest_path.exists():
+        temp_path.unlink(missing_ok=True)
+    else:
+        os.replace(temp_path, dest_path)
+    return dest_path
+
+
+async def place_asset(db: AsyncIOMotorDatabase, upload_dir: Path, path: Path, filename: str):
+    """
+    Put a finished file under its stored name once its reference is held.
+    Local storage serves it from upload_dir; remote backends get it uploaded
+    straight from path and keep no local copy. The reference is dropped
+    again if that fails.
+    """
+    storage = get_storage(upload_dir)
+    try:
+        if storage.keeps_local_files:
+            commit_asset(upload_dir, path, filename)
+        else:
+            await storage.publish(filename, path)
+            path.unlink(missing_ok=True)
+    except Exception:
+        await release_asset(db, upload_dir, filename)
+        raise
+
+
+async def acquire_asset(db: AsyncIOMotorDatabase, filename: str, digest: str, size: int) -> dict:
+    """
+    Add a reference to an asset, creating its record on first use.
+    Waits while the asset is being deleted; raises AssetBusy if that never ends.
+    """
+    deadline = datetime.now() + ASSET_DELETE_TIMEOUT
+    while True:
+        try:
+            return await db.assets.find_one_and_update(
+                {"_id": filename, "$or": [
+                    {"deleting": {"$ne": True}},
+                    {"deleting_at": {"$lt": datetime.now() - ASSET_DELETE_TIMEOUT}}
+                ]},
+                {
+                    "$inc": {"refs": 1},
+                    "$set": {"last_referenced_at": datetime.now(), "deleting": False},
+                    "$setOnInsert": {"sha256": digest, "size": size, "created_at": datetime.now()}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The record exists and is marked for deletion
+            if datetime.now() >= deadline:
+                raise AssetBusy(f"Asset {filename} is still being deleted")
+            await asyncio.sleep(ASSET_DELETE_WAIT)
+
+
+async def release_asset(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str):
+    """
+    Drop a reference to an asset and delete it once nothing points at it.
+    """
+    asset = await db.assets.find_one_and_update(
+        {"_id": filename, "refs": {"$gt": 0}},
+        {"$inc": {"refs": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not asset or asset["refs"] > 0:
+        return
+
+    # Only the release that marks the record deletes the file
+    marked = await db.assets.find_one_and_update(
+        {"_id": filename, "refs": {"$lte": 0}, "deleting": {"$ne": True}},
+        {"$set": {"deleting": True, "deleting_at": datetime.now()}}
+    )
+    if marked is None:
+        return
+    await db.model_metadata.delete_one({"_id": filename})
+    # Sidecars derived from the file (e.g. <name>.gz) go with it
+    await get_storage(upload_dir).delete(filename)
+    # The file is gone, so uploads waiting on the marker may store it again
+    await db.assets.delete_one({"_id": filename, "deleting": True, "refs": {"$lte": 0}})
+
+
+async def retain_assets(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    urls: Iterable[Optional[str]]
+) -> bool:
+    """
+    Add a reference to every stored asset in urls, for a second document that
+    points at the same files (e.g. a published snapshot of the homepage).
+    Returns False, holding no new references, if one of them is already gone.
+    """
+    retained = []
+    for filename in filter(None, map(filename_from_url, urls)):
+        asset = await db.assets.find_one_and_update(
+            {"_id": filename, "refs": {"$gt": 0}},
+            {"$inc": {"refs": 1}, "$set": {"last_referenced_at": datetime.now()}}
+        )
+        if asset is None:
+            for name in retained:
+                await release_asset(db, upload_dir, name)
+            return False
+        retained.append(filename)
+    return True
+
+
+async def sync_asset_refs(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    old_urls: Iterable[Optional[str]],
+    new_urls: Iterable[Optional[str]]
+):
+    """
+    Move references from old_urls to new_urls after an edit: stored assets
+    the edit added (e.g. an existing /uploads/ URL pasted into another
+    field) gain a reference, and those it dropped lose one. Additions are
+    counted first, so a file that only moved between fields is never
+    released. URLs of assets that no longer exist gain nothing.
+    """
+    old_refs = Counter(filter(None, map(filename_from_url, old_urls)))
+    new_refs = Counter(filter(None, map(filename_from_url, new_urls)))
+    for filename, count in (new_refs - old_refs).items():
+        await db.assets.update_one(
+            {"_id": filename, "refs": {"$gt": 0}},
+            {"$inc": {"refs": count}, "$set": {"last_referenced_at": datetime.now()}}
+        )
+    for filename, count in (old_refs - new_refs).items():
+        for _ in range(count):
+            await release_asset(db, upload_dir, filename)
+
+
+async def store_upload(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    file: UploadFile,
+    max_size: int
+) -> Tuple[str, int]:
+    """
+    Stream an upload into the store, hashing while writing.
+    Returns the stored filename and size; the caller owns one reference to it.
+    """
+    extension = Path(file.filename).suffix if file.filename else ""
+    temp_path = temp_path_for(upload_dir / "upload")
+
+    try:
+        file_size, digest = await stream_upload_to_temp(file, temp_path, max_size)
+        filename = asset_filename(digest, extension)
+
+        # Take the reference before the file lands so a concurrent release cannot delete it
+        await acquire_asset(db, filename, digest, file_size)
+        await place_asset(db, upload_dir, temp_path, filename)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return filename, file_size
+
+
+async def store_file(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    path: Path,
+    extension: str = "",
+    digest: Optional[str] = None
+) -> Tuple[str, int]:
+    """
+    Move an already assembled file (e.g. a finished upload session) into the store.
+    digest is computed from the file unless already known.
+    """
+    if digest is None:
+        digest = await asyncio.to_thread(hash_file, path)
+    file_size = path.stat().st_size
+    filename = asset_filename(digest, extension)
+
+    await acquire_asset(db, filename, digest, file_size)
+    await place_asset(db, upload_dir, path, filename)
+    return filename, file_size
+
+
+async def store_direct_upload(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    key: str,
+    extension: str,
+    file_size: int
+) -> str:
+    """
+    Move an object uploaded straight to the storage backend to its stored
+    name. The backend computes the digest, so the bytes never pass through
+    this worker. Returns the stored filename; the caller owns one reference.
+    """
+    storage = get_storage(upload_dir)
+    digest = await storage.incoming_sha256(key)
+    filename = asset_filename(digest, extension)
+
+    await acquire_asset(db, filename, digest, file_size)
+    try:
+        # Server-side copy; drops the incoming object
+        await storage.adopt(filename, key)
+    except Exception:
+        await release_asset(db, upload_dir, filename)
+        raise
+    return filename
@@ -0,0 +1,107 @@
+from pymongo.errors import BulkWriteError
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Coalesced inserts
+#
+# Concurrent requests hand their documents to one BatchWriter per worker,
+# which writes them with a single unordered insert_many once max_batch
+# documents are waiting or the oldest has waited max_delay seconds. Each
+# caller is answered only after the batch holding its document has been
+# written (with the collection's write concern), and gets its own error if
+# just that document failed. The queue in front of the writer is bounded:
+# once max_pending documents are waiting, callers wait for room instead of
+# growing memory.
+
+BATCH_CLOSED = object()
+
+
+class BatchWriterClosed(RuntimeError):
+    """Raised for inserts after the writer has been closed."""
+
+
+class BatchWriter:
+    def __init__(self, collection, max_batch: int = 500, max_delay: float = 0.01, max_pending: int = 10000):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def insert(self, document: dict):
+        """
+        Queue document for the next batch and wait until it is written.
+        """
+        if self._closed:
+            raise BatchWriterClosed("Batch writer is closed")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((document, future))
+        await future
+
+    async def close(self):
+        """
+        Stop accepting documents and write everything already queued.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        await self._queue.put(BATCH_CLOSED)
+        if self._task is not None:
+            await self._task
+
+    async def _run(self):
+        closing = False
+        while not (closing and self._queue.empty()):
+            batch: List[Tuple[dict, asyncio.Future]] = []
+            deadline = 0.0
+            while len(batch) < self.max_batch:
+                try:
+                    if closing:
+                        item = self._queue.get_nowait()
+                    elif not batch:
+                        item = await self._queue.get()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), deadline - time.monotonic())
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is BATCH_CLOSED:
+                    # Drain what is queued without waiting for more
+                    closing = True
+                    continue
+                if not batch:
+                    deadline = time.monotonic() + self.max_delay
+                batch.append(item)
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[dict, asyncio.Future]]):
+        failures = {}
+        try:
+            await self.collection.insert_many([document for document, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything but the reported documents was written
+            for error in e.details.get("writeErrors", []):
+                failures[error["index"]] = BulkWriteError({"writeErrors": [error]})
+        except Exception as e:
+            logger.warning(f"Batched insert of {len(batch)} documents into {self.collection.name} failed: {e}")
+            failures = {index: e for index in range(len(batch))}
+
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue  # The caller stopped waiting
+            if index in failures:
+                future.set_exception(failures[index])
+            else:
+                future.set_result(None)
@@ -0,0 +1,83 @@
+from pymongo.errors import OperationFailure, PyMongoError
+from typing import Any, Awaitable, Callable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cross-worker cache invalidation
+#
+# Each worker tails a change stream on the collections it caches and
+# invalidates its local copy as soon as another worker writes. Standalone
+# mongod has no change streams; there we poll a cheap version projection.
+
+# Server error codes meaning change streams cannot be used at all
+CHANGE_STREAM_UNSUPPORTED_CODES = {
+    40573,  # $changeStream is only supported on replica sets
+    115     # CommandNotSupported
+}
+
+# Resume token no longer usable; restart the stream from now
+CHANGE_STREAM_RESTART_CODES = {
+    260,  # InvalidResumeToken
+    280,  # ChangeStreamFatalError
+    286   # ChangeStreamHistoryLost
+}
+
+WATCH_RETRY_DELAY = 1.0  # Seconds between reconnect attempts
+
+
+async def watch_collection(
+    collection,
+    on_change: Callable[[], None],
+    read_version: Callable[[], Awaitable[Any]],
+    poll_interval: float,
+    retry_delay: float = WATCH_RETRY_DELAY
+):
+    """
+    Call on_change for every write to collection until cancelled.
+    Reconnects resume after the last event seen; when change streams are
+    unavailable it falls back to polling read_version every poll_interval.
+    """
+    resume_token = None
+    while True:
+        try:
+            async with collection.watch(resume_after=resume_token) as stream:
+                if resume_token is None:
+                    # Writes made before the stream opened were not seen
+                    on_change()
+                async for _ in stream:
+                    resume_token = stream.resume_token
+                    on_change()
+        except OperationFailure as e:
+            if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                logger.info(f"Change streams unavailable on {collection.name}, polling every {poll_interval}s")
+                break
+            if e.code in CHANGE_STREAM_RESTART_CODES:
+                resume_token = None
+            logger.warning(f"Change stream on {collection.name} failed: {e}")
+        except PyMongoError as e:
+            logger.warning(f"Change stream on {collection.name} interrupted: {e}")
+        await asyncio.sleep(retry_delay)
+
+    await poll_for_changes(read_version, on_change, poll_interval)
+
+
+async def poll_for_changes(
+    read_version: Callable[[], Awaitable[Any]],
+    on_change: Callable[[], None],
+    interval: float
+):
+    """
+    Call on_change whenever read_version() returns something new.
+    """
+    last_version = None
+    while True:
+        try:
+            version = await read_version()
+            if version != last_version:
+                last_version = version
+                on_change()
+        except PyMongoError as e:
+            logger.warning(f"Version poll failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,51 @@
+from typing import Mapping, Optional
+
+# Device-tier selection from Client Hints
+#
+# Browsers send these once the server advertises them with Accept-CH:
+#   Device-Memory  approximate RAM in GiB (0.25, 0.5, 1, 2, 4, 8)
+#   Save-Data      "on" when the user asked for reduced data usage
+#   ECT            effective connection type (slow-2g, 2g, 3g, 4g)
+MODEL_TIER_ORDER = ("full", "medium", "low")
+MODEL_CLIENT_HINTS = ("Device-Memory", "Save-Data", "ECT")
+
+LOW_MEMORY_GIB = 1
+MEDIUM_MEMORY_GIB = 4
+LOW_ECT = {"slow-2g", "2g"}
+MEDIUM_ECT = {"3g"}
+
+
+def _lowest(*tiers: str) -> str:
+    return max(tiers, key=MODEL_TIER_ORDER.index)
+
+
+def select_model_tier(headers: Mapping[str, str], explicit: Optional[str] = None) -> str:
+    """
+    Model tier for a request: an explicit choice wins, otherwise the most
+    conservative tier any hint asks for. Missing hints mean the full model.
+    """
+    if explicit:
+        return explicit
+
+    tiers = ["full"]
+
+    if headers.get("save-data", "").strip().lower() == "on":
+        tiers.append("low")
+
+    try:
+        memory = float(headers.get("device-memory", ""))
+    except ValueError:
+        memory = None
+    if memory is not None:
+        if memory <= LOW_MEMORY_GIB:
+            tiers.append("low")
+        elif memory <= MEDIUM_MEMORY_GIB:
+            tiers.append("medium")
+
+    ect = headers.get("ect", "").strip().lower()
+    if ect in LOW_ECT:
+        tiers.append("low")
+    elif ect in MEDIUM_ECT:
+        tiers.append("medium")
+
+    return _lowest(*tiers)
@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import gzip
+import os
+import uuid
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip variants are always built
+    brotli = None
+
+# Precompressed variants of uploaded models
+#
+# Variants are written once at upload time next to the original as
+# <name>.br / <name>.gz and picked per request from Accept-Encoding,
+# so no compression ever happens on the request path.
+COMPRESSIBLE_EXTENSIONS = {'.ply', '.splat'}
+
+# Suffix for each content-coding, in server preference order
+VARIANT_SUFFIXES = {
+    "br": ".br",
+    "gzip": ".gz"
+}
+
+# Variants that don't save at least this fraction are not worth keeping
+MIN_SAVINGS = 0.05
+
+COMPRESS_CHUNK_SIZE = 1024 * 1024  # 1MB
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9  # 11 is far slower on 200MB files for a few percent
+
+
+def is_compressible(filename: str) -> bool:
+    return Path(filename).suffix.lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def variant_path(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + VARIANT_SUFFIXES[encoding])
+
+
+def available_encodings() -> list:
+    return [encoding for encoding in VARIANT_SUFFIXES if encoding != "br" or brotli is not None]
+
+
+def _compress_to(path: Path, dest_path: Path, encoding: str):
+    temp_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        with open(path, 'rb') as src, open(temp_path, 'wb') as raw_out:
+            if encoding == "gzip":
+                # mtime=0 keeps output byte-identical for identical input
+                with gzip.GzipFile(fileobj=raw_out, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) as out:
+                    while chunk := src.read(COMPRESS_CHUNK_SIZE):
+                        out.write(chunk)
+            else:
+                compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+                while chunk := src.read(COMPRESS_CHUNK_SIZE):
+                    raw_out.write(compressor.process(chunk))
+                raw_out.write(compressor.finish())
+        os.replace(temp_path, dest_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def build_compressed_variants(path: Path, encodings: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Write precompressed variants of path, streaming in bounded chunks.
+    Variants that don't shrink the file meaningfully are dropped.
+    Returns the size of each variant kept, keyed by content-coding.
+    """
+    if not path.is_file() or not is_compressible(path.name):
+        return {}
+
+    original_size = path.stat().st_size
+    kept = {}
+    for encoding in encodings or available_encodings():
+        dest_path = variant_path(path, encoding)
+        if not dest_path.exists():
+            _compress_to(path, dest_path, encoding)
+
+        size = dest_path.stat().st_size
+        if size > original_size * (1 - MIN_SAVINGS):
+            dest_path.unlink(missing_ok=True)
+        else:
+            kept[encoding] = size
+    return kept
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Map of content-coding to q-value from an Accept-Encoding header.
+    """
+    preferences = {}
+    for item in (header or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        preferences[coding.lower()] = q
+    return preferences
+
+
+def negotiate_encoding(header: Optional[str], candidates: Iterable[str]) -> Optional[str]:
+    """
+    Best content-coding among candidates for an Accept-Encoding header,
+    or None to send the identity representation.
+    Any acceptable coding (q > 0) is preferred over identity; ties go to
+    the server preference order of VARIANT_SUFFIXES.
+    """
+    preferences = parse_accept_encoding(header)
+    wildcard = preferences.get("*", 0.0)
+
+    best, best_q = None, 0.0
+    for coding in VARIANT_SUFFIXES:
+        if coding not in candidates:
+            continue
+        q = preferences.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+
+    return best
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+import time
+
+# In-process read-through cache
+#
+# Holds values derived from one source (e.g. the homepage document and its
+# sparse fieldsets), keyed per view, in each worker. Writers call
+# invalidate() after saving, which drops every view at once; every
+# invalidation bumps the version, and a load
+# that raced with one is returned to its caller but never cached, so a stale
+# read cannot outlive the write that replaced it. The TTL is only a safety
+# net for writes this process does not see.
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    version: int
+    expires_at: float
+
+
+class ContentCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._lock = asyncio.Lock()
+
+    def peek(self, key: Hashable = None) -> Optional[CacheEntry]:
+        """
+        Current entry for key if it is still fresh, without loading.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == self.version and time.monotonic() < entry.expires_at:
+            return entry
+        return None
+
+    async def get(self, loader: Callable[[], Awaitable[Any]], key: Hashable = None) -> Any:
+        """
+        Cached value for key, loading it with loader() on a miss.
+        Concurrent misses share a single load.
+        """
+        entry = self.peek(key)
+        if entry is not None:
+            return entry.value
+
+        async with self._lock:
+            entry = self.peek(key)
+            if entry is not None:
+                return entry.value
+
+            version = self.version
+            value = await loader()
+            if version == self.version:
+                self._entries[key] = CacheEntry(value, version, time.monotonic() + self.ttl)
+            return value
+
+    def invalidate(self):
+        """
+        Drop every cached value; call after every write to the source.
+        """
+        self.version += 1
+        self._entries = {}
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Deque, List, Optional, Set
+import asyncio
+import collections
+import json
+
+# Server-Sent Events fan-out
+#
+# One Broadcaster per worker feeds every open event stream. Each event is
+# encoded once and the same bytes are queued for every subscriber, so a
+# publish costs one put per open connection. Subscriber queues are bounded:
+# a client that falls that far behind is disconnected instead of buffered,
+# and its EventSource reconnects with Last-Event-ID and catches up from the
+# recent history.
+
+SSE_RETRY_MS = 3000  # Reconnect delay suggested to EventSource clients
+HISTORY_SIZE = 64  # Recent events kept for Last-Event-ID catch-up
+SUBSCRIBER_QUEUE_SIZE = 16  # Undelivered events before a client is dropped
+HEARTBEAT = b": heartbeat\n\n"
+
+
+@dataclass
+class ServerEvent:
+    id: int  # Increases with every event; sent as the SSE id
+    event: str
+    data: dict
+    encoded: bytes = field(init=False, repr=False)
+
+    def __post_init__(self):
+        payload = json.dumps(self.data, separators=(",", ":"))
+        self.encoded = f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class Broadcaster:
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.history: Deque[ServerEvent] = collections.deque(maxlen=history_size)
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def last_event_id(self) -> Optional[int]:
+        return self.history[-1].id if self.history else None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: ServerEvent):
+        """
+        Record event and queue it for every subscriber without waiting.
+        """
+        self.history.append(event)
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up; it resumes from history after reconnecting
+                subscription.overflowed = True
+                self._subscribers.discard(subscription)
+
+    def missed_since(self, last_event_id: int) -> Optional[List[ServerEvent]]:
+        """
+        Events after last_event_id, or None when the history no longer
+        reaches back that far.
+        """
+        if not self.history or last_event_id >= self.history[-1].id:
+            return []
+        if last_event_id < self.history[0].id:
+            return None
+        return [event for event in self.history if event.id > last_event_id]
+
+
+async def event_stream(
+    broadcaster: Broadcaster,
+    last_event_id: Optional[int],
+    heartbeat: float,
+    resync: Callable[[ServerEvent], ServerEvent]
+) -> AsyncIterator[bytes]:
+    """
+    Encoded SSE stream for one client: missed events first, then live ones,
+    with a heartbeat comment whenever nothing was sent for heartbeat seconds.
+    When the missed events are no longer in history, resync(latest) is sent
+    in their place. Ends if the client falls too far behind.
+    """
+    # Subscribe before catching up so nothing published in between is lost
+    subscription = broadcaster.subscribe()
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode("utf-8")
+
+        sent = last_event_id
+        if last_event_id is not None:
+            missed = broadcaster.missed_since(last_event_id)
+            if missed is None:
+                missed = [resync(broadcaster.history[-1])]
+            for event in missed:
+                yield event.encoded
+                sent = event.id
+
+        while not subscription.overflowed:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if sent is not None and event.id <= sent:
+                continue  # Already sent during catch-up
+            yield event.encoded
+            sent = event.id
+    finally:
+        broadcaster.unsubscribe(subscription)
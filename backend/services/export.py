@@ -0,0 +1,203 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+from pymongo.errors import CursorNotFound
+from bson import ObjectId
+from bson.errors import InvalidId
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+import csv
+import io
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Streaming collection export
+#
+# Documents are read from one Motor cursor in key order, encoded straight to
+# NDJSON or CSV and sent in ~64KB chunks. Nothing else is buffered: the
+# generator only asks the cursor for its next batch once the previous chunk
+# has been written to the client, so a slow client pauses the export rather
+# than growing memory, whatever the size of the collection. Filters are part
+# of the Mongo query, never applied in Python.
+#
+# Each source is read in the order of an index it already has: _id for most,
+# (timestamp, id) for status_checks, the keyset routes/status.py pages on, so
+# a time-filtered export is one range scan of timestamp_id_desc. Resuming
+# (after_id, or an expired cursor) continues strictly after a key in that
+# same order.
+
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '2000'))  # Documents per getMore
+EXPORT_CHUNK_SIZE = 64 * 1024  # Bytes per response chunk
+EXPORT_RESUME_ATTEMPTS = 3  # Re-opens of a cursor the server expired under a slow client
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    collection: str
+    time_field: str  # Field the since/until filters apply to
+    columns: Tuple[str, ...]  # CSV columns, in order
+    id_type: Callable[[str], Any] = ObjectId  # Parses after_id/before_id
+    key: Tuple[str, ...] = ("_id",)  # Export order; the last field is what after_id/before_id name
+
+
+EXPORT_SOURCES = {
+    "status_checks": ExportSource(
+        "status_checks", "timestamp",
+        ("_id", "id", "client_name", "timestamp"),
+        id_type=str,
+        key=("timestamp", "id")
+    ),
+    "model_metadata": ExportSource(
+        "model_metadata", "created_at",
+        ("_id", "url", "format", "format_version", "gaussian_count", "sh_degree", "byte_size", "sha256", "created_at"),
+        id_type=str
+    ),
+    "assets": ExportSource(
+        "assets", "created_at",
+        ("_id", "refs", "size", "sha256", "created_at", "last_referenced_at"),
+        id_type=str
+    )
+}
+
+
+def parse_id(source: ExportSource, value: str) -> Any:
+    """
+    Convert an after_id/before_id from the query string; raises ValueError.
+    """
+    try:
+        return source.id_type(value)
+    except (InvalidId, TypeError) as e:
+        raise ValueError(f"Invalid {source.key[-1]} for {source.collection}: {value}") from e
+
+
+async def export_position(db: AsyncIOMotorDatabase, source: ExportSource, value: str) -> tuple:
+    """
+    Key of the document an after_id/before_id names; raises ValueError.
+    """
+    document_id = parse_id(source, value)
+    if len(source.key) == 1:
+        return (document_id,)
+
+    id_field = source.key[-1]
+    document = await db[source.collection].find_one({id_field: document_id}, {field: 1 for field in source.key})
+    if document is None:
+        raise ValueError(f"No {source.collection} document with {id_field} {value}")
+    return tuple(document.get(field) for field in source.key)
+
+
+def key_range(key: Tuple[str, ...], position: tuple, operator: str) -> dict:
+    """
+    Filter for the documents whose key sorts after ($gt) or before ($lt) position.
+    """
+    if len(key) == 1:
+        return {key[0]: {operator: position[0]}}
+    return {"$or": [
+        {**dict(zip(key[:index], position[:index])), key[index]: {operator: position[index]}}
+        for index in range(len(key))
+    ]}
+
+
+def export_query(
+    source: ExportSource,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[tuple] = None,
+    before: Optional[tuple] = None
+) -> dict:
+    """
+    Mongo filter for a time range [since, until) and a key range (after, before).
+    """
+    clauses = []
+    time_range = {}
+    if since is not None:
+        time_range["$gte"] = since
+    if until is not None:
+        time_range["$lt"] = until
+    if time_range:
+        clauses.append({source.time_field: time_range})
+    if after is not None:
+        clauses.append(key_range(source.key, after, "$gt"))
+    if before is not None:
+        clauses.append(key_range(source.key, before, "$lt"))
+
+    if len(clauses) > 1:
+        return {"$and": clauses}
+    return clauses[0] if clauses else {}
+
+
+def encode_value(value: Any) -> Any:
+    # json.dumps fallback for BSON types
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_line(document: dict) -> str:
+    return json.dumps(document, default=encode_value, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=encode_value, separators=(",", ":"))
+    if isinstance(value, (datetime, ObjectId)):
+        return encode_value(value)
+    return value
+
+
+async def export_documents(
+    db: AsyncIOMotorDatabase,
+    source: ExportSource,
+    query: dict,
+    format: str,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export of every document matching query, in source.key order.
+    """
+    buffer = io.StringIO()
+    writer = None
+    if format == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(source.columns)
+
+    collection = db[source.collection]
+    projection = {field: 1 for field in source.columns + source.key} if format == "csv" else None
+    sort = [(field, ASCENDING) for field in source.key]
+    last_key = None
+    attempts = 0
+    while True:
+        # After an expired cursor, continue from the last document sent
+        resume_query = query if last_key is None else {"$and": [query, key_range(source.key, last_key, "$gt")]}
+        cursor = collection.find(resume_query, projection).sort(sort).batch_size(batch_size)
+        try:
+            async for document in cursor:
+                last_key = tuple(document.get(field) for field in source.key)
+                if writer is None:
+                    buffer.write(ndjson_line(document))
+                else:
+                    writer.writerow([csv_cell(document.get(column)) for column in source.columns])
+                if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+            break
+        except CursorNotFound:
+            attempts += 1
+            if attempts > EXPORT_RESUME_ATTEMPTS:
+                raise
+            logger.info(f"Export cursor on {source.collection} expired, resuming after {last_key}")
+        finally:
+            await cursor.close()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
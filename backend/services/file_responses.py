@@ -0,0 +1,272 @@
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+import os
+import uuid
+import aiofiles
+
+# Read size when streaming file bodies
+STREAM_CHUNK_SIZE = 256 * 1024  # 256KB
+
+# Requests asking for more ranges than this get the whole file instead
+MAX_RANGES = 32
+
+# Media types of served uploads, by extension
+MEDIA_TYPES = {
+    '.ply': 'application/ply',
+    '.splat': 'application/splat',
+    '.spz': 'application/x-spz',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+ByteRange = Tuple[int, int]  # Inclusive start and end offsets
+RangeReader = Callable[[int, int], AsyncIterator[bytes]]
+
+
+def file_etag(stat_result: os.stat_result, content_id: Optional[str] = None) -> str:
+    """
+    Strong ETag for a file.
+    Uses a content identifier (e.g. a content-addressed name) when known,
+    otherwise inode, mtime and size.
+    """
+    if content_id:
+        return f'"{content_id}"'
+    return f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def _etag_list(header: str) -> List[str]:
+    # Weak validators compare equal to their strong form for If-None-Match
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match lists etag (weak comparison).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = _etag_list(if_none_match)
+    return "*" in tags or etag in tags
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since (RFC 9110 section 13.2.2).
+    """
+    if request.headers.get("if-none-match") is not None:
+        return etag_matches(request, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(mtime) <= since
+
+    return False
+
+
+def _if_range_matches(request: Request, etag: str, mtime: float) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        # Strong comparison only
+        return if_range == etag
+    try:
+        return int(mtime) == parsedate_to_datetime(if_range).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range_header(header: str, size: int) -> Optional[List[ByteRange]]:
+    """
+    Parse a bytes Range header into inclusive (start, end) pairs.
+    Returns None when the header should be ignored and the full body sent.
+    Raises 416 when no range overlaps the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start_text, sep, end_text = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+                if end < start:
+                    return None
+            else:
+                # Suffix range: the last N bytes
+                suffix = int(end_text)
+                if suffix == 0:
+                    continue
+                start = max(size - suffix, 0)
+                end = size - 1
+        except ValueError:
+            return None
+
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    return ranges
+
+
+def file_range_reader(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> RangeReader:
+    """
+    Reader yielding the bytes of path between two inclusive offsets.
+    """
+    async def read_range(start: int, end: int) -> AsyncIterator[bytes]:
+        remaining = end - start + 1
+        async with aiofiles.open(path, 'rb') as f:
+            await f.seek(start)
+            while remaining > 0:
+                chunk = await f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return read_range
+
+
+def ranged_response(
+    request: Request,
+    read_range: RangeReader,
+    size: int,
+    mtime: float,
+    etag: str,
+    media_type: str,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Build a GET/HEAD response with conditional and Range request support.
+    Sends 304, 200, 206 (single or multipart/byteranges) or 416 as appropriate.
+    """
+    response_headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        **(headers or {})
+    }
+    is_head = request.method == "HEAD"
+
+    if is_not_modified(request, etag, mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+
+    ranges = None
+    range_header = request.headers.get("range")
+    if range_header and size > 0 and _if_range_matches(request, etag, mtime):
+        try:
+            ranges = parse_range_header(range_header, size)
+        except HTTPException as e:
+            e.headers = {**response_headers, **e.headers}
+            raise
+
+    if ranges is None:
+        return _body_response(
+            is_head, read_range, [(0, size - 1)] if size else [], status.HTTP_200_OK,
+            media_type, {**response_headers, "Content-Length": str(size)}
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response_headers["Content-Length"] = str(end - start + 1)
+        return _body_response(
+            is_head, read_range, ranges, status.HTTP_206_PARTIAL_CONTENT,
+            media_type, response_headers
+        )
+
+    # Multiple ranges: multipart/byteranges body (RFC 9110 section 14.6)
+    boundary = uuid.uuid4().hex
+    part_headers = [
+        (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+    closing = f"--{boundary}--\r\n".encode()
+    content_length = sum(
+        len(head) + (end - start + 1) + 2 for head, (start, end) in zip(part_headers, ranges)
+    ) + len(closing)
+
+    async def multipart_body():
+        for head, (start, end) in zip(part_headers, ranges):
+            yield head
+            async for chunk in read_range(start, end):
+                yield chunk
+            yield b"\r\n"
+        yield closing
+
+    response_headers["Content-Length"] = str(content_length)
+    multipart_type = f"multipart/byteranges; boundary={boundary}"
+    if is_head:
+        return Response(status_code=status.HTTP_206_PARTIAL_CONTENT, headers=response_headers, media_type=multipart_type)
+    return StreamingResponse(
+        multipart_body(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        headers=response_headers,
+        media_type=multipart_type
+    )
+
+
+def _body_response(
+    is_head: bool,
+    read_range: RangeReader,
+    ranges: List[ByteRange],
+    status_code: int,
+    media_type: str,
+    headers: Mapping[str, str]
+) -> Response:
+    if is_head:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+
+    async def body():
+        for start, end in ranges:
+            async for chunk in read_range(start, end):
+                yield chunk
+
+    return StreamingResponse(body(), status_code=status_code, headers=headers, media_type=media_type)
+
+
+def media_type_for(filename: str) -> str:
+    return MEDIA_TYPES.get(Path(filename).suffix.lower(), 'application/octet-stream')
+
+
+def content_disposition(filename: str, disposition_type: str = "attachment") -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition_type}; filename*=utf-8''{quoted}"
+    return f'{disposition_type}; filename="{filename}"'
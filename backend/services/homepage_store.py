@@ -0,0 +1,187 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure, DuplicateKeyError
+from backend.models.homepage import HomepageContent
+from backend.services.json_responses import RenderedJson
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+from typing import Optional, Tuple
+import copy
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Homepage document writes
+#
+# Every write is a single find_one_and_update that $sets only the changed
+# paths and increments `revision`. Callers that pass the revision they read
+# get compare-and-swap semantics: a write based on an outdated revision
+# raises RevisionConflict instead of overwriting someone else's edit.
+#
+# Edits only ever touch this draft. The public homepage is served from a
+# separate snapshot in homepage_published: a copy of the draft at the
+# revision it was published from, with its JSON body, compressed variants
+# and ETag digest rendered ahead of time. Publishing replaces the snapshot
+# in one write and nothing else modifies it, so readers only ever see a
+# whole, finished snapshot.
+HOMEPAGE_ID = "main"
+
+# Top-level sections tracked separately in published snapshots
+HOMEPAGE_SECTIONS = ("hero", "features", "testimonials", "demo_items")
+
+
+class RevisionConflict(Exception):
+    """Raised when the homepage document changed since the caller read it."""
+
+    def __init__(self, current_revision: int):
+        super().__init__(f"Homepage content is at revision {current_revision}")
+        self.current_revision = current_revision
+
+
+def revision_filter(revision: int) -> dict:
+    # Documents written before revisions existed count as revision 0
+    if revision == 0:
+        return {"revision": {"$in": [0, None]}}
+    return {"revision": revision}
+
+
+def apply_set(document: dict, fields: dict) -> dict:
+    """
+    Copy of document with a $set of dotted paths applied, as the server would.
+    """
+    result = copy.deepcopy(document)
+    for path, value in fields.items():
+        target = result
+        *parents, leaf = path.split(".")
+        for key in parents:
+            target = target[int(key)] if isinstance(target, list) else target.setdefault(key, {})
+        if isinstance(target, list):
+            target[int(leaf)] = value
+        else:
+            target[leaf] = value
+    return result
+
+
+async def ensure_homepage_document(db: AsyncIOMotorDatabase):
+    """
+    Insert the default homepage document if none exists yet.
+    """
+    await db.homepage_content.update_one(
+        {"id": HOMEPAGE_ID},
+        {"$setOnInsert": HomepageContent(id=HOMEPAGE_ID).model_dump()},
+        upsert=True
+    )
+
+
+async def ensure_homepage_indexes(db: AsyncIOMotorDatabase):
+    # Concurrent first writes upsert by id; the unique index keeps it one document
+    for collection in (db.homepage_content, db.homepage_published):
+        try:
+            await collection.create_index("id", unique=True, name="id_unique")
+        except OperationFailure as e:
+            # Existing duplicates must be cleaned up by hand; keep serving meanwhile
+            logger.warning(f"Could not create unique index on {collection.name}.id: {e}")
+
+
+async def update_homepage_fields(
+    db: AsyncIOMotorDatabase,
+    fields: dict,
+    expected_revision: Optional[int] = None,
+    conditions: Optional[dict] = None
+) -> Optional[Tuple[dict, dict]]:
+    """
+    Atomically $set dotted paths on the homepage document and bump its revision.
+    Returns the document before and after the write, or None when conditions
+    did not match. Raises RevisionConflict when expected_revision is stale.
+    """
+    query = {"id": HOMEPAGE_ID, **(conditions or {})}
+    if expected_revision is not None:
+        query.update(revision_filter(expected_revision))
+    fields = {**fields, "updated_at": datetime.now()}
+    update = {"$set": fields, "$inc": {"revision": 1}}
+
+    for _ in range(2):
+        before = await db.homepage_content.find_one_and_update(
+            query, update, return_document=ReturnDocument.BEFORE
+        )
+        if before is not None:
+            after = apply_set(before, fields)
+            after["revision"] = (before.get("revision") or 0) + 1
+            return before, after
+
+        # Work out why nothing matched: no document yet, a stale revision, or the conditions
+        current = await db.homepage_content.find_one({"id": HOMEPAGE_ID}, {"revision": 1})
+        if current is None:
+            await ensure_homepage_document(db)
+            continue
+        current_revision = current.get("revision") or 0
+        if expected_revision is not None and current_revision != expected_revision:
+            raise RevisionConflict(current_revision)
+        return None
+
+    return None
+
+
+def section_digests(content: dict) -> dict:
+    """
+    Digest of each section, so readers can tell which sections a publish changed.
+    """
+    return {
+        section: hashlib.sha256(
+            json.dumps(jsonable_encoder(content.get(section)), sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        for section in HOMEPAGE_SECTIONS
+    }
+
+
+def published_snapshot(content: dict, rendered: RenderedJson) -> dict:
+    """
+    homepage_published document for content and its rendering.
+    """
+    return {
+        "id": HOMEPAGE_ID,
+        "revision": content.get("revision") or 0,
+        "published_at": datetime.now(),
+        "content": content,
+        "sections": section_digests(content),
+        "body": rendered.body,
+        "digest": rendered.digest,
+        "encoded": rendered.encoded
+    }
+
+
+async def save_published_snapshot(
+    db: AsyncIOMotorDatabase,
+    content: dict,
+    rendered: RenderedJson
+) -> Optional[dict]:
+    """
+    Atomically replace the published snapshot with content and its rendering.
+    Returns the snapshot it replaced, if any. Raises RevisionConflict if a
+    later draft revision has already been published.
+    """
+    revision = content.get("revision") or 0
+    try:
+        return await db.homepage_published.find_one_and_replace(
+            {"id": HOMEPAGE_ID, "revision": {"$lte": revision}},
+            published_snapshot(content, rendered),
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # The snapshot exists but is newer, so the upsert tried to add a second one
+        current = await db.homepage_published.find_one({"id": HOMEPAGE_ID}, {"revision": 1})
+        raise RevisionConflict(current["revision"] if current else revision)
+
+
+def rendered_snapshot(snapshot: dict) -> RenderedJson:
+    """
+    Pre-rendered response stored with a published snapshot.
+    """
+    return RenderedJson(
+        body=bytes(snapshot["body"]),
+        digest=snapshot["digest"],
+        encoded={coding: bytes(data) for coding, data in (snapshot.get("encoded") or {}).items()}
+    )
@@ -0,0 +1,60 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from backend.services.asset_store import store_file, asset_url
+from backend.services.uploads import temp_path_for
+from pathlib import Path
+from typing import Optional, Tuple
+import asyncio
+import base64
+import binascii
+import mimetypes
+import re
+
+# Inline (data URL) images
+#
+# Images used to be embedded in the homepage document as base64 data URLs,
+# inflating every homepage response. They are now extracted into the asset
+# store and replaced by their /uploads/ URL.
+DATA_URL_RE = re.compile(r"^data:(?P<mime>[\w.+-]+/[\w.+-]+)?(?:;[^,;]+=[^,;]+)*;base64,", re.IGNORECASE)
+
+
+def is_data_url(value: Optional[str]) -> bool:
+    return bool(value) and bool(DATA_URL_RE.match(value))
+
+
+def decode_data_url(data_url: str) -> Tuple[str, bytes]:
+    """
+    Media type and bytes of a base64 data URL.
+    Raises ValueError if it is not one.
+    """
+    match = DATA_URL_RE.match(data_url)
+    if not match:
+        raise ValueError("Not a base64 data URL")
+    try:
+        data = base64.b64decode(data_url[match.end():], validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 in data URL: {e}")
+    return (match.group("mime") or "application/octet-stream").lower(), data
+
+
+def extension_for(media_type: str) -> str:
+    return mimetypes.guess_extension(media_type) or ""
+
+
+def _write_file(path: Path, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+async def store_data_url(db: AsyncIOMotorDatabase, upload_dir: Path, data_url: str) -> str:
+    """
+    Store the image in a data URL as an asset and return its /uploads/ URL.
+    The caller owns one reference to the stored file.
+    """
+    media_type, data = decode_data_url(data_url)
+    temp_path = temp_path_for(upload_dir / "inline")
+    try:
+        await asyncio.to_thread(_write_file, temp_path, data)
+        filename, _ = await store_file(db, upload_dir, temp_path, extension_for(media_type))
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return asset_url(filename)
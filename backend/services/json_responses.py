@@ -0,0 +1,87 @@
+from fastapi import Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from backend.services.compression import (
+    brotli,
+    negotiate_encoding,
+    MIN_SAVINGS,
+    GZIP_LEVEL,
+    BROTLI_QUALITY
+)
+from backend.services.file_responses import etag_matches
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+import gzip
+import hashlib
+import json
+
+# Pre-rendered JSON responses
+#
+# A rarely changing document is serialized (and compressed) once per version
+# and served as raw bytes, skipping response_model validation and JSON
+# encoding on every request. Bytes match what FastAPI's JSONResponse would send.
+
+# Bodies smaller than this are not worth precompressing
+MIN_COMPRESS_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class RenderedJson:
+    body: bytes
+    digest: str
+    encoded: Dict[str, bytes]  # Precompressed bodies keyed by content-coding
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        # Each content-coding is a distinct representation with its own strong ETag
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+def render_json(value: Any) -> RenderedJson:
+    """
+    Serialize value once, with gzip/brotli variants of larger bodies.
+    """
+    body = json.dumps(
+        jsonable_encoder(value),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+    encoded = {}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        candidates = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+        encoded = {
+            coding: data for coding, data in candidates.items()
+            if len(data) <= len(body) * (1 - MIN_SAVINGS)
+        }
+
+    return RenderedJson(body=body, digest=hashlib.sha256(body).hexdigest()[:32], encoded=encoded)
+
+
+def rendered_json_response(
+    request: Request,
+    rendered: RenderedJson,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Send pre-rendered JSON, negotiating a precompressed body and answering
+    a matching If-None-Match with 304.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), rendered.encoded)
+    etag = rendered.etag(encoding)
+    response_headers = {"ETag": etag, **(headers or {})}
+    if rendered.encoded:
+        response_headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+        body = rendered.encoded[encoding]
+    else:
+        body = rendered.body
+    return Response(content=body, media_type="application/json", headers=response_headers)
@@ -0,0 +1,68 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from backend.models.model_metadata import ModelMetadata
+from backend.services.asset_store import asset_url
+from backend.services.mongo import ensure_indexes
+from backend.services.splat import read_model_metadata
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple, List
+import asyncio
+
+# Index of stored 3D models
+#
+# One `model_metadata` document per uploaded .ply/.splat, keyed by its stored
+# filename, so clients can see what a model is before downloading it.
+# The document is removed together with the asset (see asset_store.release_asset).
+MODEL_METADATA_INDEXES = [
+    ([("created_at", DESCENDING)], {"name": "created_at_desc"}),
+    ([("format", ASCENDING), ("created_at", DESCENDING)], {"name": "format_created_at"}),
+    ([("gaussian_count", ASCENDING)], {"name": "gaussian_count"}),
+    ([("sha256", ASCENDING)], {"name": "sha256"})
+]
+
+
+async def ensure_model_indexes(db: AsyncIOMotorDatabase):
+    """
+    Index model_metadata for the newest-first listing, its format filter and
+    lookups by gaussian count or digest.
+    """
+    await ensure_indexes(db.model_metadata, MODEL_METADATA_INDEXES)
+
+
+async def record_model_metadata(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str) -> ModelMetadata:
+    """
+    Parse a stored model once and upsert its metadata document.
+    Raises PlyFormatError for files that are not gaussian splat models.
+    """
+    path = upload_dir / filename
+    info = await asyncio.to_thread(read_model_metadata, path)
+
+    asset = await db.assets.find_one({"_id": filename}, {"sha256": 1, "created_at": 1}) or {}
+    metadata = ModelMetadata(
+        filename=filename,
+        url=asset_url(filename),
+        byte_size=path.stat().st_size,
+        sha256=asset.get("sha256", filename.split('.')[0]),
+        created_at=asset.get("created_at", datetime.utcnow()),
+        **info
+    )
+
+    await db.model_metadata.replace_one({"_id": filename}, {"_id": filename, **metadata.model_dump()}, upsert=True)
+    return metadata
+
+
+async def list_model_metadata(
+    db: AsyncIOMotorDatabase,
+    format: Optional[str] = None,
+    limit: int = 50,
+    skip: int = 0
+) -> Tuple[List[ModelMetadata], int]:
+    """
+    Newest models first, with the total matching count.
+    """
+    query = {"format": format} if format else {}
+    cursor = db.model_metadata.find(query).sort([("created_at", DESCENDING), ("_id", DESCENDING)]).skip(skip).limit(limit)
+    items = [ModelMetadata(**doc) async for doc in cursor]
+    total = await db.model_metadata.count_documents(query)
+    return items, total
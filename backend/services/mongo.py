@@ -0,0 +1,83 @@
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from typing import List, Tuple
+import asyncio
+import importlib.util
+import os
+
+# Mongo client
+#
+# Each worker opens one AsyncIOMotorClient in the app lifespan, on the loop
+# that serves requests, and closes it on shutdown. Pool, compression and
+# timeout settings come from the environment and take precedence over the
+# same options in MONGO_URL. The pool is filled to MONGO_MIN_POOL_SIZE before
+# the worker takes traffic, so the first requests after a deploy do not wait
+# on connection handshakes.
+
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+# Idle connections above the minimum are closed after this long
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+# Wire compressors (zstd needs zstandard, snappy needs python-snappy) by
+# package that provides them, in order of preference
+COMPRESSOR_PACKAGES = [("zstd", "zstandard"), ("snappy", "snappy"), ("zlib", None)]
+
+
+def installed_compressors() -> str:
+    """
+    The compressors this worker can actually use, best first.
+    """
+    return ",".join(
+        name for name, package in COMPRESSOR_PACKAGES
+        if package is None or importlib.util.find_spec(package) is not None
+    )
+
+
+# The first one the server also supports is used. The default lists only
+# installed compressors, so the driver never skips one with a warning.
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', installed_compressors())
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '10000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000'))
+# 0 leaves these unlimited, the driver default
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '0'))
+
+
+def mongo_client_options() -> dict:
+    """
+    Keyword arguments for AsyncIOMotorClient from the settings above.
+    """
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    return options
+
+
+def create_mongo_client(url: str) -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(url, **mongo_client_options())
+
+
+async def warm_pool(client: AsyncIOMotorClient, connections: int = MONGO_MIN_POOL_SIZE):
+    """
+    Open up to `connections` pooled connections now rather than on first use.
+    """
+    # Concurrent commands each check out their own connection
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(connections, 1))))
+
+
+async def ensure_indexes(collection: AsyncIOMotorCollection, indexes: List[Tuple[list, dict]]):
+    """
+    Create each (keys, options) index on collection.
+    """
+    # Mongo accepts an identical existing index, so every worker runs this on start
+    for keys, options in indexes:
+        await collection.create_index(keys, **options)
@@ -0,0 +1,275 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import PyMongoError
+from backend.services.compression import build_compressed_variants
+from backend.services.splat import (
+    convert_ply_to_splat,
+    open_gaussian_source,
+    build_model_tiers,
+    build_progressive_splat,
+    PlyFormatError
+)
+from backend.services.spz import encode_spz, spz_error_metrics
+from backend.services.model_index import record_model_metadata
+from backend.services.mongo import ensure_indexes
+from backend.services.storage import get_storage
+from backend.services.status_checks import EPOCH
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Write full models and device tiers most important gaussian first, so a
+# viewer can render a coarse model from the first bytes of the stream
+SPLAT_PROGRESSIVE = os.environ.get('SPLAT_PROGRESSIVE', 'true').lower() == 'true'
+
+# Post-upload processing
+#
+# Runs after the upload response has been sent. CPU-heavy steps run in a
+# worker thread so the event loop keeps serving requests. Derived files are
+# sidecars named <stored filename>.<suffix>, which share the source asset's
+# lifetime, and are recorded under `variants` on its assets document.
+#
+# With local storage this runs in the API process. Remote backends (S3,
+# GridFS) keep no local copy, and processing one means downloading the whole
+# object, so those uploads are queued in `processing_jobs` instead and built
+# by `python -m backend.scripts.process_uploads`, which runs outside the API.
+# A worker holds a lease on the job it is processing; a job whose worker died
+# is taken again once the lease runs out, up to PROCESSING_MAX_ATTEMPTS times.
+
+PROCESSING_LEASE = timedelta(minutes=float(os.environ.get('PROCESSING_LEASE_MINUTES', '30')))
+PROCESSING_MAX_ATTEMPTS = int(os.environ.get('PROCESSING_MAX_ATTEMPTS', '3'))
+PROCESSING_POLL_INTERVAL = float(os.environ.get('PROCESSING_POLL_INTERVAL', '5'))  # Seconds between polls of an empty queue
+PROCESSING_JOB_INDEXES = [
+    ([("lease_until", ASCENDING), ("queued_at", ASCENDING)], {"name": "lease_until_queued_at"})
+]
+
+
+async def _record_variant(db: AsyncIOMotorDatabase, filename: str, kind: str, variant_filename: str):
+    await db.assets.update_one(
+        {"_id": filename},
+        {"$set": {f"variants.{kind}": variant_filename}}
+    )
+
+
+async def index_model(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str):
+    """
+    Record the metadata of an uploaded model in the model index.
+    """
+    try:
+        metadata = await record_model_metadata(db, upload_dir, filename)
+    except PlyFormatError as e:
+        logger.info(f"Skipping model index of {filename}: {e}")
+        return
+    logger.info(f"Indexed {filename}: {metadata.gaussian_count} gaussians, SH degree {metadata.sh_degree}")
+
+
+async def convert_to_splat(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str) -> Path:
+    """
+    Convert an uploaded gaussian PLY to the compact .splat layout.
+    Returns the path of the .splat file, or None if the PLY is not convertible.
+    """
+    splat_filename = f"{filename}.splat"
+    splat_path = upload_dir / splat_filename
+
+    if not splat_path.exists():
+        try:
+            count = await asyncio.to_thread(convert_ply_to_splat, upload_dir / filename, splat_path)
+        except PlyFormatError as e:
+            logger.info(f"Skipping .splat conversion of {filename}: {e}")
+            return None
+        logger.info(f"Converted {filename} to .splat ({count} gaussians)")
+
+    await _record_variant(db, filename, "splat", splat_filename)
+    return splat_path
+
+
+async def build_progressive_model(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str) -> Path:
+    """
+    Write the full model as an importance-ordered .splat and record the byte
+    offsets of its quality milestones under `progressive`.
+    Returns the path of the .splat file, or None if the upload is not convertible.
+    """
+    splat_filename = f"{filename}.splat"
+    splat_path = upload_dir / splat_filename
+
+    asset = await db.assets.find_one({"_id": filename}, {"progressive": 1})
+    if not splat_path.exists() or not (asset and asset.get("progressive")):
+        try:
+            info = await asyncio.to_thread(build_progressive_splat, upload_dir / filename, splat_path)
+        except PlyFormatError as e:
+            logger.info(f"Skipping progressive .splat of {filename}: {e}")
+            return None
+        logger.info(f"Wrote progressive .splat for {filename} ({info['gaussian_count']} gaussians)")
+        await db.assets.update_one({"_id": filename}, {"$set": {"progressive": info}})
+
+    await _record_variant(db, filename, "splat", splat_filename)
+    return splat_path
+
+
+def _encode_spz_with_metrics(src_path: Path, spz_path: Path) -> dict:
+    source = open_gaussian_source(src_path)
+    info = encode_spz(source, spz_path)
+    info["source_byte_size"] = src_path.stat().st_size
+    info["error"] = spz_error_metrics(source, spz_path)
+    return info
+
+
+async def encode_compressed_splat(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str):
+    """
+    Encode an uploaded PLY or .splat as quantized SPZ and record its size and
+    round-trip error against the source.
+    """
+    spz_filename = f"{filename}.spz"
+    spz_path = upload_dir / spz_filename
+
+    asset = await db.assets.find_one({"_id": filename}, {"spz": 1})
+    if not spz_path.exists() or not (asset and asset.get("spz")):
+        try:
+            info = await asyncio.to_thread(_encode_spz_with_metrics, upload_dir / filename, spz_path)
+        except PlyFormatError as e:
+            logger.info(f"Skipping SPZ encoding of {filename}: {e}")
+            return
+        logger.info(
+            f"Encoded {filename} as SPZ: {info['byte_size']} bytes "
+            f"from {info['source_byte_size']} ({info['gaussian_count']} gaussians)"
+        )
+        await db.assets.update_one({"_id": filename}, {"$set": {"spz": info}})
+
+    await _record_variant(db, filename, "spz", spz_filename)
+
+
+def tier_filename(filename: str, tier: str) -> str:
+    return f"{filename}.{tier}.splat"
+
+
+async def build_device_tiers(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str):
+    """
+    Write importance-pruned .splat tiers for lower-end devices and precompress them.
+    """
+    try:
+        counts = await asyncio.to_thread(
+            build_model_tiers,
+            upload_dir / filename,
+            lambda tier: upload_dir / tier_filename(filename, tier),
+            SPLAT_PROGRESSIVE
+        )
+    except PlyFormatError as e:
+        logger.info(f"Skipping device tiers of {filename}: {e}")
+        return
+
+    for tier, count in counts.items():
+        await asyncio.to_thread(build_compressed_variants, upload_dir / tier_filename(filename, tier))
+        await _record_variant(db, filename, f"tiers.{tier}", tier_filename(filename, tier))
+        await db.assets.update_one({"_id": filename}, {"$set": {f"tier_counts.{tier}": count}})
+    if counts:
+        logger.info(f"Built device tiers for {filename}: {counts}")
+
+
+async def build_derived_files(db: AsyncIOMotorDatabase, work_dir: Path, filename: str):
+    path = work_dir / filename
+    # Precompressed variants are built once here, never per request
+    await asyncio.to_thread(build_compressed_variants, path)
+
+    if path.suffix in ('.ply', '.splat'):
+        await index_model(db, work_dir, filename)
+
+    splat_path = None
+    if SPLAT_PROGRESSIVE and path.suffix in ('.ply', '.splat'):
+        splat_path = await build_progressive_model(db, work_dir, filename)
+    elif path.suffix == '.ply':
+        splat_path = await convert_to_splat(db, work_dir, filename)
+    if splat_path:
+        await asyncio.to_thread(build_compressed_variants, splat_path)
+
+    if path.suffix in ('.ply', '.splat'):
+        await build_device_tiers(db, work_dir, filename)
+        await encode_compressed_splat(db, work_dir, filename)
+
+
+async def process_upload(db: AsyncIOMotorDatabase, upload_dir: Path, filename: str):
+    """
+    Build every derived file for a stored upload.
+    Failures are logged; the original upload is always left servable.
+    """
+    storage = get_storage(upload_dir)
+    work_dir = upload_dir
+    try:
+        try:
+            if not storage.keeps_local_files:
+                # Remote backends keep no local copy; work on a scratch one
+                work_dir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix=".processing-", dir=upload_dir))
+                await storage.fetch(filename, work_dir / filename)
+            await build_derived_files(db, work_dir, filename)
+        except Exception:
+            logger.exception(f"Error processing upload {filename}")
+
+        try:
+            # Skip assets released while they were being processed
+            if await db.assets.find_one({"_id": filename}, {"_id": 1}):
+                await storage.publish_sidecars(filename, work_dir)
+        except Exception:
+            logger.exception(f"Error publishing derived files of {filename}")
+    finally:
+        if work_dir != upload_dir:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+
+async def ensure_processing_indexes(db: AsyncIOMotorDatabase):
+    """
+    Index processing_jobs on lease expiry, the order workers claim jobs in.
+    """
+    await ensure_indexes(db.processing_jobs, PROCESSING_JOB_INDEXES)
+
+
+async def enqueue_processing(db: AsyncIOMotorDatabase, filename: str):
+    """
+    Queue a stored upload for a processing worker; a no-op while it is queued.
+    """
+    await db.processing_jobs.update_one(
+        {"_id": filename},
+        {"$setOnInsert": {"queued_at": datetime.utcnow(), "lease_until": EPOCH, "attempts": 0}},
+        upsert=True
+    )
+
+
+async def claim_processing_job(db: AsyncIOMotorDatabase, now: datetime) -> Optional[dict]:
+    """
+    Lease the oldest job no worker holds, or return None when there is none.
+    """
+    return await db.processing_jobs.find_one_and_update(
+        {"lease_until": {"$lte": now}, "attempts": {"$lt": PROCESSING_MAX_ATTEMPTS}},
+        {"$set": {"lease_until": now + PROCESSING_LEASE}, "$inc": {"attempts": 1}},
+        sort=[("lease_until", ASCENDING), ("queued_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def run_processing_jobs(
+    db: AsyncIOMotorDatabase,
+    upload_dir: Path,
+    poll_interval: float = PROCESSING_POLL_INTERVAL
+):
+    """
+    Process queued uploads one at a time until cancelled.
+    """
+    while True:
+        try:
+            job = await claim_processing_job(db, datetime.utcnow())
+        except PyMongoError as e:
+            logger.warning(f"Claiming a processing job failed: {e}")
+            job = None
+        if job is None:
+            await asyncio.sleep(poll_interval)
+            continue
+
+        if job["attempts"] > 1:
+            logger.info(f"Retrying processing of {job['_id']} (attempt {job['attempts']})")
+        await process_upload(db, upload_dir, job["_id"])
+        await db.processing_jobs.delete_one({"_id": job["_id"]})
@@ -0,0 +1,270 @@
+from backend.services.storage import UploadStorage, LocalStorage, StoredFile, StatCache, STAT_CACHE_TTL
+from backend.services.file_responses import RangeReader, STREAM_CHUNK_SIZE, media_type_for
+from backend.services.compression import VARIANT_SUFFIXES
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+from urllib.parse import quote
+import asyncio
+import base64
+import math
+import re
+import uuid
+
+try:
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:  # Only needed when UPLOAD_STORAGE=s3
+    boto3 = None
+
+# S3-compatible object storage (AWS S3, MinIO, ...)
+#
+# Browsers upload straight to the bucket through presigned multipart URLs
+# and download through presigned (or CDN) URLs, so model bytes do not pass
+# through the API workers. Incoming uploads land under <prefix>incoming/ and
+# are moved to their content-addressed key when the upload is completed;
+# S3 computes their digest, so completing one reads no bytes either.
+DIRECT_UPLOAD_PART_SIZE = 16 * 1024 * 1024  # 16MB; S3 requires >= 5MB for all but the last part
+MAX_UPLOAD_PARTS = 10000
+PRESIGN_EXPIRES = 3600  # Seconds
+
+# Content-coding of precompressed sidecars, by suffix
+SUFFIX_ENCODINGS = {suffix: encoding for encoding, suffix in VARIANT_SUFFIXES.items()}
+
+
+def object_headers(name: str) -> dict:
+    """
+    Content-Type (and Content-Encoding for precompressed variants) to store
+    with an object, so redirected downloads get the same headers we serve.
+    """
+    base, suffix = name, Path(name).suffix
+    extra = {}
+    if suffix in SUFFIX_ENCODINGS:
+        base = name[:-len(suffix)]
+        extra["ContentEncoding"] = SUFFIX_ENCODINGS[suffix]
+    return {"ContentType": media_type_for(base), **extra}
+
+
+class S3Storage(UploadStorage):
+    supports_direct_upload = True
+
+    def __init__(
+        self,
+        bucket: str,
+        upload_dir: Path,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        public_base_url: Optional[str] = None,
+        presign_expires: int = PRESIGN_EXPIRES,
+        client=None
+    ):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("UPLOAD_STORAGE=s3 requires boto3")
+            client = boto3.client(
+                's3',
+                endpoint_url=endpoint_url,
+                region_name=region,
+                config=Config(signature_version='s3v4')
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.public_base_url = public_base_url.rstrip('/') if public_base_url else None
+        self.presign_expires = presign_expires
+        self.local = LocalStorage(upload_dir)
+        # Cached stats carry presigned URLs, which must outlive the entry
+        self.stat_cache = StatCache(ttl=min(STAT_CACHE_TTL, presign_expires / 2))
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def _head(self, key: str) -> Optional[dict]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def stat(self, name: str) -> Optional[StoredFile]:
+        if not name or name.startswith('.') or '/' in name:
+            return None
+        head = await asyncio.to_thread(self._head, self.key(name))
+        if head is None:
+            return await self.local.stat(name)
+        return StoredFile(
+            name=name,
+            size=head["ContentLength"],
+            mtime=head["LastModified"].timestamp(),
+            version=head["ETag"].strip('"'),
+            url=self.download_url(name)
+        )
+
+    def range_reader(self, name: str, chunk_size: int = STREAM_CHUNK_SIZE) -> RangeReader:
+        local_reader = self.local.range_reader(name)
+
+        async def read_range(start: int, end: int) -> AsyncIterator[bytes]:
+            try:
+                response = await asyncio.to_thread(
+                    self.client.get_object, Bucket=self.bucket, Key=self.key(name), Range=f"bytes={start}-{end}"
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                    raise
+                async for chunk in local_reader(start, end):
+                    yield chunk
+                return
+
+            body = response["Body"]
+            try:
+                while chunk := await asyncio.to_thread(body.read, chunk_size):
+                    yield chunk
+            finally:
+                body.close()
+
+        return read_range
+
+    def download_url(self, name: str) -> Optional[str]:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{quote(self.key(name))}"
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={"Bucket": self.bucket, "Key": self.key(name)},
+            ExpiresIn=self.presign_expires
+        )
+
+    async def publish(self, name: str, local_path: Path):
+        self.stat_cache.discard(name)
+        # Stored names are content-addressed; an existing key already holds these bytes
+        if await asyncio.to_thread(self._head, self.key(name)):
+            return
+        await asyncio.to_thread(
+            self.client.upload_file, str(local_path), self.bucket, self.key(name),
+            ExtraArgs=object_headers(name)
+        )
+
+    async def adopt(self, name: str, incoming_key: str):
+        """
+        Move a directly uploaded object to its stored name with a server-side copy.
+        """
+        self.stat_cache.discard(name)
+        if not await asyncio.to_thread(self._head, self.key(name)):
+            await asyncio.to_thread(
+                self.client.copy,
+                {"Bucket": self.bucket, "Key": incoming_key},
+                self.bucket,
+                self.key(name),
+                ExtraArgs={**object_headers(name), "MetadataDirective": "REPLACE"}
+            )
+        await self.discard_incoming(incoming_key)
+
+    async def delete(self, name: str):
+        def delete_objects():
+            keys = [self.key(name)]
+            paginator = self.client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.key(name)}."):
+                keys.extend(item["Key"] for item in page.get("Contents", []))
+            for start in range(0, len(keys), 1000):
+                self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True}
+                )
+
+        await asyncio.to_thread(delete_objects)
+        await self.local.delete(name)
+        self.stat_cache.discard(name)
+
+    # Direct browser uploads
+
+    def incoming_key(self, extension: str = "") -> str:
+        return f"{self.prefix}incoming/{uuid.uuid4().hex}{extension.lower()}"
+
+    def is_incoming_key(self, key: str) -> bool:
+        return bool(re.fullmatch(rf"{re.escape(self.prefix)}incoming/[0-9a-f]{{32}}(\.[a-z0-9]+)?", key))
+
+    def part_size_for(self, file_size: int) -> int:
+        # Grow parts for very large files to stay within the S3 part limit
+        return max(DIRECT_UPLOAD_PART_SIZE, math.ceil(file_size / MAX_UPLOAD_PARTS))
+
+    async def create_direct_upload(self, filename: str, file_size: int) -> dict:
+        """
+        Start a multipart upload and presign a PUT URL for every part.
+        """
+        key = self.incoming_key(Path(filename).suffix)
+        part_size = self.part_size_for(file_size)
+        part_count = max(1, math.ceil(file_size / part_size))
+
+        def create():
+            upload = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)
+            parts = [
+                {
+                    "part_number": number,
+                    "url": self.client.generate_presigned_url(
+                        'upload_part',
+                        Params={
+                            "Bucket": self.bucket,
+                            "Key": key,
+                            "UploadId": upload["UploadId"],
+                            "PartNumber": number
+                        },
+                        ExpiresIn=self.presign_expires
+                    )
+                }
+                for number in range(1, part_count + 1)
+            ]
+            return upload["UploadId"], parts
+
+        upload_id, parts = await asyncio.to_thread(create)
+        return {"upload_id": upload_id, "key": key, "part_size": part_size, "parts": parts}
+
+    async def complete_direct_upload(self, upload_id: str, key: str, parts: List[dict]) -> int:
+        """
+        Assemble the uploaded parts. Returns the object size.
+        """
+        def complete():
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda part: part["part_number"])
+                ]}
+            )
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+        return await asyncio.to_thread(complete)
+
+    async def abort_direct_upload(self, upload_id: str, key: str):
+        await asyncio.to_thread(self.client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    async def incoming_sha256(self, key: str) -> str:
+        """
+        SHA-256 hex digest of a directly uploaded object, computed by S3.
+        """
+        # Multipart checksums only cover the parts, so copy the object onto
+        # itself (one CopyObject, objects up to 5GB) to have S3 hash it whole
+        def copy_with_checksum():
+            return self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+                ChecksumAlgorithm="SHA256"
+            )
+
+        response = await asyncio.to_thread(copy_with_checksum)
+        return base64.b64decode(response["CopyObjectResult"]["ChecksumSHA256"]).hex()
+
+    async def fetch(self, name: str, dest_path: Path):
+        try:
+            await asyncio.to_thread(self.client.download_file, self.bucket, self.key(name), str(dest_path))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise
+            await self.local.fetch(name, dest_path)
+
+    async def discard_incoming(self, key: str):
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
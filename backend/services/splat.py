@@ -0,0 +1,488 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+import os
+import uuid
+import numpy as np
+
+# Gaussian splat formats
+#
+# 3D Gaussian Splatting PLY files store one vertex per gaussian with float
+# properties x/y/z, f_dc_0..2, f_rest_*, opacity, scale_0..2 and rot_0..3.
+# The .splat layout used by web viewers packs each gaussian into 32 bytes:
+# position (3 x float32), scale (3 x float32, linear), RGBA (4 x uint8) and
+# rotation (4 x uint8, quaternion w,x,y,z mapped from [-1, 1]).
+
+# Zeroth-order spherical harmonic constant, maps DC coefficients to RGB
+SH_C0 = 0.28209479177387814
+
+SPLAT_DTYPE = np.dtype([
+    ('position', '<f4', (3,)),
+    ('scale', '<f4', (3,)),
+    ('color', 'u1', (4,)),
+    ('rotation', 'u1', (4,))
+])
+
+# Gaussians converted per block; bounds memory for very large files
+CONVERT_BLOCK_SIZE = 1 << 20
+
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8'
+}
+
+PLY_BYTE_ORDER = {
+    'binary_little_endian': '<',
+    'binary_big_endian': '>'
+}
+
+REQUIRED_GAUSSIAN_PROPERTIES = (
+    'x', 'y', 'z',
+    'f_dc_0', 'f_dc_1', 'f_dc_2',
+    'opacity',
+    'scale_0', 'scale_1', 'scale_2',
+    'rot_0', 'rot_1', 'rot_2', 'rot_3'
+)
+
+
+class PlyFormatError(ValueError):
+    """Raised when a file is not a readable gaussian splat file."""
+
+
+@dataclass
+class PlyElement:
+    name: str
+    count: int
+    properties: List[Tuple[str, str]] = field(default_factory=list)  # (name, numpy type code)
+    has_lists: bool = False
+
+
+@dataclass
+class PlyHeader:
+    format: str
+    version: str
+    elements: List[PlyElement]
+    header_size: int  # Bytes up to and including end_header
+
+    def element(self, name: str) -> PlyElement:
+        for element in self.elements:
+            if element.name == name:
+                return element
+        raise PlyFormatError(f"PLY file has no '{name}' element")
+
+
+def read_ply_header(path: Path, max_header_size: int = 64 * 1024) -> PlyHeader:
+    """
+    Parse the text header of a PLY file.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(max_header_size)
+
+    end = head.find(b"end_header\n")
+    if not head.startswith(b"ply") or end < 0:
+        raise PlyFormatError("Not a PLY file or header too large")
+    header_size = end + len(b"end_header\n")
+
+    fmt, version = None, None
+    elements: List[PlyElement] = []
+    for line in head[:end].decode('ascii', errors='replace').splitlines()[1:]:
+        parts = line.split()
+        if not parts or parts[0] in ('comment', 'obj_info'):
+            continue
+        if parts[0] == 'format':
+            fmt, version = parts[1], parts[2]
+        elif parts[0] == 'element':
+            elements.append(PlyElement(name=parts[1], count=int(parts[2])))
+        elif parts[0] == 'property':
+            if not elements:
+                raise PlyFormatError("PLY property declared before any element")
+            if parts[1] == 'list':
+                elements[-1].has_lists = True
+                continue
+            if parts[1] not in PLY_TYPES:
+                raise PlyFormatError(f"Unsupported PLY property type '{parts[1]}'")
+            elements[-1].properties.append((parts[2], PLY_TYPES[parts[1]]))
+
+    if fmt is None:
+        raise PlyFormatError("PLY header has no format line")
+
+    return PlyHeader(format=fmt, version=version, elements=elements, header_size=header_size)
+
+
+def ply_vertex_dtype(header: PlyHeader) -> np.dtype:
+    if header.format not in PLY_BYTE_ORDER:
+        raise PlyFormatError(f"Only binary PLY files are supported, got '{header.format}'")
+    byte_order = PLY_BYTE_ORDER[header.format]
+    vertex = header.element('vertex')
+    return np.dtype([(name, byte_order + code) for name, code in vertex.properties])
+
+
+def load_ply_vertices(path: Path, header: PlyHeader = None) -> np.memmap:
+    """
+    Memory-map the vertex element of a binary PLY as a structured array.
+    Nothing is read from disk until fields are accessed.
+    """
+    header = header or read_ply_header(path)
+    dtype = ply_vertex_dtype(header)
+
+    # Elements are stored in header order; skip any fixed-size elements before vertices
+    offset = header.header_size
+    for element in header.elements:
+        if element.name == 'vertex':
+            break
+        if element.has_lists:
+            raise PlyFormatError(f"Cannot skip variable-size element '{element.name}'")
+        offset += element.count * np.dtype([(n, c) for n, c in element.properties]).itemsize
+
+    vertex = header.element('vertex')
+    missing = [name for name in REQUIRED_GAUSSIAN_PROPERTIES if name not in dtype.names]
+    if missing:
+        raise PlyFormatError(f"PLY vertices are missing gaussian properties: {', '.join(missing)}")
+    if os.path.getsize(path) < offset + vertex.count * dtype.itemsize:
+        raise PlyFormatError("PLY file is truncated")
+
+    if vertex.count == 0:
+        # mmap cannot map zero bytes
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(vertex.count,))
+
+
+@dataclass
+class Gaussians:
+    """
+    A block of gaussians in the PLY parameterisation.
+    """
+    positions: np.ndarray  # (N, 3) float32
+    log_scales: np.ndarray  # (N, 3) float32, natural log of the axis scales
+    rotations: np.ndarray  # (N, 4) float32 unit quaternions (w, x, y, z)
+    colors: np.ndarray  # (N, 3) float32 SH DC coefficients
+    alphas: np.ndarray  # (N,) float32 opacity logits
+    sh: np.ndarray  # (N, K, 3) float32 higher-order SH coefficients, K in (0, 3, 8, 15)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def sh_degree(self) -> int:
+        return SH_DEGREES[self.sh.shape[1]]
+
+
+# Higher-order SH coefficients per channel for each degree
+SH_DEGREES = {0: 0, 3: 1, 8: 2, 15: 3}
+
+
+def _normalize(quaternions: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return quaternions / np.where(norms > 0, norms, 1.0)
+
+
+def _stack(vertices: np.ndarray, names) -> np.ndarray:
+    return np.stack([np.asarray(vertices[name], dtype=np.float32) for name in names], axis=1)
+
+
+class PlySource:
+    """
+    Block-wise reader over a memory-mapped gaussian PLY.
+    """
+    def __init__(self, path: Path):
+        self.vertices = load_ply_vertices(path)
+        rest = sorted(
+            (name for name in self.vertices.dtype.names if name.startswith('f_rest_')),
+            key=lambda name: int(name[len('f_rest_'):])
+        )
+        coeffs = len(rest) // 3
+        # Drop coefficients beyond the highest complete SH degree
+        self.sh_coeffs = max(k for k in SH_DEGREES if k <= coeffs)
+        # PLY stores f_rest channel-major: f_rest_{channel * coeffs + k}
+        self.sh_names = [
+            [f'f_rest_{channel * coeffs + k}' for channel in range(3)]
+            for k in range(self.sh_coeffs)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def block(self, start: int, stop: int, include_sh: bool = True) -> Gaussians:
+        return self._gaussians(self.vertices[start:stop], include_sh)
+
+    def take(self, indices: np.ndarray, include_sh: bool = True) -> Gaussians:
+        # Fancy indexing a memmap reads only the selected rows
+        return self._gaussians(self.vertices[indices], include_sh)
+
+    def positions(self, start: int, stop: int) -> np.ndarray:
+        return _stack(self.vertices[start:stop], ('x', 'y', 'z'))
+
+    def _gaussians(self, v: np.ndarray, include_sh: bool) -> Gaussians:
+        sh = np.empty((len(v), self.sh_coeffs if include_sh else 0, 3), dtype=np.float32)
+        if include_sh:
+            for k, names in enumerate(self.sh_names):
+                sh[:, k, :] = _stack(v, names)
+        return Gaussians(
+            positions=_stack(v, ('x', 'y', 'z')),
+            log_scales=_stack(v, ('scale_0', 'scale_1', 'scale_2')),
+            rotations=_normalize(_stack(v, ('rot_0', 'rot_1', 'rot_2', 'rot_3'))),
+            colors=_stack(v, ('f_dc_0', 'f_dc_1', 'f_dc_2')),
+            alphas=np.asarray(v['opacity'], dtype=np.float32),
+            sh=sh
+        )
+
+
+class SplatSource:
+    """
+    Block-wise reader over a memory-mapped .splat file.
+    Colors, opacities and rotations come back at the 8-bit precision stored.
+    """
+    sh_coeffs = 0
+
+    def __init__(self, path: Path):
+        size = os.path.getsize(path)
+        if size % SPLAT_DTYPE.itemsize:
+            raise PlyFormatError(".splat file size is not a multiple of 32 bytes")
+        # mmap cannot map zero bytes
+        self.rows = np.memmap(path, dtype=SPLAT_DTYPE, mode='r') if size else np.empty(0, dtype=SPLAT_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def block(self, start: int, stop: int, include_sh: bool = True) -> Gaussians:
+        return self._gaussians(self.rows[start:stop])
+
+    def take(self, indices: np.ndarray, include_sh: bool = True) -> Gaussians:
+        return self._gaussians(self.rows[indices])
+
+    def positions(self, start: int, stop: int) -> np.ndarray:
+        return self.rows['position'][start:stop]
+
+    def _gaussians(self, rows: np.ndarray) -> Gaussians:
+        rgba = rows['color'].astype(np.float32) / 255.0
+        # Keep opacities strictly inside (0, 1) so the logit stays finite
+        opacity = np.clip(rgba[:, 3], 0.5 / 255.0, 1.0 - 0.5 / 255.0)
+        return Gaussians(
+            positions=rows['position'].astype(np.float32),
+            log_scales=np.log(np.maximum(rows['scale'].astype(np.float32), 1e-30)),
+            rotations=_normalize((rows['rotation'].astype(np.float32) - 128.0) / 128.0),
+            colors=(rgba[:, :3] - 0.5) / SH_C0,
+            alphas=np.log(opacity / (1.0 - opacity)),
+            sh=np.empty((len(rows), 0, 3), dtype=np.float32)
+        )
+
+
+def open_gaussian_source(path: Path):
+    """
+    Block-wise reader for a .ply or .splat file, chosen by extension.
+    """
+    if path.suffix.lower() == '.splat':
+        return SplatSource(path)
+    return PlySource(path)
+
+
+def read_model_metadata(path: Path, block_size: int = CONVERT_BLOCK_SIZE) -> dict:
+    """
+    Describe a .ply or .splat model: format, gaussian count, SH degree and
+    bounding box. Positions are scanned block by block from the memory map.
+    """
+    if path.suffix.lower() == '.splat':
+        fmt, version = "splat", None
+    else:
+        header = read_ply_header(path)
+        fmt, version = "ply", f"{header.format} {header.version}"
+    source = open_gaussian_source(path)
+
+    bounding_box = None
+    for start in range(0, len(source), block_size):
+        positions = source.positions(start, start + block_size)
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        if bounding_box is not None:
+            low = np.minimum(low, bounding_box[0])
+            high = np.maximum(high, bounding_box[1])
+        bounding_box = (low, high)
+
+    return {
+        "format": fmt,
+        "format_version": version,
+        "gaussian_count": len(source),
+        "sh_degree": SH_DEGREES[source.sh_coeffs],
+        "bounding_box": {
+            "min": [float(v) for v in bounding_box[0]],
+            "max": [float(v) for v in bounding_box[1]]
+        } if bounding_box is not None else None
+    }
+
+
+def gaussians_to_splat(gaussians: Gaussians) -> np.ndarray:
+    """
+    Pack gaussians into .splat rows without per-gaussian loops.
+    """
+    rows = np.empty(len(gaussians), dtype=SPLAT_DTYPE)
+
+    rows['position'] = gaussians.positions
+    rows['scale'] = np.exp(gaussians.log_scales)
+
+    colors = np.empty((len(gaussians), 4), dtype=np.float32)
+    colors[:, :3] = 0.5 + SH_C0 * gaussians.colors
+    colors[:, 3] = 1.0 / (1.0 + np.exp(-gaussians.alphas))
+    rows['color'] = np.clip(colors * 255.0, 0, 255).astype(np.uint8)
+
+    rows['rotation'] = np.clip(gaussians.rotations * 128.0 + 128.0, 0, 255).astype(np.uint8)
+
+    return rows
+
+
+def convert_ply_to_splat(src_path: Path, dest_path: Path, block_size: int = CONVERT_BLOCK_SIZE) -> int:
+    """
+    Convert a binary gaussian splat PLY to a .splat file.
+    The source is memory-mapped and converted in blocks; the output appears
+    atomically at dest_path. Returns the number of gaussians written.
+    """
+    return write_splat(PlySource(src_path), dest_path, block_size=block_size)
+
+
+def gaussian_importance(gaussians: Gaussians) -> np.ndarray:
+    """
+    Visual importance of each gaussian: opacity times ellipsoid volume.
+    """
+    opacity = 1.0 / (1.0 + np.exp(-gaussians.alphas))
+    return opacity * np.exp(np.sum(gaussians.log_scales, axis=1))
+
+
+def source_importance(source, block_size: int = CONVERT_BLOCK_SIZE) -> np.ndarray:
+    """
+    Importance for every gaussian of a source, computed block by block.
+    """
+    scores = np.empty(len(source), dtype=np.float32)
+    for start in range(0, len(source), block_size):
+        block = source.block(start, start + block_size, include_sh=False)
+        scores[start:start + len(block)] = gaussian_importance(block)
+    return scores
+
+
+def most_important(scores: np.ndarray, count: int) -> np.ndarray:
+    """
+    Indices of the count highest-scoring gaussians, in file order.
+    """
+    if count >= len(scores):
+        return np.arange(len(scores))
+    return np.sort(np.argpartition(-scores, count - 1)[:count])
+
+
+def write_splat(source, dest_path: Path, indices: np.ndarray = None, block_size: int = CONVERT_BLOCK_SIZE) -> int:
+    """
+    Write the selected gaussians of a source (all when indices is None) as a
+    .splat file, appearing atomically at dest_path. Returns the count written.
+    """
+    temp_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}.part")
+    count = len(source) if indices is None else len(indices)
+
+    try:
+        with open(temp_path, 'wb') as out:
+            for start in range(0, count, block_size):
+                if indices is None:
+                    block = source.block(start, start + block_size, include_sh=False)
+                else:
+                    block = source.take(indices[start:start + block_size], include_sh=False)
+                gaussians_to_splat(block).tofile(out)
+        os.replace(temp_path, dest_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return count
+
+
+# Device tiers: fraction of the full model kept, capped at a gaussian count
+# that low-memory GPUs can sort and render at interactive rates
+MODEL_TIERS = {
+    "medium": (0.5, 1_000_000),
+    "low": (0.2, 250_000)
+}
+
+
+def tier_count(total: int, tier: str) -> int:
+    fraction, cap = MODEL_TIERS[tier]
+    return min(total, cap, max(1, int(total * fraction)))
+
+
+def build_model_tiers(src_path: Path, dest_for_tier, progressive: bool = False) -> dict:
+    """
+    Write a pruned .splat for each device tier that is smaller than the full model.
+    dest_for_tier maps a tier name to its output path. With progressive=True
+    each tier is written most important first, making it a prefix of the
+    progressive full model. Returns the gaussian count written for each tier.
+    """
+    source = open_gaussian_source(src_path)
+    scores = None
+    order = None
+    written = {}
+
+    for tier in MODEL_TIERS:
+        count = tier_count(len(source), tier)
+        if count >= len(source):
+            continue
+        if scores is None:
+            scores = source_importance(source)
+        if progressive:
+            if order is None:
+                order = importance_order(scores)
+            indices = order[:count]
+        else:
+            indices = most_important(scores, count)
+        written[tier] = write_splat(source, dest_for_tier(tier), indices)
+
+    return written
+
+
+# Progressive streaming: share of total importance reached at each milestone
+PROGRESSIVE_LEVELS = (0.5, 0.75, 0.9, 0.95, 0.99, 1.0)
+
+
+def importance_order(scores: np.ndarray) -> np.ndarray:
+    """
+    Gaussian indices from most to least important.
+    """
+    return np.argsort(-scores, kind='stable')
+
+
+def importance_milestones(sorted_scores: np.ndarray, levels=PROGRESSIVE_LEVELS) -> list:
+    """
+    For scores sorted most important first, the prefix length (and .splat
+    byte offset) at which each share of the total importance is reached.
+    """
+    if len(sorted_scores) == 0:
+        return []
+
+    cumulative = np.cumsum(sorted_scores, dtype=np.float64)
+    total = cumulative[-1]
+    milestones = []
+    for level in levels:
+        if level >= 1.0 or total <= 0:
+            count = len(sorted_scores)
+        else:
+            count = int(np.searchsorted(cumulative, level * total)) + 1
+        milestones.append({
+            "importance": level,
+            "gaussians": count,
+            "fraction": count / len(sorted_scores),
+            "bytes": count * SPLAT_DTYPE.itemsize
+        })
+    return milestones
+
+
+def build_progressive_splat(src_path: Path, dest_path: Path, levels=PROGRESSIVE_LEVELS) -> dict:
+    """
+    Write a .splat with the most important gaussians first, so any prefix of
+    the file is a usable lower-quality model. Returns the gaussian count and
+    the byte offsets of each quality milestone.
+    """
+    source = open_gaussian_source(src_path)
+    scores = source_importance(source)
+    order = importance_order(scores)
+    write_splat(source, dest_path, order)
+    return {
+        "gaussian_count": len(order),
+        "milestones": importance_milestones(scores[order], levels)
+    }
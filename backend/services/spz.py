@@ -0,0 +1,257 @@
+from backend.services.splat import Gaussians, PlyFormatError, SH_C0, CONVERT_BLOCK_SIZE
+from pathlib import Path
+from typing import Optional
+import gzip
+import os
+import struct
+import uuid
+import numpy as np
+
+# Quantized compressed splats (SPZ version 2)
+#
+# Layout, after a 16-byte header, is column-major so similar bytes sit together:
+#   positions  N x 3 x 24-bit signed fixed point
+#   alphas     N x uint8, sigmoid(opacity)
+#   colors     N x 3 x uint8, SH DC scaled by COLOR_SCALE around 0.5
+#   scales     N x 3 x uint8, log-scale in 1/16 steps from -10
+#   rotations  N x 3 x uint8, quaternion x/y/z with w >= 0 implied
+#   sh         N x K x 3 x uint8, 5 bits for degree 1 and 4 bits above
+# The whole stream is gzip-compressed as the entropy-coding stage. Gaussians
+# keep the coordinate frame of the source PLY, matching our .splat output.
+SPZ_MAGIC = 0x5053474e  # "NGSP"
+SPZ_VERSION = 2
+SPZ_HEADER = struct.Struct('<IIIBBBB')  # magic, version, count, sh degree, fractional bits, flags, reserved
+
+COLOR_SCALE = 0.15
+DEFAULT_FRACTIONAL_BITS = 12
+SH1_BITS = 5
+SH_REST_BITS = 4
+
+# Coefficients per channel for each SH degree
+SH_COEFFS = {0: 0, 1: 3, 2: 8, 3: 15}
+
+
+def _to_uint8(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+def _fractional_bits(max_abs: float, preferred: int = DEFAULT_FRACTIONAL_BITS) -> int:
+    # Largest precision that still fits every coordinate in a signed 24-bit integer
+    bits = preferred
+    while bits > 0 and max_abs * (1 << bits) >= (1 << 23) - 1:
+        bits -= 1
+    return bits
+
+
+def _quantize_sh(values: np.ndarray, bits: int) -> np.ndarray:
+    bucket = 1 << (8 - bits)
+    q = np.rint(values * 128.0).astype(np.int32) + 128
+    q = (q + bucket // 2) // bucket * bucket
+    return np.clip(q, 0, 255).astype(np.uint8)
+
+
+def quantize_gaussians(gaussians: Gaussians, fractional_bits: int) -> dict:
+    """
+    Quantize a block of gaussians into SPZ byte columns.
+    """
+    count = len(gaussians)
+
+    fixed = np.rint(gaussians.positions.astype(np.float64) * (1 << fractional_bits)).astype('<i4')
+    positions = fixed.reshape(-1, 1).view(np.uint8).reshape(count * 3, 4)[:, :3]
+
+    alphas = _to_uint8(255.0 / (1.0 + np.exp(-gaussians.alphas)))
+    colors = _to_uint8(gaussians.colors * (COLOR_SCALE * 255.0) + 0.5 * 255.0)
+    scales = _to_uint8((gaussians.log_scales + 10.0) * 16.0)
+
+    # Flip to the w >= 0 hemisphere so w can be rebuilt from x, y, z
+    rotations = gaussians.rotations * np.where(gaussians.rotations[:, :1] < 0, -1.0, 1.0)
+    rotations = _to_uint8(rotations[:, 1:] * 127.5 + 127.5)
+
+    sh = np.empty(gaussians.sh.shape, dtype=np.uint8)
+    sh[:, :3] = _quantize_sh(gaussians.sh[:, :3], SH1_BITS)
+    sh[:, 3:] = _quantize_sh(gaussians.sh[:, 3:], SH_REST_BITS)
+
+    return {
+        "positions": positions.reshape(count, 9),
+        "alphas": alphas,
+        "colors": colors,
+        "scales": scales,
+        "rotations": rotations,
+        "sh": sh.reshape(count, -1)
+    }
+
+
+def source_sh_degree(source) -> int:
+    """
+    SH degree available from a gaussian source.
+    """
+    return {coeffs: degree for degree, coeffs in SH_COEFFS.items()}[source.sh_coeffs]
+
+
+def encode_spz(
+    source,
+    dest_path: Path,
+    sh_degree: Optional[int] = None,
+    compresslevel: int = 6,
+    block_size: int = CONVERT_BLOCK_SIZE
+) -> dict:
+    """
+    Encode a gaussian source (see splat.open_gaussian_source) as an SPZ file.
+    Quantization is vectorized block by block into byte columns, then the
+    columns are written through gzip; compresslevel=0 stores them without
+    entropy coding. Returns header information about the file written.
+    """
+    count = len(source)
+    sh_degree = source_sh_degree(source) if sh_degree is None else min(sh_degree, source_sh_degree(source))
+    sh_coeffs = SH_COEFFS[sh_degree]
+
+    # First pass finds the coordinate range for the fixed-point precision
+    max_abs = 0.0
+    for start in range(0, count, block_size):
+        block = source.block(start, start + block_size, include_sh=False)
+        if len(block):
+            max_abs = max(max_abs, float(np.abs(block.positions).max()))
+    fractional_bits = _fractional_bits(max_abs)
+
+    columns = {
+        "positions": np.empty((count, 9), dtype=np.uint8),
+        "alphas": np.empty(count, dtype=np.uint8),
+        "colors": np.empty((count, 3), dtype=np.uint8),
+        "scales": np.empty((count, 3), dtype=np.uint8),
+        "rotations": np.empty((count, 3), dtype=np.uint8),
+        "sh": np.empty((count, sh_coeffs * 3), dtype=np.uint8)
+    }
+    for start in range(0, count, block_size):
+        block = source.block(start, start + block_size, include_sh=sh_coeffs > 0)
+        block.sh = block.sh[:, :sh_coeffs]
+        for name, values in quantize_gaussians(block, fractional_bits).items():
+            columns[name][start:start + len(block)] = values
+
+    temp_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        with open(temp_path, 'wb') as raw_out:
+            with gzip.GzipFile(fileobj=raw_out, mode='wb', compresslevel=compresslevel, mtime=0) as out:
+                out.write(SPZ_HEADER.pack(SPZ_MAGIC, SPZ_VERSION, count, sh_degree, fractional_bits, 0, 0))
+                for name in ("positions", "alphas", "colors", "scales", "rotations", "sh"):
+                    out.write(columns[name].tobytes())
+        os.replace(temp_path, dest_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return {
+        "gaussian_count": count,
+        "sh_degree": sh_degree,
+        "fractional_bits": fractional_bits,
+        "byte_size": dest_path.stat().st_size
+    }
+
+
+def decode_spz(path: Path, indices: Optional[np.ndarray] = None) -> Gaussians:
+    """
+    Decode an SPZ version 2 file back to float gaussians.
+    When indices is given only those gaussians are dequantized.
+    """
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+
+    if len(data) < SPZ_HEADER.size:
+        raise PlyFormatError("SPZ file is truncated")
+    magic, version, count, sh_degree, fractional_bits, _, _ = SPZ_HEADER.unpack_from(data)
+    if magic != SPZ_MAGIC or version != SPZ_VERSION:
+        raise PlyFormatError(f"Unsupported SPZ file (magic {magic:#x}, version {version})")
+    if sh_degree not in SH_COEFFS:
+        raise PlyFormatError(f"Unsupported SPZ SH degree {sh_degree}")
+    sh_coeffs = SH_COEFFS[sh_degree]
+
+    offset = SPZ_HEADER.size
+
+    def take(width: int) -> np.ndarray:
+        nonlocal offset
+        size = count * width
+        if offset + size > len(data):
+            raise PlyFormatError("SPZ file is truncated")
+        column = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset).reshape(count, width)
+        offset += size
+        return column if indices is None else column[indices]
+
+    if indices is not None:
+        count_out = len(indices)
+    else:
+        count_out = count
+
+    packed_positions = take(9).reshape(count_out * 3, 3).astype(np.int32)
+    fixed = packed_positions[:, 0] | (packed_positions[:, 1] << 8) | (packed_positions[:, 2] << 16)
+    fixed = np.where(fixed & 0x800000, fixed - (1 << 24), fixed)
+    positions = (fixed.astype(np.float32) / (1 << fractional_bits)).reshape(count_out, 3)
+
+    alphas = take(1)[:, 0].astype(np.float32) / 255.0
+    alphas = np.clip(alphas, 0.5 / 255.0, 1.0 - 0.5 / 255.0)
+    colors = (take(3).astype(np.float32) / 255.0 - 0.5) / COLOR_SCALE
+    log_scales = take(3).astype(np.float32) / 16.0 - 10.0
+
+    xyz = take(3).astype(np.float32) / 127.5 - 1.0
+    w = np.sqrt(np.maximum(0.0, 1.0 - np.sum(xyz * xyz, axis=1, keepdims=True)))
+    rotations = np.concatenate([w, xyz], axis=1)
+    rotations /= np.linalg.norm(rotations, axis=1, keepdims=True)
+
+    sh = (take(sh_coeffs * 3).astype(np.float32) - 128.0) / 128.0
+
+    return Gaussians(
+        positions=positions,
+        log_scales=log_scales,
+        rotations=rotations,
+        colors=colors,
+        alphas=np.log(alphas / (1.0 - alphas)),
+        sh=sh.reshape(count_out, sh_coeffs, 3)
+    )
+
+
+def spz_error_metrics(source, spz_path: Path, sample_size: int = 100_000, seed: int = 0) -> dict:
+    """
+    Round-trip fidelity of an SPZ file against its source, measured on a
+    random sample of gaussians. Errors are reported in the units viewers see:
+    world units for positions, degrees for rotations, 0-1 RGB/opacity and
+    relative axis scale.
+    """
+    count = len(source)
+    if count == 0:
+        return {"sample_size": 0}
+
+    rng = np.random.default_rng(seed)
+    indices = np.sort(rng.choice(count, size=min(sample_size, count), replace=False))
+    original = source.take(indices)
+    decoded = decode_spz(spz_path, indices)
+
+    position_error = np.linalg.norm(original.positions - decoded.positions, axis=1)
+
+    # Log-scales are clamped to [-10, 6); ignore gaussians too small to see
+    visible = original.log_scales > -10.0
+    scale_ratio = (np.exp(np.abs(original.log_scales - decoded.log_scales)) - 1.0)[visible]
+
+    dots = np.abs(np.sum(original.rotations * decoded.rotations, axis=1))
+    rotation_error = np.degrees(2.0 * np.arccos(np.clip(dots, 0.0, 1.0)))
+
+    rgb_error = np.abs(SH_C0 * (original.colors - decoded.colors))
+
+    def sigmoid(x):
+        return 1.0 / (1.0 + np.exp(-x))
+    opacity_error = np.abs(sigmoid(original.alphas) - sigmoid(decoded.alphas))
+
+    metrics = {
+        "sample_size": int(len(indices)),
+        "position_rmse": float(np.sqrt(np.mean(position_error ** 2))),
+        "position_max": float(position_error.max()),
+        "scale_relative_mean": float(scale_ratio.mean()) if scale_ratio.size else 0.0,
+        "scale_relative_max": float(scale_ratio.max()) if scale_ratio.size else 0.0,
+        "rotation_mean_degrees": float(rotation_error.mean()),
+        "rotation_max_degrees": float(rotation_error.max()),
+        "color_rmse": float(np.sqrt(np.mean(rgb_error ** 2))),
+        "opacity_max": float(opacity_error.max())
+    }
+
+    sh_coeffs = decoded.sh.shape[1]
+    if sh_coeffs:
+        sh_error = original.sh[:, :sh_coeffs] - decoded.sh
+        metrics["sh_rmse"] = float(np.sqrt(np.mean(sh_error ** 2)))
+
+    return metrics
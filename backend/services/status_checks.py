@@ -0,0 +1,178 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from pymongo.write_concern import WriteConcern
+from backend.models.status import StatusCheck
+from backend.services.batch_writer import BatchWriter
+from backend.services.mongo import ensure_indexes
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import base64
+import binascii
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Status check queries
+#
+# Status checks are listed newest first with keyset pagination on
+# (timestamp, id): each page starts strictly after the last row of the
+# previous one, so every page is a bounded scan of the timestamp_id_desc
+# index however deep it is and however large the collection grows.
+#
+# Raw checks are kept forever unless STATUS_RETENTION_DAYS is set, in which
+# case a TTL index on timestamp expires them after that many days; long-range
+# counts come from status_rollups (see status_rollups.py). With
+# STATUS_TIMESERIES on, a new deployment creates status_checks as a
+# time-series collection instead (MongoDB 6.0+ for the secondary index
+# above), which expires whole buckets rather than rows.
+STATUS_CHECK_SORT = [("timestamp", DESCENDING), ("id", DESCENDING)]
+STATUS_CHECK_INDEXES = [
+    (STATUS_CHECK_SORT, {"name": "timestamp_id_desc"})
+]
+
+EPOCH = datetime(1970, 1, 1)
+
+STATUS_RETENTION_DAYS = float(os.environ.get('STATUS_RETENTION_DAYS', '0'))
+STATUS_TIMESERIES = os.environ.get('STATUS_TIMESERIES', 'false').lower() == 'true'
+STATUS_TTL_INDEX = "timestamp_ttl"
+INDEX_OPTIONS_CONFLICT = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
+
+# Optional coalesced inserts for POST /api/status (see batch_writer.py)
+STATUS_WRITE_BATCHING = os.environ.get('STATUS_WRITE_BATCHING', 'false').lower() == 'true'
+STATUS_BATCH_MAX_SIZE = int(os.environ.get('STATUS_BATCH_MAX_SIZE', '500'))
+STATUS_BATCH_MAX_DELAY = float(os.environ.get('STATUS_BATCH_MAX_DELAY', '0.01'))  # Seconds
+STATUS_BATCH_MAX_PENDING = int(os.environ.get('STATUS_BATCH_MAX_PENDING', '10000'))
+
+
+class InvalidCursor(ValueError):
+    """Raised for pagination cursors this server did not issue."""
+
+
+async def ensure_status_indexes(db: AsyncIOMotorDatabase):
+    """
+    Index status_checks for newest-first keyset pagination.
+    """
+    await ensure_indexes(db.status_checks, STATUS_CHECK_INDEXES)
+
+
+def retention_seconds() -> int:
+    return int(STATUS_RETENTION_DAYS * 86400)
+
+
+async def ensure_status_collection(db: AsyncIOMotorDatabase):
+    """
+    Apply the retention period to status_checks, creating it as a
+    time-series collection first when configured and it does not exist yet.
+    Runs before ensure_status_indexes.
+    """
+    expire_after = retention_seconds()
+    existing = await db.list_collections(filter={"name": "status_checks"}).to_list(1)
+
+    if not existing and STATUS_TIMESERIES:
+        options = {"timeseries": {"timeField": "timestamp", "metaField": "client_name", "granularity": "seconds"}}
+        if expire_after:
+            options["expireAfterSeconds"] = expire_after
+        try:
+            await db.create_collection("status_checks", **options)
+            return
+        except OperationFailure as e:
+            logger.warning(f"Time-series collections unavailable, using a TTL index: {e}")
+
+    if existing and existing[0].get("type") == "timeseries":
+        # Retention is a collection option here, not an index
+        await db.command("collMod", "status_checks", expireAfterSeconds=expire_after or "off")
+        return
+
+    await ensure_retention_index(db, expire_after)
+
+
+async def ensure_retention_index(db: AsyncIOMotorDatabase, expire_after: int):
+    """
+    Create or retune the TTL index on timestamp; drop it when retention is off.
+    """
+    if not expire_after:
+        try:
+            await db.status_checks.drop_index(STATUS_TTL_INDEX)
+        except OperationFailure:
+            pass  # Never created
+        return
+
+    try:
+        await db.status_checks.create_index(
+            [("timestamp", ASCENDING)],
+            name=STATUS_TTL_INDEX,
+            expireAfterSeconds=expire_after
+        )
+    except OperationFailure as e:
+        if e.code not in INDEX_OPTIONS_CONFLICT:
+            raise
+        # Same index, new retention period: change it in place
+        await db.command("collMod", "status_checks", index={"name": STATUS_TTL_INDEX, "expireAfterSeconds": expire_after})
+
+
+def create_status_writer(db: AsyncIOMotorDatabase) -> BatchWriter:
+    """
+    Batch writer for status checks; the caller starts and closes it.
+    """
+    # Journaled, so an acknowledged check survives a crash; one journal
+    # commit covers the whole batch
+    collection = db.status_checks.with_options(write_concern=WriteConcern(j=True))
+    return BatchWriter(
+        collection,
+        max_batch=STATUS_BATCH_MAX_SIZE,
+        max_delay=STATUS_BATCH_MAX_DELAY,
+        max_pending=STATUS_BATCH_MAX_PENDING
+    )
+
+
+def encode_cursor(timestamp: datetime, check_id: str) -> str:
+    """
+    Opaque cursor pointing just past a status check.
+    """
+    # Mongo stores milliseconds, so that is all the cursor needs
+    millis = (timestamp.replace(tzinfo=None) - EPOCH) // timedelta(milliseconds=1)
+    return base64.urlsafe_b64encode(f"{millis}:{check_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        millis, check_id = raw.split(":", 1)
+        return EPOCH + timedelta(milliseconds=int(millis)), check_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+def after_cursor_query(cursor: Optional[str]) -> dict:
+    """
+    Filter for the status checks that sort after cursor.
+    """
+    if cursor is None:
+        return {}
+    timestamp, check_id = decode_cursor(cursor)
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "id": {"$lt": check_id}}
+    ]}
+
+
+async def list_status_checks(
+    db: AsyncIOMotorDatabase,
+    limit: int = 100,
+    after: Optional[str] = None
+) -> Tuple[List[StatusCheck], Optional[str]]:
+    """
+    One page of status checks, newest first, and the cursor for the next
+    page (None on the last one). Raises InvalidCursor for a bad `after`.
+    """
+    # One extra row tells whether another page follows
+    cursor = db.status_checks.find(after_cursor_query(after), {"_id": 0}).sort(STATUS_CHECK_SORT).limit(limit + 1)
+    documents = await cursor.to_list(limit + 1)
+
+    items = [StatusCheck(**document) for document in documents[:limit]]
+    next_cursor = None
+    if len(documents) > limit:
+        next_cursor = encode_cursor(items[-1].timestamp, items[-1].id)
+    return items, next_cursor
@@ -0,0 +1,199 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from backend.models.status import StatusRollup
+from backend.services.status_checks import EPOCH
+from backend.services.mongo import ensure_indexes
+from datetime import datetime, timedelta
+from typing import List, Optional
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Status check rollups
+#
+# A background job counts status checks per client_name in per-minute and
+# per-hour buckets, stored in `status_rollups`, so dashboards read a few
+# hundred summary rows instead of scanning raw checks. Counting runs inside
+# Mongo: raw rows are grouped into minute buckets and $merge'd into the
+# summary collection, then minute buckets are summed into hour buckets the
+# same way. Buckets are recomputed whole, so rerunning a window is harmless.
+#
+# `status_rollup_state` records how far raw checks have been rolled up and
+# holds a short lease, so only one worker at a time does the work.
+
+ROLLUP_STEPS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1)
+}
+
+# How long each granularity is kept (days)
+ROLLUP_RETENTION = {
+    "minute": timedelta(days=float(os.environ.get('STATUS_MINUTE_ROLLUP_RETENTION_DAYS', '30'))),
+    "hour": timedelta(days=float(os.environ.get('STATUS_HOUR_ROLLUP_RETENTION_DAYS', '400')))
+}
+
+STATUS_ROLLUP_INTERVAL = float(os.environ.get('STATUS_ROLLUP_INTERVAL', '60'))  # Seconds between runs
+# Checks newer than this (seconds) may still be in flight and are left for the next run
+STATUS_ROLLUP_LAG = float(os.environ.get('STATUS_ROLLUP_LAG', '30'))
+ROLLUP_CHUNK = timedelta(hours=1)  # Raw time range aggregated per pass
+ROLLUP_LEASE = timedelta(minutes=5)
+ROLLUP_STATE_ID = "status_checks"
+
+STATUS_ROLLUP_INDEXES = [
+    # Also the $merge key
+    ([("granularity", ASCENDING), ("client_name", ASCENDING), ("bucket", ASCENDING)],
+     {"name": "granularity_client_bucket", "unique": True}),
+    ([("granularity", ASCENDING), ("bucket", ASCENDING), ("client_name", ASCENDING)],
+     {"name": "granularity_bucket_client"}),
+    ([("expires_at", ASCENDING)], {"name": "expires_at_ttl", "expireAfterSeconds": 0})
+]
+
+
+async def ensure_rollup_indexes(db: AsyncIOMotorDatabase):
+    """
+    Index status_rollups on its $merge key, for range reads across clients,
+    and on expires_at to drop buckets past their retention.
+    """
+    await ensure_indexes(db.status_rollups, STATUS_ROLLUP_INDEXES)
+
+
+def floor_time(value: datetime, step: timedelta) -> datetime:
+    """
+    Start of the bucket of size step that value falls in.
+    """
+    return EPOCH + (value - EPOCH) // step * step
+
+
+def bucket_expression(field: str, step: timedelta) -> dict:
+    # Date rounded down to a multiple of step (works before $dateTrunc existed)
+    step_ms = int(step / timedelta(milliseconds=1))
+    return {"$subtract": [field, {"$mod": [{"$toLong": field}, step_ms]}]}
+
+
+def merge_stage(granularity: str) -> List[dict]:
+    return [
+        {"$project": {
+            "_id": 0,
+            "granularity": granularity,
+            "client_name": "$_id.client_name",
+            "bucket": "$_id.bucket",
+            "count": 1,
+            "expires_at": {"$add": ["$_id.bucket", int(ROLLUP_RETENTION[granularity] / timedelta(milliseconds=1))]}
+        }},
+        {"$merge": {
+            "into": "status_rollups",
+            "on": ["granularity", "client_name", "bucket"],
+            "whenMatched": "merge",
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+async def rollup_window(db: AsyncIOMotorDatabase, start: datetime, end: datetime):
+    """
+    Recount minute buckets for raw checks in [start, end) and the hour
+    buckets they belong to. start and end must be minute boundaries.
+    """
+    minute_pipeline = [
+        {"$match": {"timestamp": {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {"client_name": "$client_name", "bucket": bucket_expression("$timestamp", ROLLUP_STEPS["minute"])},
+            "count": {"$sum": 1}
+        }}
+    ] + merge_stage("minute")
+    await db.status_checks.aggregate(minute_pipeline).to_list(None)
+
+    hour = ROLLUP_STEPS["hour"]
+    hour_pipeline = [
+        {"$match": {
+            "granularity": "minute",
+            "bucket": {"$gte": floor_time(start, hour), "$lt": floor_time(end - timedelta(microseconds=1), hour) + hour}
+        }},
+        {"$group": {
+            "_id": {"client_name": "$client_name", "bucket": bucket_expression("$bucket", hour)},
+            "count": {"$sum": "$count"}
+        }}
+    ] + merge_stage("hour")
+    await db.status_rollups.aggregate(hour_pipeline).to_list(None)
+
+
+async def claim_rollup_lease(db: AsyncIOMotorDatabase, now: datetime) -> Optional[dict]:
+    """
+    Take the rollup lease and return the rollup state, or None while another
+    worker holds it.
+    """
+    try:
+        return await db.status_rollup_state.find_one_and_update(
+            {"_id": ROLLUP_STATE_ID, "$or": [{"lease_until": {"$exists": False}}, {"lease_until": {"$lte": now}}]},
+            {"$set": {"lease_until": now + ROLLUP_LEASE}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # The state exists and its lease is held, so the upsert collided
+        return None
+
+
+async def run_rollups(db: AsyncIOMotorDatabase, now: datetime) -> Optional[datetime]:
+    """
+    Roll up every complete minute of raw checks not yet counted.
+    Returns the time rolled up to, or None if another worker is on it.
+    """
+    state = await claim_rollup_lease(db, now)
+    if state is None:
+        return None
+
+    try:
+        end = floor_time(now - timedelta(seconds=STATUS_ROLLUP_LAG), ROLLUP_STEPS["minute"])
+        start = state.get("through")
+        if start is None:
+            oldest = await db.status_checks.find({}, {"timestamp": 1}).sort("timestamp", ASCENDING).limit(1).to_list(1)
+            if not oldest:
+                return None
+            start = floor_time(oldest[0]["timestamp"], ROLLUP_STEPS["minute"])
+
+        while start < end:
+            chunk_end = min(start + ROLLUP_CHUNK, end)
+            await rollup_window(db, start, chunk_end)
+            await db.status_rollup_state.update_one(
+                {"_id": ROLLUP_STATE_ID},
+                {"$set": {"through": chunk_end, "lease_until": datetime.utcnow() + ROLLUP_LEASE}}
+            )
+            start = chunk_end
+        return start
+    finally:
+        await db.status_rollup_state.update_one({"_id": ROLLUP_STATE_ID}, {"$set": {"lease_until": EPOCH}})
+
+
+async def run_rollup_job(db: AsyncIOMotorDatabase, interval: float = STATUS_ROLLUP_INTERVAL):
+    """
+    Run rollups every interval seconds until cancelled.
+    """
+    while True:
+        try:
+            await run_rollups(db, datetime.utcnow())
+        except PyMongoError as e:
+            logger.warning(f"Status rollup failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def list_rollups(
+    db: AsyncIOMotorDatabase,
+    granularity: str,
+    since: datetime,
+    until: datetime,
+    client_name: Optional[str] = None,
+    limit: int = 1000
+) -> List[StatusRollup]:
+    """
+    Counts per bucket in [since, until), oldest first.
+    """
+    query = {"granularity": granularity, "bucket": {"$gte": since, "$lt": until}}
+    if client_name is not None:
+        query["client_name"] = client_name
+    cursor = db.status_rollups.find(query, {"_id": 0, "client_name": 1, "bucket": 1, "count": 1})
+    cursor = cursor.sort([("bucket", ASCENDING), ("client_name", ASCENDING)]).limit(limit)
+    return [StatusRollup(**document) async for document in cursor]
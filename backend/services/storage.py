@@ -0,0 +1,306 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+from gridfs.errors import NoFile
+from pymongo.errors import DuplicateKeyError
+from backend.services.file_responses import file_etag, file_range_reader, RangeReader, STREAM_CHUNK_SIZE
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+import aiofiles
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Storage backends for uploaded files
+#
+# Uploads are always staged and hashed in the local upload directory. A
+# storage backend decides where the finished files and their
+# <name>.<suffix> sidecars are published and served from:
+#   local   the upload directory itself (single host or shared volume)
+#   gridfs  a GridFS bucket in the application database, so every replica
+#           can serve every file without a shared filesystem
+#   s3      an S3-compatible bucket with presigned direct upload and
+#           download URLs (see s3_storage.py)
+#
+# Remote backends (gridfs, s3) keep no copy in the upload directory: a file
+# is uploaded from its staging path, and processing (which memory-maps
+# files) works on a scratch copy fetched from the backend and removed
+# afterwards.
+STORAGE_BACKENDS = ("local", "gridfs", "s3")
+GRIDFS_BUCKET = "uploads"
+
+# Remote stats are a Mongo query or an S3 HEAD, so the serving path reads
+# them through a per-worker cache. Stored names are content-addressed: a
+# file that was found stays the same until it is deleted, which also drops
+# it from this worker's cache (other workers hold it for at most the TTL).
+# Misses expire sooner, since sidecars appear once processing finishes.
+STAT_CACHE_TTL = float(os.environ.get('STORAGE_STAT_CACHE_TTL', '300'))  # Seconds
+STAT_MISS_TTL = float(os.environ.get('STORAGE_STAT_MISS_TTL', '10'))  # Seconds
+STAT_CACHE_SIZE = 10000  # Entries
+
+
+@dataclass
+class StoredFile:
+    name: str
+    size: int
+    mtime: float
+    version: str  # Changes whenever the stored bytes could have changed
+    url: Optional[str] = None  # Where clients download it directly, if not through the API
+
+    def etag(self, content_id: Optional[str] = None) -> str:
+        return f'"{content_id}"' if content_id else f'"{self.version}"'
+
+
+class StatCache:
+    """
+    Bounded LRU of stat results by name, including misses (None).
+    """
+    def __init__(self, ttl: float = STAT_CACHE_TTL, miss_ttl: float = STAT_MISS_TTL, max_entries: int = STAT_CACHE_SIZE):
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[StoredFile], float]]" = OrderedDict()
+
+    def get(self, name: str) -> Tuple[bool, Optional[StoredFile]]:
+        """
+        (True, result) for a fresh entry, else (False, None).
+        """
+        entry = self._entries.get(name)
+        if entry is None or time.monotonic() >= entry[1]:
+            return False, None
+        self._entries.move_to_end(name)
+        return True, entry[0]
+
+    def put(self, name: str, stored: Optional[StoredFile]):
+        ttl = self.ttl if stored is not None else self.miss_ttl
+        self._entries[name] = (stored, time.monotonic() + ttl)
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, name: str):
+        """
+        Forget name and its <name>.<suffix> sidecars.
+        """
+        prefix = f"{name}."
+        for cached in [cached for cached in self._entries if cached == name or cached.startswith(prefix)]:
+            del self._entries[cached]
+
+
+class UploadStorage:
+    """
+    Interface of a storage backend. Names are stored filenames, never paths.
+    """
+    # Whether browsers can upload to the backend directly (see s3_storage.py)
+    supports_direct_upload = False
+    # Whether files are served from the upload directory itself
+    keeps_local_files = False
+    # Set by backends whose stat is a network round trip
+    stat_cache: Optional[StatCache] = None
+
+    async def stat(self, name: str) -> Optional[StoredFile]:
+        raise NotImplementedError
+
+    async def cached_stat(self, name: str) -> Optional[StoredFile]:
+        """
+        stat() answered from the stat cache when the backend has one.
+        """
+        if self.stat_cache is None:
+            return await self.stat(name)
+        hit, stored = self.stat_cache.get(name)
+        if not hit:
+            stored = await self.stat(name)
+            self.stat_cache.put(name, stored)
+        return stored
+
+    def range_reader(self, name: str) -> RangeReader:
+        raise NotImplementedError
+
+    async def publish(self, name: str, local_path: Path):
+        """
+        Make a finished local file available under name.
+        """
+        raise NotImplementedError
+
+    async def delete(self, name: str):
+        """
+        Delete name and every <name>.<suffix> sidecar.
+        """
+        raise NotImplementedError
+
+    async def fetch(self, name: str, dest_path: Path):
+        """
+        Copy the stored bytes of name to dest_path.
+        Raises FileNotFoundError if name is not stored.
+        """
+        stored = await self.stat(name)
+        if stored is None:
+            raise FileNotFoundError(name)
+        async with aiofiles.open(dest_path, 'wb') as f:
+            if stored.size:
+                async for chunk in self.range_reader(stored.name)(0, stored.size - 1):
+                    await f.write(chunk)
+
+    async def publish_sidecars(self, name: str, upload_dir: Path):
+        """
+        Publish the sidecars of name found in upload_dir.
+        """
+        for path in sorted(upload_dir.glob(f"{glob_escape(name)}.*")):
+            if path.is_file():
+                await self.publish(path.name, path)
+
+
+def glob_escape(name: str) -> str:
+    return re.sub(r"([\[\]*?])", r"[\1]", name)
+
+
+def _visible(name: str) -> bool:
+    # Hidden entries are in-progress uploads and session state
+    return bool(name) and not name.startswith('.') and '/' not in name
+
+
+class LocalStorage(UploadStorage):
+    keeps_local_files = True
+
+    def __init__(self, upload_dir: Path):
+        self.upload_dir = upload_dir
+
+    async def stat(self, name: str) -> Optional[StoredFile]:
+        path = self.upload_dir / name
+        if not _visible(name) or not path.is_file():
+            return None
+        stat_result = path.stat()
+        return StoredFile(
+            name=name,
+            size=stat_result.st_size,
+            mtime=stat_result.st_mtime,
+            version=file_etag(stat_result).strip('"')
+        )
+
+    def range_reader(self, name: str) -> RangeReader:
+        return file_range_reader(self.upload_dir / name)
+
+    async def publish(self, name: str, local_path: Path):
+        # Files are processed in place; there is nothing to copy
+        pass
+
+    async def delete(self, name: str):
+        (self.upload_dir / name).unlink(missing_ok=True)
+        for sidecar in self.upload_dir.glob(f"{glob_escape(name)}.*"):
+            sidecar.unlink(missing_ok=True)
+
+
+class GridFSStorage(UploadStorage):
+    """
+    Files live in a GridFS bucket with the stored filename as _id.
+    Reads stream chunk by chunk, so files are never loaded whole into memory.
+    Files not (yet) in the bucket, such as uploads that predate it, are
+    served from the local upload directory.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase, upload_dir: Path, bucket_name: str = GRIDFS_BUCKET):
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+        self.files = db[f"{bucket_name}.files"]
+        self.local = LocalStorage(upload_dir)
+        self.stat_cache = StatCache()
+
+    async def stat(self, name: str) -> Optional[StoredFile]:
+        if not _visible(name):
+            return None
+        document = await self.files.find_one({"_id": name}, {"length": 1, "uploadDate": 1})
+        if document is None:
+            return await self.local.stat(name)
+        upload_date = document["uploadDate"]
+        return StoredFile(
+            name=name,
+            size=document["length"],
+            mtime=upload_date.timestamp(),
+            version=f"{name}-{document['length']:x}-{int(upload_date.timestamp() * 1000):x}"
+        )
+
+    def range_reader(self, name: str, chunk_size: int = STREAM_CHUNK_SIZE) -> RangeReader:
+        local_reader = self.local.range_reader(name)
+
+        async def read_range(start: int, end: int) -> AsyncIterator[bytes]:
+            try:
+                grid_out = await self.bucket.open_download_stream(name)
+            except NoFile:
+                async for chunk in local_reader(start, end):
+                    yield chunk
+                return
+
+            grid_out.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await grid_out.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        return read_range
+
+    async def publish(self, name: str, local_path: Path):
+        self.stat_cache.discard(name)
+        if await self.files.find_one({"_id": name}, {"_id": 1}):
+            # Stored names are content-addressed; the same name means the same bytes
+            return
+        try:
+            with open(local_path, 'rb') as source:
+                await self.bucket.upload_from_stream_with_id(name, name, source)
+        except DuplicateKeyError:
+            # Published concurrently by another request
+            pass
+
+    async def delete(self, name: str):
+        names = [name]
+        async for document in self.files.find({"_id": {"$regex": f"^{re.escape(name)}\\."}}, {"_id": 1}):
+            names.append(document["_id"])
+        for stored_name in names:
+            try:
+                await self.bucket.delete(stored_name)
+            except NoFile:
+                pass
+        await self.local.delete(name)
+        self.stat_cache.discard(name)
+
+
+_storage: Optional[UploadStorage] = None
+
+
+def create_storage(backend: str, db: AsyncIOMotorDatabase, upload_dir: Path) -> UploadStorage:
+    if backend == "gridfs":
+        return GridFSStorage(db, upload_dir)
+    if backend == "local":
+        return LocalStorage(upload_dir)
+    if backend == "s3":
+        if not os.environ.get('S3_BUCKET'):
+            raise ValueError("UPLOAD_STORAGE=s3 requires S3_BUCKET to be set")
+        from backend.services.s3_storage import S3Storage, PRESIGN_EXPIRES
+        return S3Storage(
+            bucket=os.environ['S3_BUCKET'],
+            upload_dir=upload_dir,
+            prefix=os.environ.get('S3_PREFIX', ''),
+            endpoint_url=os.environ.get('S3_ENDPOINT_URL'),  # e.g. MinIO
+            region=os.environ.get('S3_REGION'),
+            public_base_url=os.environ.get('S3_PUBLIC_BASE_URL'),  # CDN in front of the bucket
+            presign_expires=int(os.environ.get('S3_PRESIGN_EXPIRES', PRESIGN_EXPIRES))
+        )
+    raise ValueError(f"Unknown upload storage backend '{backend}', expected one of {STORAGE_BACKENDS}")
+
+
+def configure_storage(storage: Optional[UploadStorage]):
+    """
+    Set the process-wide storage backend (at startup).
+    """
+    global _storage
+    _storage = storage
+
+
+def get_storage(upload_dir: Path) -> UploadStorage:
+    """
+    The configured storage backend, or local storage in upload_dir.
+    """
+    return _storage or LocalStorage(upload_dir)
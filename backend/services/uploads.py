@@ -0,0 +1,273 @@
+from fastapi import HTTPException, UploadFile, status
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+import uuid
+import os
+import json
+import time
+import shutil
+import hashlib
+import aiofiles
+
+# Size of each read from the incoming upload; bounds per-upload memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def temp_path_for(dest_path: Path) -> Path:
+    """
+    Hidden temporary path next to dest_path.
+    Keeping it in the same directory guarantees the final rename is atomic.
+    """
+    return dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}.part")
+
+
+async def stream_upload_to_temp(
+    file: UploadFile,
+    temp_path: Path,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Tuple[int, str]:
+    """
+    Stream an uploaded file to temp_path in bounded chunks, hashing as it goes.
+    Raises 413 as soon as the running size passes max_size; the caller owns temp_path.
+    Returns the number of bytes written and the SHA-256 hex digest.
+    """
+    file_size = 0
+    hasher = hashlib.sha256()
+
+    async with aiofiles.open(temp_path, 'wb') as f:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File size exceeds maximum allowed size of {max_size / (1024*1024):.0f}MB"
+                )
+
+            hasher.update(chunk)
+            await f.write(chunk)
+
+    return file_size, hasher.hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    SHA-256 hex digest of a file on disk, read in bounded chunks.
+    """
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# Resumable upload sessions
+#
+# Each session lives in its own directory under <upload_dir>/.sessions:
+#   session.json   - filename, total size and chunk layout
+#   data.part      - sparse file preallocated to the full size; chunks are
+#                    written straight to their offset, so finalizing is a rename
+#   chunks/<n>     - empty marker written once chunk n is fully on disk
+SESSIONS_DIRNAME = ".sessions"
+DEFAULT_SESSION_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+MIN_SESSION_CHUNK_SIZE = 256 * 1024  # 256KB
+MAX_SESSION_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB
+SESSION_TTL_SECONDS = 24 * 60 * 60  # Abandoned sessions are swept after a day
+
+
+def _session_dir(upload_dir: Path, session_id: str) -> Path:
+    # Session ids are uuid4 hex strings; reject anything else to keep paths inside upload_dir
+    try:
+        session_id = uuid.UUID(hex=session_id).hex
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    return upload_dir / SESSIONS_DIRNAME / session_id
+
+
+def load_upload_session(upload_dir: Path, session_id: str) -> dict:
+    """
+    Load session metadata, raising 404 if the session does not exist.
+    """
+    session_file = _session_dir(upload_dir, session_id) / "session.json"
+    if not session_file.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    return json.loads(session_file.read_text())
+
+
+def sweep_expired_sessions(upload_dir: Path, ttl_seconds: int = SESSION_TTL_SECONDS):
+    """
+    Remove sessions that have not been touched within ttl_seconds.
+    """
+    sessions_root = upload_dir / SESSIONS_DIRNAME
+    if not sessions_root.exists():
+        return
+
+    cutoff = time.time() - ttl_seconds
+    for session_dir in sessions_root.iterdir():
+        try:
+            if session_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(session_dir, ignore_errors=True)
+        except FileNotFoundError:
+            continue
+
+
+def create_upload_session(
+    upload_dir: Path,
+    filename: str,
+    file_size: int,
+    max_size: int,
+    chunk_size: Optional[int] = None
+) -> dict:
+    """
+    Create a resumable upload session and preallocate its data file.
+    """
+    if file_size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size ({file_size / (1024*1024):.1f}MB) exceeds maximum allowed size of {max_size / (1024*1024):.0f}MB"
+        )
+
+    chunk_size = chunk_size or DEFAULT_SESSION_CHUNK_SIZE
+    if not MIN_SESSION_CHUNK_SIZE <= chunk_size <= MAX_SESSION_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk size must be between {MIN_SESSION_CHUNK_SIZE} and {MAX_SESSION_CHUNK_SIZE} bytes"
+        )
+
+    sweep_expired_sessions(upload_dir)
+
+    session = {
+        "session_id": uuid.uuid4().hex,
+        "filename": Path(filename).name,
+        "file_size": file_size,
+        "chunk_size": chunk_size,
+        "chunk_count": max(1, -(-file_size // chunk_size)),
+        "created_at": datetime.now().isoformat()
+    }
+
+    session_dir = _session_dir(upload_dir, session["session_id"])
+    (session_dir / "chunks").mkdir(parents=True)
+
+    # Sparse preallocation: no disk blocks are used until chunks arrive
+    with open(session_dir / "data.part", 'wb') as f:
+        f.truncate(file_size)
+
+    (session_dir / "session.json").write_text(json.dumps(session))
+    return session
+
+
+def _chunk_bounds(session: dict, index: int) -> tuple:
+    if index < 0 or index >= session["chunk_count"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk index must be between 0 and {session['chunk_count'] - 1}"
+        )
+    start = index * session["chunk_size"]
+    end = min(start + session["chunk_size"], session["file_size"])
+    return start, end
+
+
+async def write_session_chunk(
+    upload_dir: Path,
+    session_id: str,
+    index: int,
+    stream: AsyncIterator[bytes]
+) -> dict:
+    """
+    Write one chunk of a session at its offset in the data file.
+    Chunks may arrive in any order and in parallel; re-sending a chunk overwrites it.
+    """
+    session = load_upload_session(upload_dir, session_id)
+    start, end = _chunk_bounds(session, index)
+    expected = end - start
+
+    session_dir = _session_dir(upload_dir, session_id)
+    marker = session_dir / "chunks" / str(index)
+    # A retried chunk is not complete until it has been fully rewritten
+    marker.unlink(missing_ok=True)
+
+    written = 0
+    async with aiofiles.open(session_dir / "data.part", 'r+b') as f:
+        await f.seek(start)
+        async for data in stream:
+            if not data:
+                continue
+            written += len(data)
+            if written > expected:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Chunk {index} exceeds its expected size of {expected} bytes"
+                )
+            await f.write(data)
+
+    if written != expected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk {index} is incomplete: received {written} of {expected} bytes"
+        )
+
+    marker.touch()
+    # Keep active sessions from being swept as abandoned
+    os.utime(session_dir)
+    return {"index": index, "size": written}
+
+
+def get_session_status(upload_dir: Path, session_id: str) -> dict:
+    """
+    Report which chunks have been received and the contiguous byte offset.
+    """
+    session = load_upload_session(upload_dir, session_id)
+    chunks_dir = _session_dir(upload_dir, session_id) / "chunks"
+    received = sorted(int(marker.name) for marker in chunks_dir.iterdir())
+    received_set = set(received)
+
+    # Offset is the end of the contiguous run of chunks from the start of the file
+    contiguous = 0
+    while contiguous in received_set:
+        contiguous += 1
+    offset = min(contiguous * session["chunk_size"], session["file_size"])
+
+    return {
+        **session,
+        "received_chunks": received,
+        "missing_chunks": [i for i in range(session["chunk_count"]) if i not in received_set],
+        "offset": offset,
+        "complete": len(received) == session["chunk_count"]
+    }
+
+
+def finalize_upload_session(upload_dir: Path, session_id: str, dest_path: Path) -> dict:
+    """
+    Move a fully received session's data file to dest_path and drop the session.
+    The data file is renamed in place; no bytes are copied.
+    """
+    session_status = get_session_status(upload_dir, session_id)
+    if not session_status["complete"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: missing chunks {session_status['missing_chunks']}"
+        )
+
+    session_dir = _session_dir(upload_dir, session_id)
+    os.replace(session_dir / "data.part", dest_path)
+    shutil.rmtree(session_dir, ignore_errors=True)
+    return session_status
+
+
+def delete_upload_session(upload_dir: Path, session_id: str):
+    """
+    Abort a session and discard any received chunks.
+    """
+    load_upload_session(upload_dir, session_id)
+    shutil.rmtree(_session_dir(upload_dir, session_id), ignore_errors=True)
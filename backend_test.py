@@ -161,7 +161,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(demo_items[0]["name"], "Updated Item", "Demo item name not updated")
         
         # Verify persistence by getting content again
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         hero = content["hero"]
@@ -194,7 +194,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update homepage content")
         
         # Verify update
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertEqual(content["hero"]["headline"], "Updated Headline", "Hero headline not updated")
         
@@ -218,6 +218,33 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertIn("No App Needed", feature_titles, "Missing 'No App Needed' feature")
         self.assertIn("Live Menu Updates", feature_titles, "Missing 'Live Menu Updates' feature")
 
+    def test_publish_homepage_content(self):
+        """Test POST /api/homepage/content/publish endpoint"""
+        # Edits go to the draft only
+        response = requests.put(
+            f"{self.api_url}/content",
+            json={"hero": {"headline": "Draft Headline"}},
+            headers={"Content-Type": "application/json"}
+        )
+        self.assertEqual(response.status_code, 200, "Failed to update homepage content")
+        revision = response.json()["revision"]
+        
+        response = requests.get(f"{self.api_url}/content/preview")
+        self.assertEqual(response.json()["hero"]["headline"], "Draft Headline", "Draft not shown in preview")
+        response = requests.get(f"{self.api_url}/content")
+        self.assertEqual(response.json()["hero"]["headline"], "Bring Your Menu to Life in 3D", "Draft published before publish")
+        
+        # Publishing an outdated revision is rejected
+        response = requests.post(f"{self.api_url}/content/publish", params={"revision": revision - 1})
+        self.assertEqual(response.status_code, 409, "Stale publish should conflict")
+        
+        # Publish the reviewed revision
+        response = requests.post(f"{self.api_url}/content/publish", params={"revision": revision})
+        self.assertEqual(response.status_code, 200, "Failed to publish homepage content")
+        
+        response = requests.get(f"{self.api_url}/content")
+        self.assertEqual(response.json()["hero"]["headline"], "Draft Headline", "Published content not served")
+
     def test_cors_headers(self):
         """Test CORS headers are present"""
         response = requests.get(f"{self.api_url}/content", headers={"Origin": "http://example.com"})
@@ -246,7 +273,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertTrue(result["image_url"].startswith("/uploads/"), "Image URL not in expected format")
         
         # Verify the image was stored in the database
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image not stored in database")
         self.assertTrue(content["hero"]["hero_image_base64"].startswith("/uploads/"), "Stored hero image not in expected format")
@@ -269,13 +296,13 @@ class TestHomepageAPI(unittest.TestCase):
             result = response.json()
             self.assertIn("message", result, f"Response missing 'message' field for index {index}")
             self.assertIn("image_url", result, f"Response missing 'image_url' field for index {index}")
-            self.assertTrue(result["image_url"].startswith("data:image/png;base64,"), f"Image URL not in base64 format for index {index}")
+            self.assertTrue(result["image_url"].startswith("/uploads/"), f"Image URL not in expected format for index {index}")
             
             # Verify the image was stored in the database
-            response = requests.get(f"{self.api_url}/content")
+            response = requests.get(f"{self.api_url}/content/preview")
             content = response.json()
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not in expected format for index {index}")
 
     def test_upload_demo_invalid_index(self):
         """Test POST /api/homepage/upload/demo/{index} with invalid index"""
@@ -307,7 +334,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to upload text file as hero image")
         
         # Verify the content was stored as a file path
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image not stored in database")
         self.assertTrue(content["hero"]["hero_image_base64"].startswith("/uploads/"), "Stored hero image has incorrect format")
@@ -336,7 +363,7 @@ class TestHomepageAPI(unittest.TestCase):
             self.assertEqual(response.status_code, 200, f"Failed to upload demo image at index {index}")
         
         # Fetch content
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         # Verify hero image
@@ -346,7 +373,7 @@ class TestHomepageAPI(unittest.TestCase):
         # Verify demo images
         for index in range(3):
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not in expected format for index {index}")
         
         # Update content with PUT and verify data is preserved
         # For this test, we need to include the hero_image_base64 in the update to preserve it
@@ -367,7 +394,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update homepage content")
         
         # Fetch content again
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         # Verify hero image is still there after update
@@ -416,7 +443,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
                 self.assertEqual(response.status_code, 200, f"Failed to store PlayCanvas URL: {url}")
                 
                 # Verify the URL was stored correctly
-                response = requests.get(f"{self.api_url}/content")
+                response = requests.get(f"{self.api_url}/content/preview")
                 content = response.json()
                 
                 self.assertEqual(
@@ -448,7 +475,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         # Retrieve content multiple times to ensure persistence
         for i in range(3):
             with self.subTest(attempt=i+1):
-                response = requests.get(f"{self.api_url}/content")
+                response = requests.get(f"{self.api_url}/content/preview")
                 self.assertEqual(response.status_code, 200, f"Failed to retrieve content on attempt {i+1}")
                 
                 content = response.json()
@@ -479,7 +506,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to store PlayCanvas URL")
         
         # Verify URL is stored
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertEqual(content["hero"]["hero_image_base64"], test_url, "PlayCanvas URL not stored")
         
@@ -500,7 +527,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to remove PlayCanvas URL")
         
         # Verify URL is removed
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertIsNone(content["hero"]["hero_image_base64"], "PlayCanvas URL not removed")
 
@@ -523,7 +550,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to set empty string URL")
         
         # Verify empty string is stored
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertEqual(content["hero"]["hero_image_base64"], "", "Empty string URL not stored correctly")
 
@@ -561,7 +588,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
                 self.assertEqual(response.status_code, 200, f"Failed to store invalid URL: {url}")
                 
                 # Verify the URL was stored as-is
-                response = requests.get(f"{self.api_url}/content")
+                response = requests.get(f"{self.api_url}/content/preview")
                 content = response.json()
                 
                 self.assertEqual(
@@ -595,7 +622,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update hero content with PlayCanvas URL")
         
         # Verify all fields are stored correctly
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         hero = content["hero"]
         
@@ -643,7 +670,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to perform partial hero update")
         
         # Verify that the PlayCanvas URL is lost (this is expected behavior based on current implementation)
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         hero = content["hero"]
         
@@ -709,7 +736,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update other sections")
         
         # Verify PlayCanvas URL is still there
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         self.assertEqual(
@@ -747,7 +774,7 @@ class TestPlayCanvasURLFunctionality(unittest.TestCase):
                 self.assertEqual(response.status_code, 200, f"Failed to update URL in step {i+1}")
                 
                 # Verify the URL was updated
-                response = requests.get(f"{self.api_url}/content")
+                response = requests.get(f"{self.api_url}/content/preview")
                 content = response.json()
                 
                 self.assertEqual(
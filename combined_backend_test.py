@@ -161,7 +161,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(demo_items[0]["name"], "Updated Item", "Demo item name not updated")
         
         # Verify persistence by getting content again
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         hero = content["hero"]
@@ -194,7 +194,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update homepage content")
         
         # Verify update
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertEqual(content["hero"]["headline"], "Updated Headline", "Hero headline not updated")
         
@@ -246,7 +246,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertTrue(result["image_url"].startswith("/uploads/"), "Image URL not in expected format")
         
         # Verify the image was stored in the database
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image not stored in database")
         self.assertTrue(content["hero"]["hero_image_base64"].startswith("/uploads/"), "Stored hero image not in expected format")
@@ -269,13 +269,13 @@ class TestHomepageAPI(unittest.TestCase):
             result = response.json()
             self.assertIn("message", result, f"Response missing 'message' field for index {index}")
             self.assertIn("image_url", result, f"Response missing 'image_url' field for index {index}")
-            self.assertTrue(result["image_url"].startswith("data:image/png;base64,"), f"Image URL not in base64 format for index {index}")
+            self.assertTrue(result["image_url"].startswith("/uploads/"), f"Image URL not in expected format for index {index}")
             
             # Verify the image was stored in the database
-            response = requests.get(f"{self.api_url}/content")
+            response = requests.get(f"{self.api_url}/content/preview")
             content = response.json()
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not in expected format for index {index}")
 
     def test_upload_demo_invalid_index(self):
         """Test POST /api/homepage/upload/demo/{index} with invalid index"""
@@ -307,7 +307,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to upload text file as hero image")
         
         # Verify the content was stored as a file path
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image not stored in database")
         self.assertTrue(content["hero"]["hero_image_base64"].startswith("/uploads/"), "Stored hero image has incorrect format")
@@ -336,7 +336,7 @@ class TestHomepageAPI(unittest.TestCase):
             self.assertEqual(response.status_code, 200, f"Failed to upload demo image at index {index}")
         
         # Fetch content
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         # Verify hero image
@@ -346,7 +346,7 @@ class TestHomepageAPI(unittest.TestCase):
         # Verify demo images
         for index in range(3):
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not in expected format for index {index}")
         
         # Update content with PUT and verify data is preserved
         # For this test, we need to include the hero_image_base64 in the update to preserve it
@@ -367,7 +367,7 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Failed to update homepage content")
         
         # Fetch content again
-        response = requests.get(f"{self.api_url}/content")
+        response = requests.get(f"{self.api_url}/content/preview")
         content = response.json()
         
         # Verify hero image is still there after update
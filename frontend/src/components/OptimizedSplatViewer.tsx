@@ -1,6 +1,7 @@
 // Optimized SparkJS viewer with performance enhancements
 import React, { useEffect, useRef, useState, useCallback } from 'react';
 import { sparkJSLoader, SparkJSModules } from '../services/sparkjs-loader';
+import { loadProgressiveModel, storedModelFilename, ModelPrefix } from '../services/progressive-model';
 
 interface OptimizedSplatViewerProps {
   splatUrl?: string;
@@ -64,6 +65,7 @@ const OptimizedSplatViewer: React.FC<OptimizedSplatViewerProps> = ({
     if (!modules || !mountRef.current) return;
 
     let mounted = true;
+    const modelRequest = new AbortController();
 
     const initializeViewer = async () => {
       try {
@@ -132,8 +134,60 @@ const OptimizedSplatViewer: React.FC<OptimizedSplatViewerProps> = ({
           controlsRef.current = controls;
         }
 
+        const createSplatMesh = (options: Record<string, any>) => {
+          const splatMesh = new SplatMesh({ 
+            ...options,
+            alphaTest: 0.2,
+            alphaHash: false,
+            halfFloat: true,
+            sphericalHarmonics: false,
+            renderMode: 'basic',
+            maxSplats: caps.isLowEndDevice ? 500000 : 1000000,
+          });
+          
+          splatMesh.position.set(0, 0, 0);
+          splatMesh.rotation.x = Math.PI;
+          splatMesh.scale.set(1, 1, 1);
+          return splatMesh;
+        };
+        
+        // Swap in a better prefix once it has been parsed, keeping the rotation
+        const showPrefix = async (prefix: ModelPrefix) => {
+          const splatMesh = createSplatMesh({ fileBytes: prefix.bytes, fileName: `model.${prefix.fileType}` });
+          await splatMesh.initialized;
+          if (!mounted) {
+            splatMesh.dispose?.();
+            return;
+          }
+          const previous = splatMeshRef.current;
+          if (previous) {
+            splatMesh.rotation.y = previous.rotation.y;
+            scene.remove(previous);
+            previous.dispose?.();
+          }
+          scene.add(splatMesh);
+          splatMeshRef.current = splatMesh;
+        };
+        
         // Load 3D model or create default scene
-        if (splatUrl && (splatUrl.includes('.ply') || splatUrl.includes('.splat'))) {
+        const storedModel = storedModelFilename(splatUrl);
+        if (storedModel) {
+          // Uploaded models stream from the models route at the device's tier,
+          // most important gaussians first, and sharpen at each quality milestone
+          createDefaultScene(scene, THREE);
+          // Prefixes are shown in order; one overtaken while an earlier one parses is skipped
+          let rendering = Promise.resolve();
+          let latest = 0;
+          loadProgressiveModel(storedModel, (prefix) => {
+            const sequence = ++latest;
+            rendering = rendering
+              .then(() => sequence === latest ? showPrefix(prefix) : undefined)
+              .catch((renderError) => console.error('Failed to show model prefix:', renderError));
+          }, modelRequest.signal).catch((loadError) => {
+            if (modelRequest.signal.aborted) return;
+            console.error('Progressive model loading failed:', loadError);
+          });
+        } else if (splatUrl && (splatUrl.includes('.ply') || splatUrl.includes('.splat'))) {
           try {
             let fileUrl = splatUrl;
             if (splatUrl.startsWith('/uploads/')) {
@@ -141,20 +195,7 @@ const OptimizedSplatViewer: React.FC<OptimizedSplatViewerProps> = ({
               fileUrl = `${BACKEND_URL}/api/homepage${splatUrl}`;
             }
             
-            const splatMesh = new SplatMesh({ 
-              url: fileUrl,
-              alphaTest: 0.2,
-              alphaHash: false,
-              halfFloat: true,
-              sphericalHarmonics: false,
-              renderMode: 'basic',
-              progressiveLoad: true,
-              maxSplats: caps.isLowEndDevice ? 500000 : 1000000,
-            });
-            
-            splatMesh.position.set(0, 0, 0);
-            splatMesh.rotation.x = Math.PI;
-            splatMesh.scale.set(1, 1, 1);
+            const splatMesh = createSplatMesh({ url: fileUrl, progressiveLoad: true });
             
             scene.add(splatMesh);
             splatMeshRef.current = splatMesh;
@@ -215,6 +256,7 @@ const OptimizedSplatViewer: React.FC<OptimizedSplatViewerProps> = ({
 
     return () => {
       mounted = false;
+      modelRequest.abort();
       
       if (animationIdRef.current) {
         cancelAnimationFrame(animationIdRef.current);
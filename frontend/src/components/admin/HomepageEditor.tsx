@@ -59,6 +59,7 @@ interface HomepageContent {
   features: HomepageFeature[];
   testimonials: HomepageTestimonial[];
   demo_items: HomepageDemoItem[];
+  revision?: number;  // Revision this copy is based on; saves are rejected once it is stale
 }
 
 const HomepageEditor = () => {
@@ -77,7 +78,8 @@ const HomepageEditor = () => {
     try {
       setLoading(true);
       const backendUrl = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
-      const response = await fetch(`${backendUrl}/api/homepage/content`);
+      // Edit the draft; the public homepage only changes on publish
+      const response = await fetch(`${backendUrl}/api/homepage/content/preview`);
       
       if (!response.ok) {
         throw new Error('Failed to load homepage content');
@@ -110,13 +112,20 @@ const HomepageEditor = () => {
         body: JSON.stringify(content)
       });
       
+      if (response.status === 409) {
+        throw new Error('The homepage was changed elsewhere. Reload to see the latest content, then save again.');
+      }
       if (!response.ok) {
         throw new Error('Failed to save homepage content');
       }
       
+      // The next save is based on the revision this one created
+      const saved = await response.json();
+      setContent(prev => prev ? { ...prev, revision: saved.revision } : prev);
+      
       toast({
         title: "Homepage content saved",
-        description: "Your changes have been saved successfully!",
+        description: "Your changes have been saved as a draft. Publish to make them live.",
       });
     } catch (error) {
       toast({
@@ -129,6 +138,33 @@ const HomepageEditor = () => {
     }
   };
 
+  const publishHomepageContent = async () => {
+    try {
+      setSaving(true);
+      const backendUrl = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
+      const response = await fetch(`${backendUrl}/api/homepage/content/publish`, {
+        method: 'POST'
+      });
+      
+      if (!response.ok) {
+        throw new Error('Failed to publish homepage content');
+      }
+      
+      toast({
+        title: "Homepage published",
+        description: "Your saved changes are now live.",
+      });
+    } catch (error) {
+      toast({
+        title: "Error publishing homepage content",
+        description: error instanceof Error ? error.message : "An error occurred",
+        variant: "destructive"
+      });
+    } finally {
+      setSaving(false);
+    }
+  };
+
   const resetToDefaults = async () => {
     try {
       setSaving(true);
@@ -362,7 +398,9 @@ const HomepageEditor = () => {
           hero: {
             ...content.hero,
             hero_image_base64: result.image_url
-          }
+          },
+          // The upload was saved to the draft as a new revision
+          revision: result.revision ?? content.revision
         });
         
         setUploadProgress(prev => ({ ...prev, hero: 100 }));
@@ -447,7 +485,8 @@ const HomepageEditor = () => {
         
         setContent({
           ...content,
-          demo_items: newDemoItems
+          demo_items: newDemoItems,
+          revision: result.revision ?? content.revision
         });
         
         setUploadProgress(prev => ({ ...prev, [`demo-${index}`]: 100 }));
@@ -556,6 +595,13 @@ const HomepageEditor = () => {
             <Save className="w-4 h-4 mr-2" />
             {saving ? 'Saving...' : 'Save Changes'}
           </Button>
+          <Button
+            onClick={publishHomepageContent}
+            disabled={saving}
+          >
+            <Globe className="w-4 h-4 mr-2" />
+            Publish
+          </Button>
         </div>
       </div>
 
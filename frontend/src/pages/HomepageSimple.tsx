@@ -15,6 +15,8 @@ import {
   User
 } from 'lucide-react';
 import LazyPlayCanvas from '../components/LazyPlayCanvas';
+import LazySparkJS from '../components/LazySparkJS';
+import { storedModelFilename } from '../services/progressive-model';
 
 const BACKEND_URL = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
 
@@ -36,6 +38,13 @@ const HomePage = () => {
     
     checkAdminStatus();
     loadHomepageContent();
+
+    // Reload when new content is published instead of polling
+    const events = new EventSource(`${BACKEND_URL}/api/homepage/events`);
+    events.addEventListener('content', () => {
+      loadHomepageContent();
+    });
+    return () => events.close();
   }, []);
 
   const loadHomepageContent = async () => {
@@ -52,6 +61,14 @@ const HomePage = () => {
     }
   };
 
+  // Edits made on the live page are published straight away
+  const publishAndReload = async () => {
+    await fetch(`${BACKEND_URL}/api/homepage/content/publish`, {
+      method: 'POST'
+    });
+    await loadHomepageContent();
+  };
+
   const [showUrlInput, setShowUrlInput] = useState(false);
   const [playcanvasUrl, setPlaycanvasUrl] = useState('');
 
@@ -87,7 +104,7 @@ const HomePage = () => {
       });
 
       if (response.ok) {
-        await loadHomepageContent(); // Reload content
+        await publishAndReload(); // Reload content
         setUploadProgress(100);
         setShowUrlInput(false);
         setPlaycanvasUrl('');
@@ -125,7 +142,7 @@ const HomePage = () => {
       });
 
       if (response.ok) {
-        await loadHomepageContent(); // Reload content
+        await publishAndReload(); // Reload content
       } else {
         console.error('Upload failed:', await response.text());
       }
@@ -154,7 +171,7 @@ const HomePage = () => {
       });
 
       if (response.ok) {
-        await loadHomepageContent();
+        await publishAndReload();
       }
     } catch (error) {
       console.error('Error removing PlayCanvas experience:', error);
@@ -179,7 +196,7 @@ const HomePage = () => {
       });
 
       if (response.ok) {
-        await loadHomepageContent();
+        await publishAndReload();
       }
     } catch (error) {
       console.error('Error removing demo image:', error);
@@ -351,15 +368,26 @@ const HomePage = () => {
           <div className="max-w-2xl mx-auto mb-8 sm:mb-16 px-4 sm:px-0">
             {homepageContent.hero.hero_image_base64 ? (
               <div className="relative">
-                {/* Display PlayCanvas experience or fallback */}
-                <LazyPlayCanvas
-                  splatUrl={homepageContent.hero.hero_image_base64}
-                  width={typeof window !== 'undefined' ? Math.min(640, window.innerWidth - 32) : 640}
-                  height={typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320}
-                  autoRotate={true}
-                  enableControls={true}
-                  className="mx-auto w-full max-w-full homepage-viewer"
-                />
+                {/* Uploaded models stream progressively at the device's tier; PlayCanvas experiences embed */}
+                {storedModelFilename(homepageContent.hero.hero_image_base64) ? (
+                  <LazySparkJS
+                    splatUrl={homepageContent.hero.hero_image_base64}
+                    width={typeof window !== 'undefined' ? Math.min(640, window.innerWidth - 32) : 640}
+                    height={typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320}
+                    autoRotate={true}
+                    enableControls={true}
+                    className="mx-auto w-full max-w-full homepage-viewer"
+                  />
+                ) : (
+                  <LazyPlayCanvas
+                    splatUrl={homepageContent.hero.hero_image_base64}
+                    width={typeof window !== 'undefined' ? Math.min(640, window.innerWidth - 32) : 640}
+                    height={typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320}
+                    autoRotate={true}
+                    enableControls={true}
+                    className="mx-auto w-full max-w-full homepage-viewer"
+                  />
+                )}
                 {isAdmin && (
                   <button
                     onClick={removeHeroExperience}
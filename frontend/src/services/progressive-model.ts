@@ -0,0 +1,142 @@
+// Progressive model loading service
+// Streams uploaded 3D models from /api/homepage/models at the tier suited to
+// the device and hands the viewer usable prefixes as they arrive
+
+const BACKEND_URL = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
+
+// Bytes per gaussian in the .splat layout the models route serves
+export const SPLAT_RECORD_SIZE = 32;
+
+// Without milestones (device tiers, redirected downloads), render at these
+// sizes and then every doubling
+const FIRST_PREFIX_BYTES = 256 * 1024;
+
+export type ModelTier = 'full' | 'medium' | 'low';
+
+export interface ModelMilestone {
+  importance: number;
+  gaussians: number;
+  fraction: number;
+  bytes: number;
+}
+
+interface ModelMilestones {
+  model_url: string;
+  gaussian_count: number;
+  byte_size: number;
+  milestones: ModelMilestone[];
+}
+
+export interface ModelPrefix {
+  bytes: Uint8Array;  // Whole gaussians only
+  fileType: 'splat' | 'ply';
+  tier: ModelTier | null;  // Served tier, when the response says
+  importance: number | null;  // Share of the model's importance, when known
+  complete: boolean;
+}
+
+// Stored upload filename for an /uploads/ URL of a .ply or .splat model
+export const storedModelFilename = (url?: string | null): string | null => {
+  const match = url?.match(/^\/uploads\/([0-9a-f]{64}\.(?:ply|splat))$/);
+  return match ? match[1] : null;
+};
+
+// Same thresholds as the server's Client Hints (backend/services/client_hints.py),
+// read from the browser so they apply on the first request too
+export const selectDeviceTier = (): ModelTier => {
+  const navigator = window.navigator as any;
+  const connection = navigator.connection;
+  let tier: ModelTier = 'full';
+  const lower = (candidate: ModelTier) => {
+    const order: ModelTier[] = ['full', 'medium', 'low'];
+    if (order.indexOf(candidate) > order.indexOf(tier)) tier = candidate;
+  };
+
+  if (connection?.saveData) lower('low');
+  if (typeof navigator.deviceMemory === 'number') {
+    if (navigator.deviceMemory <= 1) lower('low');
+    else if (navigator.deviceMemory <= 4) lower('medium');
+  }
+  if (connection?.effectiveType === 'slow-2g' || connection?.effectiveType === '2g') lower('low');
+  else if (connection?.effectiveType === '3g') lower('medium');
+  return tier;
+};
+
+export const modelRouteUrl = (filename: string, tier: ModelTier): string =>
+  `${BACKEND_URL}/api/homepage/models/${filename}?tier=${tier}`;
+
+const fetchMilestones = async (filename: string, signal?: AbortSignal): Promise<ModelMilestones | null> => {
+  try {
+    const response = await fetch(`${BACKEND_URL}/api/homepage/models/${filename}/milestones`, { signal });
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    if (signal?.aborted) throw error;
+    // Still processing, or an older upload: load without milestones
+    return null;
+  }
+};
+
+// Stream a stored model, calling onPrefix at each quality milestone (or
+// growing size) and once more with the whole model
+export const loadProgressiveModel = async (
+  filename: string,
+  onPrefix: (prefix: ModelPrefix) => void,
+  signal?: AbortSignal
+): Promise<void> => {
+  const requestedTier = selectDeviceTier();
+  const [milestones, response] = await Promise.all([
+    requestedTier === 'full' ? fetchMilestones(filename, signal) : Promise.resolve(null),
+    fetch(modelRouteUrl(filename, requestedTier), { signal })
+  ]);
+  if (!response.ok || !response.body) {
+    throw new Error(`Failed to load model (${response.status})`);
+  }
+
+  // A PLY is served as uploaded until its .splat has been built, and only
+  // renders once complete; any whole-gaussian prefix of a .splat renders
+  const servedTier = response.headers.get('X-Model-Tier') as ModelTier | null;
+  const servedName = response.headers.get('Content-Location') || new URL(response.url).pathname;
+  const fileType = servedName.endsWith('.ply') ? 'ply' : 'splat';
+  const streamable = fileType === 'splat';
+
+  // Milestone offsets describe the full model; the browser has already
+  // undone any Content-Encoding, so offsets match the bytes read here
+  const byMilestone = servedTier === 'full' && milestones !== null;
+  const thresholds = byMilestone
+    ? milestones!.milestones.filter(milestone => milestone.importance < 1)
+    : [];
+
+  const reader = response.body.getReader();
+  let buffer = new Uint8Array(FIRST_PREFIX_BYTES);
+  let received = 0;
+  let nextSize = FIRST_PREFIX_BYTES;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    if (received + value.length > buffer.length) {
+      const grown = new Uint8Array(Math.max(buffer.length * 2, received + value.length));
+      grown.set(buffer.subarray(0, received));
+      buffer = grown;
+    }
+    buffer.set(value, received);
+    received += value.length;
+
+    // Report the largest prefix reached, skipping milestones passed in one read
+    let reached: ModelMilestone | null = null;
+    while (thresholds.length && received >= thresholds[0].bytes) {
+      reached = thresholds.shift()!;
+    }
+    if (!streamable) continue;
+    if (reached) {
+      onPrefix({ bytes: buffer.slice(0, reached.bytes), fileType, tier: servedTier, importance: reached.importance, complete: false });
+    } else if (!byMilestone && received >= nextSize) {
+      const usable = received - (received % SPLAT_RECORD_SIZE);
+      onPrefix({ bytes: buffer.slice(0, usable), fileType, tier: servedTier, importance: null, complete: false });
+      while (nextSize <= received) nextSize *= 2;
+    }
+  }
+
+  onPrefix({ bytes: buffer.slice(0, received), fileType, tier: servedTier, importance: byMilestone ? 1 : null, complete: true });
+};
@@ -0,0 +1,291 @@
+"""
+Minimal in-memory stand-in for the Motor collection calls the services make.
+Supports equality, $and/$or, $in, $ne, $exists, $regex and range operators on
+dotted paths, inclusion projections, sorted/skipped/limited find cursors,
+sorted find_one_and_update, count_documents, and the $set/$inc/$setOnInsert
+update operators.
+FakeGridFSBucket covers the GridFS bucket calls of storage.GridFSStorage.
+"""
+import copy
+import io
+import re
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from gridfs.errors import NoFile
+
+from backend.services.homepage_store import apply_set
+
+MISSING = object()
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+def get_path(document, path):
+    value = document
+    for key in path.split("."):
+        if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        elif isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return MISSING
+    return value
+
+
+def matches(document, query):
+    for path, condition in query.items():
+        if path == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+            continue
+        if path == "$and":
+            if not all(matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = get_path(document, path)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            for op, operand in condition.items():
+                present = value is not MISSING
+                if op == "$exists" and present != operand:
+                    return False
+                if op == "$regex" and not (isinstance(value, str) and re.search(operand, value)):
+                    return False
+                if op == "$ne" and (None if not present else value) == operand:
+                    return False
+                if op == "$in" and (None if not present else value) not in operand:
+                    return False
+                if op == "$gt" and not (present and value > operand):
+                    return False
+                if op == "$gte" and not (present and value >= operand):
+                    return False
+                if op == "$lt" and not (present and value < operand):
+                    return False
+                if op == "$lte" and not (present and value <= operand):
+                    return False
+        elif (None if value is MISSING else value) != condition:
+            return False
+    return True
+
+
+def project(document, projection):
+    # Inclusion projections on dotted paths, with _id kept unless excluded,
+    # or top-level exclusions
+    if not projection:
+        return document
+    if not any(projection.values()):
+        return {key: value for key, value in document.items() if key not in projection}
+    paths = [path for path, value in projection.items() if value and path != "_id"]
+    if projection.get("_id", 1):
+        paths.append("_id")
+    result = {}
+    for path in paths:
+        value = get_path(document, path)
+        if value is MISSING:
+            continue
+        target = result
+        *parents, leaf = path.split(".")
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = value
+    return result
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys, direction=None):
+        if isinstance(keys, str):
+            keys = [(keys, direction)]
+        # Stable sorts applied from the least significant key
+        for path, direction in reversed(keys):
+            self.documents.sort(key=lambda document: get_path(document, path), reverse=direction < 0)
+        return self
+
+    def skip(self, count):
+        self.documents = self.documents[count:]
+        return self
+
+    def limit(self, count):
+        if count:
+            self.documents = self.documents[:count]
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents[:length]
+
+    async def close(self):
+        pass
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, name="collection"):
+        self.name = name
+        self.documents = []
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([
+            project(copy.deepcopy(document), projection)
+            for document in self.documents
+            if matches(document, query or {})
+        ])
+
+    async def count_documents(self, query):
+        return sum(1 for document in self.documents if matches(document, query))
+
+    async def insert_one(self, document):
+        document.setdefault("_id", ObjectId())
+        self.documents.append(copy.deepcopy(document))
+
+    async def insert_many(self, documents, ordered=True):
+        self.insert_calls = getattr(self, "insert_calls", 0) + 1
+        errors = []
+        for index, document in enumerate(documents):
+            document.setdefault("_id", ObjectId())
+            if any(existing["_id"] == document["_id"] for existing in self.documents):
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key error"})
+                if ordered:
+                    break
+                continue
+            self.documents.append(copy.deepcopy(document))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def find_one(self, query, projection=None):
+        for document in self.documents:
+            if matches(document, query):
+                return project(copy.deepcopy(document), projection)
+        return None
+
+    async def find_one_and_update(self, query, update, upsert=False, sort=None, return_document=ReturnDocument.BEFORE):
+        candidates = FakeCursor(list(self.documents)).sort(sort).documents if sort else self.documents
+        for document in candidates:
+            if matches(document, query):
+                before = copy.deepcopy(document)
+                self._apply(document, update)
+                return before if return_document == ReturnDocument.BEFORE else copy.deepcopy(document)
+        if upsert:
+            document = {
+                key: value for key, value in query.items()
+                if not key.startswith("$") and not isinstance(value, dict)
+            }
+            document.setdefault("_id", ObjectId())
+            if any(existing["_id"] == document["_id"] for existing in self.documents):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            self._apply(document, update, insert=True)
+            self.documents.append(document)
+            return None if return_document == ReturnDocument.BEFORE else copy.deepcopy(document)
+        return None
+
+    async def update_one(self, query, update, upsert=False):
+        await self.find_one_and_update(query, update, upsert=upsert)
+
+    async def replace_one(self, query, replacement, upsert=False):
+        for index, document in enumerate(self.documents):
+            if matches(document, query):
+                self.documents[index] = copy.deepcopy(replacement)
+                return
+        if upsert:
+            self.documents.append({"_id": ObjectId(), **copy.deepcopy(replacement)})
+
+    async def find_one_and_replace(self, query, replacement, upsert=False, return_document=ReturnDocument.BEFORE):
+        for index, document in enumerate(self.documents):
+            if matches(document, query):
+                self.documents[index] = {"_id": document["_id"], **copy.deepcopy(replacement)}
+                return document if return_document == ReturnDocument.BEFORE else copy.deepcopy(self.documents[index])
+        if upsert:
+            # As the unique index on id would
+            if "id" in replacement and any(document.get("id") == replacement["id"] for document in self.documents):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            document = {"_id": ObjectId(), **copy.deepcopy(replacement)}
+            self.documents.append(document)
+            return None if return_document == ReturnDocument.BEFORE else copy.deepcopy(document)
+        return None
+
+    async def delete_one(self, query):
+        for document in self.documents:
+            if matches(document, query):
+                self.documents.remove(document)
+                return DeleteResult(1)
+        return DeleteResult(0)
+
+    def _apply(self, document, update, insert=False):
+        fields = dict(update.get("$set", {}))
+        if insert:
+            fields.update(update.get("$setOnInsert", {}))
+        for path, amount in update.get("$inc", {}).items():
+            current = get_path(document, path)
+            fields[path] = (0 if current is MISSING or current is None else current) + amount
+        document.update(apply_set(document, fields))
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+
+    def __getattr__(self, name):
+        return self.collections.setdefault(name, FakeCollection(name))
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+class FakeGridOut:
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+
+    def seek(self, position):
+        self.stream.seek(position)
+
+    async def read(self, size=-1):
+        return self.stream.read(size)
+
+
+class FakeGridFSBucket:
+    """
+    In-memory GridFS bucket keeping its files documents in
+    db["<bucket_name>.files"], like a real bucket.
+    """
+    def __init__(self, db, bucket_name="fs"):
+        self.files = db[f"{bucket_name}.files"]
+        self.contents = {}
+        self.uploads = 0
+
+    async def upload_from_stream_with_id(self, file_id, filename, source):
+        if file_id in self.contents:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        data = source.read()
+        self.uploads += 1
+        self.contents[file_id] = data
+        await self.files.insert_one({
+            "_id": file_id,
+            "filename": filename,
+            "length": len(data),
+            "uploadDate": datetime(2024, 1, 1)
+        })
+
+    async def open_download_stream(self, file_id):
+        if file_id not in self.contents:
+            raise NoFile(file_id)
+        return FakeGridOut(self.contents[file_id])
+
+    async def delete(self, file_id):
+        if self.contents.pop(file_id, None) is None:
+            raise NoFile(file_id)
+        await self.files.delete_one({"_id": file_id})
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import unittest
+import tempfile
+from pathlib import Path
+
+from backend.services.asset_store import (
+    asset_filename,
+    filename_from_url,
+    is_asset_filename,
+    commit_asset,
+    store_file,
+    release_asset
+)
+from backend.services.storage import LocalStorage, configure_storage
+from tests.fake_mongo import FakeDatabase
+
+DIGEST = "ab" * 32
+
+
+class TestAssetNaming(unittest.TestCase):
+    """Test content-addressed asset names"""
+
+    def test_asset_filename_keeps_lowercase_extension(self):
+        self.assertEqual(asset_filename(DIGEST, ".PLY"), f"{DIGEST}.ply")
+        self.assertTrue(is_asset_filename(f"{DIGEST}.ply"))
+
+    def test_hostile_extensions_still_give_asset_names(self):
+        """Client suffixes that are not plain [a-z0-9]+ are normalised or dropped"""
+        self.assertEqual(asset_filename(DIGEST, ".PLY "), f"{DIGEST}.ply")
+        for extension in (".ply-1", ".tar_gz", ". ", "./x", ".p\u00ebly"):
+            filename = asset_filename(DIGEST, extension)
+            self.assertEqual(filename, DIGEST)
+            self.assertEqual(filename_from_url(f"/uploads/{filename}"), filename)
+
+    def test_filename_from_url_ignores_non_assets(self):
+        """Only content-addressed upload URLs are reference counted"""
+        self.assertEqual(filename_from_url(f"/uploads/{DIGEST}.splat"), f"{DIGEST}.splat")
+        self.assertIsNone(filename_from_url("/uploads/hero_1234.ply"))
+        self.assertIsNone(filename_from_url("data:image/png;base64,AAAA"))
+        self.assertIsNone(filename_from_url("https://playcanvas.com/scene"))
+        self.assertIsNone(filename_from_url(None))
+
+
+class TestCommitAsset(unittest.TestCase):
+    """Test moving finished uploads into the store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.upload_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_bytes_stored_once(self):
+        """A second copy of stored bytes is discarded rather than written again"""
+        filename = asset_filename(DIGEST, ".ply")
+        for _ in range(2):
+            temp_path = self.upload_dir / ".upload.part"
+            temp_path.write_bytes(b"ply data")
+            commit_asset(self.upload_dir, temp_path, filename)
+
+        self.assertEqual([p.name for p in self.upload_dir.iterdir()], [filename])
+
+
+class TestReleaseDuringStore(unittest.IsolatedAsyncioTestCase):
+    """Test storing bytes again while their last reference is being released"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.upload_dir = Path(self.tmp.name)
+        self.db = FakeDatabase()
+
+        # Deleting the file pauses until the test lets it continue
+        self.deleting = asyncio.Event()
+        self.resume = asyncio.Event()
+        storage = LocalStorage(self.upload_dir)
+        delete_file = storage.delete
+
+        async def paused_delete(name):
+            self.deleting.set()
+            await self.resume.wait()
+            await delete_file(name)
+
+        storage.delete = paused_delete
+        configure_storage(storage)
+        self.addCleanup(configure_storage, None)
+
+    async def store(self, data: bytes):
+        path = self.upload_dir / ".upload.part"
+        path.write_bytes(data)
+        return await store_file(self.db, self.upload_dir, path, ".ply", hashlib.sha256(data).hexdigest())
+
+    async def test_upload_between_release_steps_keeps_its_file(self):
+        filename, _ = await self.store(b"ply data")
+
+        release = asyncio.create_task(release_asset(self.db, self.upload_dir, filename))
+        await self.deleting.wait()
+        upload = asyncio.create_task(self.store(b"ply data"))
+        await asyncio.sleep(0.1)
+        self.assertFalse(upload.done(), "the upload must wait for the deletion to finish")
+
+        self.resume.set()
+        await release
+        await upload
+
+        self.assertTrue((self.upload_dir / filename).is_file())
+        asset = await self.db.assets.find_one({"_id": filename})
+        self.assertEqual(asset["refs"], 1)
+        self.assertFalse(asset["deleting"])
+
+    async def test_release_without_uploads_removes_record_and_file(self):
+        filename, _ = await self.store(b"ply data")
+        self.resume.set()
+
+        await release_asset(self.db, self.upload_dir, filename)
+
+        self.assertFalse((self.upload_dir / filename).exists())
+        self.assertIsNone(await self.db.assets.find_one({"_id": filename}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from pymongo.errors import BulkWriteError
+
+from backend.services.batch_writer import BatchWriter, BatchWriterClosed
+from tests.fake_mongo import FakeDatabase
+
+
+class TestBatchWriter(unittest.IsolatedAsyncioTestCase):
+    """Test coalesced inserts"""
+
+    async def asyncSetUp(self):
+        self.collection = FakeDatabase().status_checks
+
+    async def asyncTearDown(self):
+        await self.writer.close()
+
+    def start(self, **options):
+        self.writer = BatchWriter(self.collection, **options)
+        self.writer.start()
+
+    async def test_concurrent_inserts_share_one_write(self):
+        self.start(max_batch=100, max_delay=0.05)
+
+        await asyncio.gather(*(self.writer.insert({"n": n}) for n in range(20)))
+
+        self.assertEqual(len(self.collection.documents), 20)
+        self.assertEqual(self.collection.insert_calls, 1)
+
+    async def test_batches_are_capped(self):
+        self.start(max_batch=8, max_delay=0.05)
+
+        await asyncio.gather(*(self.writer.insert({"n": n}) for n in range(20)))
+
+        self.assertEqual(self.collection.insert_calls, 3)
+
+    async def test_only_the_failed_document_errors(self):
+        self.start(max_batch=10, max_delay=0.05)
+        await self.writer.insert({"_id": "taken"})
+
+        results = await asyncio.gather(
+            self.writer.insert({"_id": "fresh"}),
+            self.writer.insert({"_id": "taken"}),
+            return_exceptions=True
+        )
+
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], BulkWriteError)
+        self.assertEqual(len(self.collection.documents), 2)
+
+    async def test_close_flushes_queued_documents(self):
+        self.start(max_batch=100, max_delay=60)
+        pending = [asyncio.create_task(self.writer.insert({"n": n})) for n in range(5)]
+        await asyncio.sleep(0)
+
+        await self.writer.close()
+
+        await asyncio.gather(*pending)
+        self.assertEqual(len(self.collection.documents), 5)
+        with self.assertRaises(BatchWriterClosed):
+            await self.writer.insert({"n": 5})
+
+    async def test_full_queue_makes_callers_wait(self):
+        self.start(max_batch=1, max_delay=0, max_pending=2)
+
+        await asyncio.gather(*(self.writer.insert({"n": n}) for n in range(10)))
+
+        self.assertEqual(len(self.collection.documents), 10)
+        self.assertLessEqual(self.writer.pending, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+
+from pymongo.errors import OperationFailure, AutoReconnect
+
+from backend.services.change_watch import watch_collection
+
+
+class FakeStream:
+    def __init__(self, events, error=None):
+        self.events = list(events)
+        self.error = error
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.events:
+            self.resume_token = self.events.pop(0)
+            return {"_id": self.resume_token}
+        if self.error:
+            raise self.error
+        await asyncio.Event().wait()  # Idle until cancelled
+
+
+class FakeCollection:
+    name = "homepage_content"
+
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.resume_tokens = []
+
+    def watch(self, resume_after=None):
+        self.resume_tokens.append(resume_after)
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return stream
+
+
+class TestWatchCollection(unittest.IsolatedAsyncioTestCase):
+    """Test change stream invalidation and its polling fallback"""
+
+    async def run_watcher(self, collection, read_version=None, until=None):
+        self.changes = 0
+
+        def on_change():
+            self.changes += 1
+
+        async def no_version():
+            return None
+
+        task = asyncio.create_task(watch_collection(
+            collection, on_change, read_version or no_version, poll_interval=0.01, retry_delay=0
+        ))
+        for _ in range(200):
+            await asyncio.sleep(0.001)
+            if until and until():
+                break
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_every_change_invalidates(self):
+        collection = FakeCollection([FakeStream(["t1", "t2", "t3"])])
+        await self.run_watcher(collection, until=lambda: self.changes >= 4)
+        # One for opening the stream, one per event
+        self.assertEqual(self.changes, 4)
+
+    async def test_reconnect_resumes_after_last_event(self):
+        collection = FakeCollection([
+            FakeStream(["t1", "t2"], error=AutoReconnect("primary stepped down")),
+            FakeStream([])
+        ])
+        await self.run_watcher(collection, until=lambda: len(collection.resume_tokens) == 2)
+        self.assertEqual(collection.resume_tokens, [None, "t2"])
+        self.assertEqual(self.changes, 3)
+
+    async def test_falls_back_to_polling(self):
+        versions = iter([1, 1, 2, 2, 2])
+
+        async def read_version():
+            return next(versions, 2)
+
+        collection = FakeCollection([OperationFailure("not a replica set", code=40573)])
+        await self.run_watcher(collection, read_version, until=lambda: self.changes >= 2)
+        # First poll, then the 1 -> 2 change
+        self.assertEqual(self.changes, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from backend.services.client_hints import select_model_tier
+
+
+class TestSelectModelTier(unittest.TestCase):
+    """Test device tier selection from Client Hints"""
+
+    def test_defaults_to_full(self):
+        self.assertEqual(select_model_tier({}), "full")
+        self.assertEqual(select_model_tier({"device-memory": "8", "ect": "4g"}), "full")
+
+    def test_hints_pick_most_conservative_tier(self):
+        self.assertEqual(select_model_tier({"device-memory": "4"}), "medium")
+        self.assertEqual(select_model_tier({"device-memory": "0.5"}), "low")
+        self.assertEqual(select_model_tier({"ect": "3g"}), "medium")
+        self.assertEqual(select_model_tier({"device-memory": "4", "ect": "2g"}), "low")
+        self.assertEqual(select_model_tier({"save-data": "on", "device-memory": "8"}), "low")
+
+    def test_explicit_tier_wins(self):
+        self.assertEqual(select_model_tier({"save-data": "on"}, "full"), "full")
+
+    def test_ignores_malformed_hints(self):
+        self.assertEqual(select_model_tier({"device-memory": "lots", "ect": "5g"}), "full")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import gzip
+import os
+import tempfile
+from pathlib import Path
+
+from backend.services.compression import (
+    build_compressed_variants,
+    negotiate_encoding,
+    variant_path,
+    available_encodings
+)
+
+
+class TestNegotiateEncoding(unittest.TestCase):
+    """Test Accept-Encoding negotiation"""
+
+    def test_prefers_brotli_then_gzip(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", ["br", "gzip"]), "br")
+        self.assertEqual(negotiate_encoding("gzip, deflate", ["br", "gzip"]), "gzip")
+
+    def test_respects_q_values(self):
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip;q=0.9", ["br", "gzip"]), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0", ["gzip"]))
+        self.assertEqual(negotiate_encoding("*", ["gzip"]), "gzip")
+
+    def test_identity_without_header_or_variants(self):
+        self.assertIsNone(negotiate_encoding(None, ["br", "gzip"]))
+        self.assertIsNone(negotiate_encoding("gzip, br", []))
+
+
+class TestBuildCompressedVariants(unittest.TestCase):
+    """Test precompressed variant generation"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.upload_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_builds_variants_for_models(self):
+        path = self.upload_dir / "model.ply"
+        data = b"ply\nformat ascii 1.0\n" + b"0.0 1.0 2.0\n" * 10000
+        path.write_bytes(data)
+
+        kept = build_compressed_variants(path)
+
+        self.assertEqual(set(kept), set(available_encodings()))
+        self.assertEqual(gzip.decompress(variant_path(path, "gzip").read_bytes()), data)
+
+    def test_skips_images_and_incompressible_data(self):
+        image = self.upload_dir / "photo.png"
+        image.write_bytes(b"\x89PNG" + b"\x00" * 1000)
+        self.assertEqual(build_compressed_variants(image), {})
+
+        noise = self.upload_dir / "noise.splat"
+        noise.write_bytes(os.urandom(50000))
+        self.assertEqual(build_compressed_variants(noise), {})
+        self.assertFalse(variant_path(noise, "gzip").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
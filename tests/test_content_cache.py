@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from backend.services.content_cache import ContentCache
+
+
+class TestContentCache(unittest.IsolatedAsyncioTestCase):
+    """Test the in-process read-through cache"""
+
+    async def asyncSetUp(self):
+        self.loads = 0
+
+    async def load(self):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return self.loads
+
+    async def test_hits_do_not_reload(self):
+        cache = ContentCache(ttl=60)
+        self.assertEqual(await cache.get(self.load), 1)
+        self.assertEqual(await cache.get(self.load), 1)
+        self.assertEqual(self.loads, 1)
+
+    async def test_invalidate_reloads(self):
+        cache = ContentCache(ttl=60)
+        await cache.get(self.load)
+        cache.invalidate()
+        self.assertEqual(await cache.get(self.load), 2)
+
+    async def test_expired_entries_reload(self):
+        cache = ContentCache(ttl=0)
+        await cache.get(self.load)
+        self.assertEqual(await cache.get(self.load), 2)
+
+    async def test_concurrent_misses_share_one_load(self):
+        cache = ContentCache(ttl=60)
+        results = await asyncio.gather(*(cache.get(self.load) for _ in range(10)))
+        self.assertEqual(results, [1] * 10)
+        self.assertEqual(self.loads, 1)
+
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        cache = ContentCache(ttl=60)
+
+        async def stale_load():
+            value = await self.load()
+            cache.invalidate()  # A write lands while the old value is in flight
+            return value
+
+        self.assertEqual(await cache.get(stale_load), 1)
+        self.assertIsNone(cache.peek())
+        self.assertEqual(await cache.get(self.load), 2)
+
+    async def test_keys_cache_separately_and_invalidate_together(self):
+        cache = ContentCache(ttl=60)
+        self.assertEqual(await cache.get(self.load), 1)
+        self.assertEqual(await cache.get(self.load, key="hero"), 2)
+        self.assertEqual(await cache.get(self.load, key="hero"), 2)
+        self.assertEqual(await cache.get(self.load), 1)
+
+        cache.invalidate()
+        self.assertIsNone(cache.peek())
+        self.assertIsNone(cache.peek("hero"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from backend.services.events import (
+    Broadcaster,
+    ServerEvent,
+    event_stream,
+    HEARTBEAT
+)
+
+
+def content_event(revision, sections=("hero",)):
+    return ServerEvent(id=revision, event="content", data={"revision": revision, "sections": list(sections)})
+
+
+def resync(latest):
+    return ServerEvent(id=latest.id, event=latest.event, data={"revision": latest.id, "sections": ["all"]})
+
+
+class TestServerEvent(unittest.TestCase):
+    """Test SSE encoding"""
+
+    def test_encoding(self):
+        event = content_event(3)
+        self.assertEqual(
+            event.encoded,
+            b'id: 3\nevent: content\ndata: {"revision":3,"sections":["hero"]}\n\n'
+        )
+
+
+class TestBroadcaster(unittest.IsolatedAsyncioTestCase):
+    """Test per-worker event fan-out"""
+
+    async def test_publish_reaches_every_subscriber(self):
+        broadcaster = Broadcaster()
+        subscriptions = [broadcaster.subscribe() for _ in range(3)]
+
+        broadcaster.publish(content_event(1))
+
+        for subscription in subscriptions:
+            self.assertEqual(subscription.queue.get_nowait().id, 1)
+
+    async def test_slow_subscriber_is_dropped(self):
+        broadcaster = Broadcaster(queue_size=2)
+        slow = broadcaster.subscribe()
+
+        for revision in range(1, 4):
+            broadcaster.publish(content_event(revision))
+
+        self.assertTrue(slow.overflowed)
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+    async def test_missed_since(self):
+        broadcaster = Broadcaster(history_size=3)
+        for revision in range(1, 6):
+            broadcaster.publish(content_event(revision))
+
+        self.assertEqual([event.id for event in broadcaster.missed_since(3)], [4, 5])
+        self.assertEqual(broadcaster.missed_since(5), [])
+        self.assertIsNone(broadcaster.missed_since(1))
+
+
+class TestEventStream(unittest.IsolatedAsyncioTestCase):
+    """Test the per-client SSE stream"""
+
+    async def test_catch_up_then_live_then_heartbeat(self):
+        broadcaster = Broadcaster()
+        for revision in (1, 2):
+            broadcaster.publish(content_event(revision))
+        stream = event_stream(broadcaster, 1, heartbeat=0.01, resync=resync)
+
+        self.assertTrue((await anext(stream)).startswith(b"retry: "))
+        self.assertTrue((await anext(stream)).startswith(b"id: 2\n"))
+
+        broadcaster.publish(content_event(3))
+        self.assertTrue((await anext(stream)).startswith(b"id: 3\n"))
+        self.assertEqual(await anext(stream), HEARTBEAT)
+
+        await stream.aclose()
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+    async def test_resync_when_history_does_not_reach_back(self):
+        broadcaster = Broadcaster(history_size=1)
+        for revision in (1, 2, 3):
+            broadcaster.publish(content_event(revision))
+        stream = event_stream(broadcaster, 1, heartbeat=1, resync=resync)
+
+        await anext(stream)
+        event = await anext(stream)
+
+        self.assertIn(b'"sections":["all"]', event)
+        self.assertTrue(event.startswith(b"id: 3\n"))
+        await stream.aclose()
+
+    async def test_no_replay_without_last_event_id(self):
+        broadcaster = Broadcaster()
+        broadcaster.publish(content_event(1))
+        stream = event_stream(broadcaster, None, heartbeat=0.01, resync=resync)
+
+        await anext(stream)
+        self.assertEqual(await anext(stream), HEARTBEAT)
+        await stream.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
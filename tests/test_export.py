@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from backend.services import export
+from backend.services.export import (
+    EXPORT_SOURCES,
+    ExportSource,
+    export_query,
+    export_documents,
+    export_position,
+    parse_id
+)
+from tests.fake_mongo import FakeDatabase
+
+
+class TestExportQuery(unittest.TestCase):
+    """Test filters pushed down to Mongo"""
+
+    def test_time_and_key_ranges(self):
+        source = EXPORT_SOURCES["status_checks"]
+        since = datetime(2024, 1, 1)
+        after = (datetime(2024, 1, 2), "check-7")
+
+        query = export_query(source, since=since, after=after)
+
+        self.assertEqual(query, {"$and": [
+            {"timestamp": {"$gte": since}},
+            {"$or": [
+                {"timestamp": {"$gt": after[0]}},
+                {"timestamp": after[0], "id": {"$gt": "check-7"}}
+            ]}
+        ]})
+        self.assertEqual(export_query(source), {})
+
+    def test_id_range(self):
+        source = EXPORT_SOURCES["assets"]
+
+        query = export_query(source, before=("abc.ply",))
+
+        self.assertEqual(query, {"_id": {"$lt": "abc.ply"}})
+
+    def test_invalid_object_id(self):
+        with self.assertRaises(ValueError):
+            parse_id(ExportSource("things", "created_at", ("_id",)), "nope")
+        self.assertEqual(parse_id(EXPORT_SOURCES["assets"], "abc.ply"), "abc.ply")
+
+
+class TestExportDocuments(unittest.IsolatedAsyncioTestCase):
+    """Test streaming NDJSON/CSV encoding"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+        start = datetime(2024, 1, 1)
+        # Inserted newest first, so _id order is the reverse of time order
+        for index in reversed(range(50)):
+            await self.db.status_checks.insert_one({
+                "id": f"check-{index:02d}",
+                "client_name": f"probe, {index}",
+                "timestamp": start + timedelta(minutes=index // 2)
+            })
+
+    async def collect(self, query, format):
+        source = EXPORT_SOURCES["status_checks"]
+        chunks = [chunk async for chunk in export_documents(self.db, source, query, format, batch_size=7)]
+        return chunks, b"".join(chunks).decode("utf-8")
+
+    async def test_ndjson_in_timestamp_id_order(self):
+        _, body = await self.collect({}, "ndjson")
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["id"] for row in rows], [f"check-{index:02d}" for index in range(50)])
+        self.assertEqual(rows[0]["timestamp"], "2024-01-01T00:00:00")
+        self.assertEqual(len(rows[0]["_id"]), 24)
+
+    async def test_resume_after_id(self):
+        source = EXPORT_SOURCES["status_checks"]
+        # check-21 shares its timestamp with check-20 and check-22's is later
+        after = await export_position(self.db, source, "check-21")
+        query = export_query(source, since=datetime(2024, 1, 1, 0, 5), after=after)
+
+        _, body = await self.collect(query, "ndjson")
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["id"] for row in rows], [f"check-{index:02d}" for index in range(22, 50)])
+
+    async def test_unknown_position(self):
+        with self.assertRaises(ValueError):
+            await export_position(self.db, EXPORT_SOURCES["status_checks"], "check-missing")
+
+    async def test_csv_with_header_and_filter(self):
+        source = EXPORT_SOURCES["status_checks"]
+        query = export_query(source, since=datetime(2024, 1, 1, 0, 23))
+
+        _, body = await self.collect(query, "csv")
+
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], list(source.columns))
+        self.assertEqual([row[2] for row in rows[1:]], [f"probe, {index}" for index in range(46, 50)])
+
+    async def test_output_is_chunked(self):
+        original = export.EXPORT_CHUNK_SIZE
+        export.EXPORT_CHUNK_SIZE = 512
+        try:
+            chunks, body = await self.collect({}, "ndjson")
+        finally:
+            export.EXPORT_CHUNK_SIZE = original
+
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual(len(body.splitlines()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend.services.file_responses import (
+    parse_range_header,
+    ranged_response,
+    file_range_reader,
+    file_etag
+)
+
+
+def make_request(method="GET", headers=None):
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    })
+
+
+async def read_body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestParseRangeHeader(unittest.TestCase):
+    """Test Range header parsing"""
+
+    def test_single_and_suffix_ranges(self):
+        self.assertEqual(parse_range_header("bytes=0-99", 1000), [(0, 99)])
+        self.assertEqual(parse_range_header("bytes=900-", 1000), [(900, 999)])
+        self.assertEqual(parse_range_header("bytes=-100", 1000), [(900, 999)])
+        self.assertEqual(parse_range_header("bytes=990-2000", 1000), [(990, 999)])
+
+    def test_multiple_ranges(self):
+        self.assertEqual(parse_range_header("bytes=0-9, 20-29", 100), [(0, 9), (20, 29)])
+
+    def test_invalid_header_is_ignored(self):
+        self.assertIsNone(parse_range_header("items=0-9", 100))
+        self.assertIsNone(parse_range_header("bytes=9-0", 100))
+        self.assertIsNone(parse_range_header("bytes=abc", 100))
+
+    def test_unsatisfiable_range(self):
+        with self.assertRaises(HTTPException) as ctx:
+            parse_range_header("bytes=500-600", 100)
+        self.assertEqual(ctx.exception.status_code, 416)
+        self.assertEqual(ctx.exception.headers["Content-Range"], "bytes */100")
+
+
+class TestRangedResponse(unittest.IsolatedAsyncioTestCase):
+    """Test conditional and partial file responses"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "model.splat"
+        self.data = bytes(range(256)) * 4
+        self.path.write_bytes(self.data)
+        self.stat = self.path.stat()
+        self.etag = file_etag(self.stat)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def respond(self, method="GET", headers=None):
+        return ranged_response(
+            make_request(method, headers),
+            file_range_reader(self.path, chunk_size=100),
+            size=self.stat.st_size,
+            mtime=self.stat.st_mtime,
+            etag=self.etag,
+            media_type="application/splat"
+        )
+
+    async def test_full_response(self):
+        response = self.respond()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-length"], str(len(self.data)))
+        self.assertEqual(response.headers["etag"], self.etag)
+        self.assertEqual(await read_body(response), self.data)
+
+    async def test_if_none_match_returns_304(self):
+        response = self.respond(headers={"If-None-Match": f'"other", W/{self.etag}'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.body, b"")
+
+    async def test_if_modified_since_returns_304(self):
+        response = self.respond(headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_single_range(self):
+        response = self.respond(headers={"Range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["content-range"], f"bytes 10-19/{len(self.data)}")
+        self.assertEqual(await read_body(response), self.data[10:20])
+
+    async def test_stale_if_range_sends_full_body(self):
+        response = self.respond(headers={"Range": "bytes=10-19", "If-Range": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_multiple_ranges(self):
+        response = self.respond(headers={"Range": "bytes=0-4,500-504"})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.headers["content-type"].startswith("multipart/byteranges; boundary="))
+
+        body = await read_body(response)
+        self.assertEqual(len(body), int(response.headers["content-length"]))
+        self.assertIn(self.data[0:5], body)
+        self.assertIn(self.data[500:505], body)
+        self.assertIn(f"Content-Range: bytes 500-504/{len(self.data)}".encode(), body)
+
+    async def test_head_has_headers_without_body(self):
+        response = self.respond(method="HEAD", headers={"Range": "bytes=0-9"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["content-length"], "10")
+        self.assertEqual(response.body, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
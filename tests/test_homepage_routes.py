@@ -0,0 +1,400 @@
+import base64
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import homepage
+from backend.services import storage as storage_module
+from backend.services.content_cache import ContentCache
+from backend.services.storage import GridFSStorage, configure_storage
+from tests.fake_mongo import FakeDatabase, FakeGridFSBucket
+
+DIGEST = "ab" * 32
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+class HomepageRouteTest(unittest.TestCase):
+    """Homepage routes against the in-memory database and a temp upload dir"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.upload_dir = Path(self.tmp.name)
+        self.db = FakeDatabase()
+
+        # Local storage in the temp dir, and caches no other test has filled
+        configure_storage(None)
+        for name, value in (
+            ("UPLOAD_DIR", self.upload_dir),
+            ("published_cache", ContentCache(ttl=60)),
+            ("draft_cache", ContentCache(ttl=60))
+        ):
+            patcher = patch.object(homepage, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+        app.include_router(homepage.router)
+        app.dependency_overrides[homepage.get_database] = lambda: self.db
+        self.client = self.enterContext(TestClient(app))
+
+    def upload_hero(self, data: bytes = PNG, filename: str = "hero.png") -> dict:
+        response = self.client.post("/api/homepage/upload/hero", files={"file": (filename, data)})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def refs(self, url: str) -> int:
+        filename = url[len("/uploads/"):]
+        return next((asset["refs"] for asset in self.db.assets.documents if asset["_id"] == filename), 0)
+
+    def preview(self) -> dict:
+        response = self.client.get("/api/homepage/content/preview")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class TestUpdateContent(HomepageRouteTest):
+    """Test draft edits through PUT /content"""
+
+    def test_saving_twice_in_a_row(self):
+        """The editor bases each save on the revision the previous one returned"""
+        content = self.preview()
+        content["hero"]["headline"] = "First"
+
+        first = self.client.put("/api/homepage/content", json=content)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["revision"], content["revision"] + 1)
+
+        content["hero"]["headline"] = "Second"
+        content["revision"] = first.json()["revision"]
+        second = self.client.put("/api/homepage/content", json=content)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(self.preview()["hero"]["headline"], "Second")
+
+    def test_stale_revision_conflicts(self):
+        content = self.preview()
+        self.assertEqual(self.client.put("/api/homepage/content", json=content).status_code, 200)
+
+        response = self.client.put("/api/homepage/content", json=content)
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_reused_upload_url_keeps_its_file(self):
+        """A URL copied into a second field holds its own reference"""
+        hero_url = self.upload_hero()["image_url"]
+        content = self.preview()
+        content["demo_items"][0]["image_base64"] = hero_url
+        content = self.client.put("/api/homepage/content", json=content).json()
+        self.assertEqual(self.refs(hero_url), 2)
+
+        content["demo_items"][0]["image_base64"] = None
+        self.assertEqual(self.client.put("/api/homepage/content", json=content).status_code, 200)
+
+        self.assertEqual(self.refs(hero_url), 1)
+        self.assertEqual(self.client.get(f"/api/homepage{hero_url}").content, PNG)
+
+
+    def test_malformed_inline_image(self):
+        """A data URL that does not decode is rejected, and nothing is kept"""
+        content = self.preview()
+        content["demo_items"][0]["image_base64"] = "data:image/png;base64," + base64.b64encode(PNG).decode()
+        content["demo_items"][1]["image_base64"] = "data:image/png;base64,not base64!"
+
+        response = self.client.put("/api/homepage/content", json=content)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("image_base64", response.json()["detail"])
+        self.assertEqual(self.db.assets.documents, [])
+        self.assertEqual(self.preview()["revision"], content["revision"])
+
+
+class TestDemoUpload(HomepageRouteTest):
+    """Test POST /upload/demo/{index}"""
+
+    def test_upload_replaces_the_demo_image(self):
+        revision = self.preview()["revision"]
+
+        response = self.client.post("/api/homepage/upload/demo/1", files={"file": ("demo.png", PNG)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["revision"], revision + 1)
+        self.assertEqual(self.preview()["demo_items"][1]["image_base64"], response.json()["image_url"])
+        self.assertEqual(self.refs(response.json()["image_url"]), 1)
+
+    def test_missing_demo_item(self):
+        content = self.preview()
+        content["demo_items"] = content["demo_items"][:1]
+        self.assertEqual(self.client.put("/api/homepage/content", json=content).status_code, 200)
+
+        response = self.client.post("/api/homepage/upload/demo/2", files={"file": ("demo.png", PNG)})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.db.assets.documents, [])
+        self.assertEqual(list(self.upload_dir.iterdir()), [])
+
+
+class TestUploadProcessing(HomepageRouteTest):
+    """Test where derived files of an upload are built"""
+
+    def test_local_uploads_are_processed_after_the_response(self):
+        hero_url = self.upload_hero(b"hero model " * 1000, "hero.ply")["image_url"]
+
+        self.assertTrue((self.upload_dir / f"{hero_url[len('/uploads/'):]}.gz").exists())
+        self.assertEqual(self.db.processing_jobs.documents, [])
+
+    def test_remote_uploads_are_queued_for_a_worker(self):
+        with patch.object(storage_module, "AsyncIOMotorGridFSBucket", FakeGridFSBucket):
+            storage = GridFSStorage(self.db, self.upload_dir)
+        configure_storage(storage)
+        self.addCleanup(configure_storage, None)
+
+        hero_url = self.upload_hero(b"hero model " * 1000, "hero.ply")["image_url"]
+
+        filename = hero_url[len("/uploads/"):]
+        self.assertEqual([job["_id"] for job in self.db.processing_jobs.documents], [filename])
+        self.assertEqual(sorted(storage.bucket.contents), [filename])
+
+
+class TestPublish(HomepageRouteTest):
+    """Test the draft/published split"""
+
+    def test_draft_edits_stay_out_of_published_content(self):
+        self.assertEqual(self.client.post("/api/homepage/content/publish").status_code, 200)
+        published_headline = self.client.get("/api/homepage/content").json()["hero"]["headline"]
+
+        content = self.preview()
+        content["hero"]["headline"] = "Draft only"
+        self.client.put("/api/homepage/content", json=content)
+
+        self.assertEqual(self.client.get("/api/homepage/content").json()["hero"]["headline"], published_headline)
+        self.assertEqual(self.preview()["hero"]["headline"], "Draft only")
+
+        self.assertEqual(self.client.post("/api/homepage/content/publish").status_code, 200)
+        self.assertEqual(self.client.get("/api/homepage/content").json()["hero"]["headline"], "Draft only")
+
+    def test_publish_of_a_reviewed_revision(self):
+        reviewed = self.preview()["revision"]
+        content = self.preview()
+        content["hero"]["headline"] = "Edited after review"
+        self.client.put("/api/homepage/content", json=content)
+
+        stale = self.client.post("/api/homepage/content/publish", params={"revision": reviewed})
+        self.assertEqual(stale.status_code, 409)
+
+        current = self.client.post("/api/homepage/content/publish", params={"revision": reviewed + 1})
+        self.assertEqual(current.status_code, 200)
+        self.assertEqual(current.json()["hero"]["headline"], "Edited after review")
+
+    def test_published_files_outlive_draft_edits(self):
+        """The snapshot holds its own reference to the files it shows"""
+        hero_url = self.upload_hero()["image_url"]
+        self.client.post("/api/homepage/content/publish")
+
+        self.upload_hero(b"a different hero", "hero.ply")
+
+        self.assertEqual(self.refs(hero_url), 1)
+        self.assertEqual(self.client.get("/api/homepage/content").json()["hero"]["hero_image_base64"], hero_url)
+        self.assertEqual(self.client.get(f"/api/homepage{hero_url}").content, PNG)
+
+
+class TestReset(HomepageRouteTest):
+    """Test resetting to defaults"""
+
+    def test_reset_releases_assets(self):
+        hero_url = self.upload_hero()["image_url"]
+        self.client.post("/api/homepage/content/publish")
+
+        response = self.client.post("/api/homepage/content/reset")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()["hero"]["hero_image_base64"])
+        self.assertIsNone(self.client.get("/api/homepage/content").json()["hero"]["hero_image_base64"])
+        self.assertEqual(self.db.assets.documents, [])
+        self.assertFalse((self.upload_dir / hero_url[len("/uploads/"):]).exists())
+        self.assertEqual(self.client.get(f"/api/homepage{hero_url}").status_code, 404)
+
+
+class TestProjections(HomepageRouteTest):
+    """Test sparse fieldsets and single sections of the published content"""
+
+    def setUp(self):
+        super().setUp()
+        content = self.preview()
+        content["hero"]["headline"] = "Published"
+        self.client.put("/api/homepage/content", json=content)
+        self.client.post("/api/homepage/content/publish")
+
+    def test_fields(self):
+        response = self.client.get("/api/homepage/content", params={"fields": "revision, hero"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {"hero", "revision"})
+        self.assertEqual(response.json()["hero"]["headline"], "Published")
+
+    def test_sections(self):
+        hero = self.client.get("/api/homepage/content/hero")
+        demo_items = self.client.get("/api/homepage/content/demo_items")
+
+        self.assertEqual(hero.json()["headline"], "Published")
+        self.assertEqual(len(demo_items.json()), 3)
+        self.assertEqual(self.client.get("/api/homepage/content/secrets").status_code, 422)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get("/api/homepage/content", params={"fields": "hero,secrets"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secrets", response.json()["detail"])
+
+    def test_revalidation(self):
+        for path, params in (
+            ("/api/homepage/content", {"fields": "hero"}),
+            ("/api/homepage/content/hero", {})
+        ):
+            with self.subTest(path=path):
+                first = self.client.get(path, params=params)
+                etag = first.headers["ETag"]
+
+                again = self.client.get(path, params=params, headers={"If-None-Match": etag})
+                self.assertEqual(again.status_code, 304)
+                self.assertEqual(again.content, b"")
+
+                # A new publish changes the representation
+                content = self.preview()
+                content["hero"]["headline"] = f"Republished {path}"
+                self.client.put("/api/homepage/content", json=content)
+                self.client.post("/api/homepage/content/publish")
+                changed = self.client.get(path, params=params, headers={"If-None-Match": etag})
+                self.assertEqual(changed.status_code, 200)
+                self.assertNotEqual(changed.headers["ETag"], etag)
+
+
+class TestBeforeFirstPublish(HomepageRouteTest):
+    """Test that the public reads show the draft until something is published"""
+
+    def test_reads_fall_back_to_the_draft(self):
+        content = self.preview()
+        content["hero"]["headline"] = "Never published"
+        self.client.put("/api/homepage/content", json=content)
+
+        self.assertEqual(self.client.get("/api/homepage/content").json()["hero"]["headline"], "Never published")
+        fields = self.client.get("/api/homepage/content", params={"fields": "hero"}).json()
+        self.assertEqual(fields["hero"]["headline"], "Never published")
+        self.assertEqual(self.client.get("/api/homepage/content/hero").json()["headline"], "Never published")
+        self.assertEqual(self.db.homepage_published.documents, [])
+
+
+class TestServeModel(HomepageRouteTest):
+    """Test device-tier selection on /models/{filename}"""
+
+    def setUp(self):
+        super().setUp()
+        # A PLY upload converted to .splat, with a medium tier but no low one
+        self.filename = f"{DIGEST}.ply"
+        for name, data in (
+            (self.filename, b"ply"),
+            (f"{self.filename}.splat", b"full"),
+            (f"{self.filename}.medium.splat", b"medium")
+        ):
+            (self.upload_dir / name).write_bytes(data)
+
+    def get_model(self, headers=None, **params):
+        return self.client.get(
+            f"/api/homepage/models/{self.filename}",
+            params=params,
+            headers={"Accept-Encoding": "identity", **(headers or {})}
+        )
+
+    def test_no_hints_get_the_converted_full_model(self):
+        response = self.get_model()
+
+        self.assertEqual(response.content, b"full")
+        self.assertEqual(response.headers["X-Model-Tier"], "full")
+        self.assertEqual(response.headers["Content-Location"], f"/api/homepage/uploads/{self.filename}.splat")
+        self.assertEqual(response.headers["Accept-CH"], "Device-Memory, Save-Data, ECT")
+
+    def test_client_hints_choose_the_tier_and_vary(self):
+        response = self.get_model({"Device-Memory": "2"})
+
+        self.assertEqual(response.content, b"medium")
+        self.assertEqual(response.headers["X-Model-Tier"], "medium")
+        vary = [name.strip() for name in response.headers["Vary"].split(",")]
+        for hint in ("Device-Memory", "Save-Data", "ECT"):
+            self.assertIn(hint, vary)
+
+    def test_missing_tier_falls_back_to_the_next_larger(self):
+        for headers, params in (({"Save-Data": "on"}, {}), ({}, {"tier": "low"})):
+            with self.subTest(headers=headers, params=params):
+                response = self.get_model(headers, **params)
+
+                self.assertEqual(response.content, b"medium")
+                self.assertEqual(response.headers["X-Model-Tier"], "medium")
+
+    def test_explicit_tier_does_not_vary_on_hints(self):
+        response = self.get_model({"Device-Memory": "0.5"}, tier="full")
+
+        self.assertEqual(response.content, b"full")
+        self.assertNotIn("Device-Memory", response.headers.get("Vary", ""))
+
+    def test_splat_upload_without_tiers_is_served_as_is(self):
+        (self.upload_dir / f"{DIGEST}.splat").write_bytes(b"splat")
+
+        response = self.client.get(f"/api/homepage/models/{DIGEST}.splat", params={"tier": "low"})
+
+        self.assertEqual(response.content, b"splat")
+        self.assertEqual(response.headers["X-Model-Tier"], "full")
+
+    def test_missing_models(self):
+        self.assertEqual(self.client.get(f"/api/homepage/models/{'cd' * 32}.ply").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/homepage/models/{DIGEST}.png").status_code, 404)
+        self.assertEqual(self.get_model(tier="tiny").status_code, 422)
+
+
+class TestListModels(HomepageRouteTest):
+    """Test the model metadata listing"""
+
+    def setUp(self):
+        super().setUp()
+        start = datetime(2024, 1, 1)
+        for index in range(5):
+            filename = f"{index:064x}.{'ply' if index % 2 else 'splat'}"
+            self.db.model_metadata.documents.append({
+                "_id": filename,
+                "filename": filename,
+                "url": f"/uploads/{filename}",
+                "format": "ply" if index % 2 else "splat",
+                "gaussian_count": index,
+                "sh_degree": 0,
+                "byte_size": 32 * index,
+                "sha256": f"{index:064x}",
+                "created_at": start + timedelta(days=index)
+            })
+
+    def test_newest_first_with_total(self):
+        response = self.client.get("/api/homepage/models")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["total"], 5)
+        self.assertEqual([item["gaussian_count"] for item in body["items"]], [4, 3, 2, 1, 0])
+
+    def test_pagination_and_format(self):
+        page = self.client.get("/api/homepage/models", params={"limit": 2, "skip": 2}).json()
+        self.assertEqual([item["gaussian_count"] for item in page["items"]], [2, 1])
+        self.assertEqual((page["total"], page["limit"], page["skip"]), (5, 2, 2))
+
+        plys = self.client.get("/api/homepage/models", params={"format": "ply"}).json()
+        self.assertEqual([item["gaussian_count"] for item in plys["items"]], [3, 1])
+        self.assertEqual(plys["total"], 2)
+
+        self.assertEqual(self.client.get("/api/homepage/models", params={"limit": 0}).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import unittest
+
+from backend.services.homepage_store import (
+    apply_set,
+    update_homepage_fields,
+    save_published_snapshot,
+    rendered_snapshot,
+    RevisionConflict
+)
+from backend.services.json_responses import render_json
+from tests.fake_mongo import FakeDatabase
+
+
+class TestApplySet(unittest.TestCase):
+    """Test local application of dotted $set paths"""
+
+    def test_nested_and_list_paths(self):
+        document = {"hero": {"title": "a"}, "demo_items": [{"image": None}, {"image": None}]}
+
+        result = apply_set(document, {"hero.title": "b", "demo_items.1.image": "/uploads/x"})
+
+        self.assertEqual(result["hero"]["title"], "b")
+        self.assertEqual(result["demo_items"][1]["image"], "/uploads/x")
+        self.assertEqual(document["hero"]["title"], "a")
+
+
+class TestUpdateHomepageFields(unittest.IsolatedAsyncioTestCase):
+    """Test atomic homepage writes with revision compare-and-swap"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+
+    async def test_first_write_creates_default_document(self):
+        before, after = await update_homepage_fields(self.db, {"hero.hero_title": "New"})
+
+        self.assertEqual(before["revision"], 0)
+        self.assertEqual(after["revision"], 1)
+        self.assertEqual(after["hero"]["hero_title"], "New")
+        stored = await self.db.homepage_content.find_one({"id": "main"})
+        self.assertEqual(stored["hero"]["hero_title"], "New")
+        self.assertEqual(len(stored["features"]), len(before["features"]))
+
+    async def test_stale_revision_conflicts(self):
+        await update_homepage_fields(self.db, {"hero.hero_title": "One"})
+
+        with self.assertRaises(RevisionConflict) as caught:
+            await update_homepage_fields(self.db, {"hero.hero_title": "Two"}, expected_revision=0)
+        self.assertEqual(caught.exception.current_revision, 1)
+
+        _, after = await update_homepage_fields(self.db, {"hero.hero_title": "Two"}, expected_revision=1)
+        self.assertEqual(after["revision"], 2)
+
+    async def test_concurrent_edits_to_different_sections_both_land(self):
+        await update_homepage_fields(self.db, {})
+
+        await asyncio.gather(
+            update_homepage_fields(self.db, {"hero.hero_title": "Title"}),
+            update_homepage_fields(self.db, {"features": []})
+        )
+
+        stored = await self.db.homepage_content.find_one({"id": "main"})
+        self.assertEqual(stored["hero"]["hero_title"], "Title")
+        self.assertEqual(stored["features"], [])
+        self.assertEqual(stored["revision"], 3)
+
+    async def test_documents_without_revision_count_as_zero(self):
+        await self.db.homepage_content.update_one({"id": "main"}, {"$set": {"hero": {}}}, upsert=True)
+
+        _, after = await update_homepage_fields(self.db, {"hero.hero_title": "x"}, expected_revision=0)
+        self.assertEqual(after["revision"], 1)
+
+    async def test_unmatched_conditions_write_nothing(self):
+        result = await update_homepage_fields(
+            self.db, {"demo_items.9.image_base64": "x"}, conditions={"demo_items.9": {"$exists": True}}
+        )
+        self.assertIsNone(result)
+        stored = await self.db.homepage_content.find_one({"id": "main"})
+        self.assertEqual(stored["revision"], 0)
+
+
+class TestPublishedSnapshot(unittest.IsolatedAsyncioTestCase):
+    """Test swapping in pre-rendered published snapshots"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+
+    async def publish(self, revision, headline):
+        content = {"id": "main", "revision": revision, "hero": {"headline": headline}}
+        return await save_published_snapshot(self.db, content, render_json(content))
+
+    async def test_snapshot_keeps_rendered_bytes(self):
+        content = {"id": "main", "revision": 1, "testimonials": ["x" * 2000]}
+        rendered = render_json(content)
+
+        self.assertIsNone(await save_published_snapshot(self.db, content, rendered))
+
+        stored = await self.db.homepage_published.find_one({"id": "main"})
+        self.assertEqual(rendered_snapshot(stored), rendered)
+        self.assertEqual(stored["content"], content)
+
+    async def test_publish_returns_replaced_snapshot(self):
+        await self.publish(1, "One")
+
+        previous = await self.publish(2, "Two")
+
+        self.assertEqual(previous["content"]["hero"]["headline"], "One")
+        self.assertEqual(len(self.db.homepage_published.documents), 1)
+
+    async def test_older_revision_does_not_replace_newer(self):
+        await self.publish(3, "Three")
+
+        with self.assertRaises(RevisionConflict) as caught:
+            await self.publish(2, "Two")
+        self.assertEqual(caught.exception.current_revision, 3)
+        stored = await self.db.homepage_published.find_one({"id": "main"})
+        self.assertEqual(stored["content"]["hero"]["headline"], "Three")
+
+
+if __name__ == "__main__":
+    unittest.main()
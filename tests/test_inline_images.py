@@ -0,0 +1,103 @@
+import base64
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.models.homepage import HomepageContent
+from backend.scripts.migrate_inline_images import migrate_inline_images, migrate_published_snapshot
+from backend.services.homepage_store import update_homepage_fields, save_published_snapshot
+from backend.services.json_responses import render_json
+from backend.services.inline_images import decode_data_url, is_data_url
+from tests.fake_mongo import FakeDatabase
+
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+PNG_DATA_URL = "data:image/png;base64," + base64.b64encode(PNG).decode()
+
+
+class TestDataUrls(unittest.TestCase):
+    """Test data URL parsing"""
+
+    def test_decode(self):
+        self.assertEqual(decode_data_url(PNG_DATA_URL), ("image/png", PNG))
+        self.assertEqual(decode_data_url("data:;base64,AAE=")[1], b"\x00\x01")
+
+    def test_non_data_urls(self):
+        self.assertFalse(is_data_url("/uploads/abc.png"))
+        self.assertFalse(is_data_url(None))
+        with self.assertRaises(ValueError):
+            decode_data_url("data:image/png;base64,not base64!")
+
+
+class TestMigrateInlineImages(unittest.IsolatedAsyncioTestCase):
+    """Test moving inline homepage images into the asset store"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db = FakeDatabase()
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_data_urls_become_shared_files(self):
+        await update_homepage_fields(self.db, {
+            "hero.hero_image_base64": PNG_DATA_URL,
+            "demo_items.0.image_base64": PNG_DATA_URL,
+            "demo_items.1.image_base64": "/uploads/existing.png"
+        })
+
+        self.assertEqual(await migrate_inline_images(self.db, self.dir), 2)
+
+        document = await self.db.homepage_content.find_one({"id": "main"})
+        url = document["hero"]["hero_image_base64"]
+        self.assertTrue(url.startswith("/uploads/") and url.endswith(".png"))
+        self.assertEqual(document["demo_items"][0]["image_base64"], url)
+        self.assertEqual(document["demo_items"][1]["image_base64"], "/uploads/existing.png")
+
+        # Identical images are stored once and referenced twice
+        self.assertEqual((self.dir / url[len("/uploads/"):]).read_bytes(), PNG)
+        asset = await self.db.assets.find_one({"_id": url[len("/uploads/"):]})
+        self.assertEqual(asset["refs"], 2)
+
+        # Re-running finds nothing left to do
+        self.assertEqual(await migrate_inline_images(self.db, self.dir), 0)
+
+    async def test_published_snapshot_is_migrated(self):
+        """The public payload stops carrying data URLs without publishing the draft"""
+        await update_homepage_fields(self.db, {
+            "hero.hero_image_base64": PNG_DATA_URL,
+            "demo_items.0.image_base64": PNG_DATA_URL
+        })
+        draft = await self.db.homepage_content.find_one({"id": "main"}, {"_id": 0})
+        await save_published_snapshot(self.db, draft, render_json(HomepageContent(**draft)))
+        # An unpublished edit made after that publish
+        await update_homepage_fields(self.db, {"hero.headline": "Draft only"})
+
+        await migrate_inline_images(self.db, self.dir)
+        self.assertEqual(await migrate_published_snapshot(self.db, self.dir), 2)
+
+        snapshot = await self.db.homepage_published.find_one({"id": "main"})
+        self.assertNotIn(b"data:", bytes(snapshot["body"]))
+        self.assertNotEqual(snapshot["content"]["hero"]["headline"], "Draft only")
+        url = snapshot["content"]["hero"]["hero_image_base64"]
+        self.assertTrue(url.startswith("/uploads/"))
+
+        # Draft and snapshot each hold their own references
+        asset = await self.db.assets.find_one({"_id": url[len("/uploads/"):]})
+        self.assertEqual(asset["refs"], 4)
+        self.assertEqual(await migrate_published_snapshot(self.db, self.dir), 0)
+
+    async def test_dry_run_writes_nothing(self):
+        await update_homepage_fields(self.db, {"hero.hero_image_base64": PNG_DATA_URL})
+
+        self.assertEqual(await migrate_inline_images(self.db, self.dir, dry_run=True), 0)
+
+        document = await self.db.homepage_content.find_one({"id": "main"})
+        self.assertEqual(document["hero"]["hero_image_base64"], PNG_DATA_URL)
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
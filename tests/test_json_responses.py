@@ -0,0 +1,54 @@
+import gzip
+import json
+import unittest
+
+from starlette.requests import Request
+
+from backend.services.json_responses import render_json, rendered_json_response
+
+
+def make_request(headers=None):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    })
+
+
+class TestRenderedJson(unittest.TestCase):
+    """Test pre-rendered JSON responses"""
+
+    def setUp(self):
+        self.rendered = render_json({"items": ["x" * 40] * 100})
+
+    def test_body_is_compact_json(self):
+        self.assertEqual(json.loads(self.rendered.body), {"items": ["x" * 40] * 100})
+        self.assertNotIn(b" ", self.rendered.body)
+        self.assertEqual(gzip.decompress(self.rendered.encoded["gzip"]), self.rendered.body)
+
+    def test_small_bodies_are_not_compressed(self):
+        self.assertEqual(render_json({"a": 1}).encoded, {})
+
+    def test_negotiates_encoding_with_distinct_etags(self):
+        identity = rendered_json_response(make_request(), self.rendered)
+        gzipped = rendered_json_response(make_request({"Accept-Encoding": "gzip"}), self.rendered)
+
+        self.assertEqual(identity.body, self.rendered.body)
+        self.assertEqual(gzipped.headers["content-encoding"], "gzip")
+        self.assertEqual(gzipped.headers["vary"], "Accept-Encoding")
+        self.assertNotEqual(identity.headers["etag"], gzipped.headers["etag"])
+
+    def test_if_none_match_returns_304(self):
+        etag = rendered_json_response(make_request(), self.rendered).headers["etag"]
+
+        response = rendered_json_response(make_request({"If-None-Match": etag}), self.rendered)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+
+        changed = render_json({"items": []})
+        self.assertEqual(rendered_json_response(make_request({"If-None-Match": etag}), changed).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import patch
+
+from backend.services import mongo
+from backend.services.mongo import mongo_client_options, installed_compressors
+
+
+class TestMongoClientOptions(unittest.TestCase):
+    """Test client settings"""
+
+    def test_pool_settings_are_passed(self):
+        options = mongo_client_options()
+
+        self.assertEqual(options["maxPoolSize"], mongo.MONGO_MAX_POOL_SIZE)
+        self.assertEqual(options["minPoolSize"], mongo.MONGO_MIN_POOL_SIZE)
+        self.assertEqual(options["maxIdleTimeMS"], mongo.MONGO_MAX_IDLE_TIME_MS)
+
+    def test_unlimited_timeouts_are_left_to_the_driver(self):
+        with patch.object(mongo, "MONGO_SOCKET_TIMEOUT_MS", 0), patch.object(mongo, "MONGO_WAIT_QUEUE_TIMEOUT_MS", 0):
+            options = mongo_client_options()
+
+        self.assertNotIn("socketTimeoutMS", options)
+        self.assertNotIn("waitQueueTimeoutMS", options)
+
+    def test_timeouts_when_set(self):
+        with patch.object(mongo, "MONGO_SOCKET_TIMEOUT_MS", 20000):
+            options = mongo_client_options()
+
+        self.assertEqual(options["socketTimeoutMS"], 20000)
+
+    def test_default_compressors_are_installed(self):
+        with patch("importlib.util.find_spec", return_value=None):
+            self.assertEqual(installed_compressors(), "zlib")
+        with patch("importlib.util.find_spec", return_value=object()):
+            self.assertEqual(installed_compressors(), "zstd,snappy,zlib")
+
+
+if __name__ == "__main__":
+    unittest.main()
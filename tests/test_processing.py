@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.services import storage as storage_module
+from backend.services.asset_store import store_file
+from backend.services.processing import (
+    PROCESSING_LEASE,
+    PROCESSING_MAX_ATTEMPTS,
+    enqueue_processing,
+    claim_processing_job,
+    run_processing_jobs
+)
+from backend.services.storage import GridFSStorage, configure_storage
+from tests.fake_mongo import FakeDatabase, FakeGridFSBucket
+
+
+class TestProcessingJobs(unittest.IsolatedAsyncioTestCase):
+    """Test the queue remote-storage uploads are processed from"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+        self.now = datetime(2024, 1, 1)
+
+    async def test_enqueue_is_idempotent(self):
+        await enqueue_processing(self.db, "a.ply")
+        await enqueue_processing(self.db, "a.ply")
+
+        self.assertEqual([job["_id"] for job in self.db.processing_jobs.documents], ["a.ply"])
+
+    async def test_claimed_jobs_are_leased(self):
+        await enqueue_processing(self.db, "a.ply")
+        await enqueue_processing(self.db, "b.ply")
+
+        first = await claim_processing_job(self.db, self.now)
+        second = await claim_processing_job(self.db, self.now)
+
+        self.assertEqual({first["_id"], second["_id"]}, {"a.ply", "b.ply"})
+        self.assertEqual(first["attempts"], 1)
+        self.assertIsNone(await claim_processing_job(self.db, self.now))
+
+    async def test_expired_lease_is_retried_until_max_attempts(self):
+        await enqueue_processing(self.db, "a.ply")
+
+        now = self.now
+        for attempt in range(1, PROCESSING_MAX_ATTEMPTS + 1):
+            job = await claim_processing_job(self.db, now)
+            self.assertEqual(job["attempts"], attempt)
+            now += PROCESSING_LEASE + timedelta(seconds=1)
+
+        self.assertIsNone(await claim_processing_job(self.db, now))
+
+    async def test_worker_processes_remote_uploads(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        upload_dir = Path(tmp.name)
+        with patch.object(storage_module, "AsyncIOMotorGridFSBucket", FakeGridFSBucket):
+            storage = GridFSStorage(self.db, upload_dir)
+        configure_storage(storage)
+        self.addCleanup(configure_storage, None)
+
+        data = b"X" * 10_000
+        path = upload_dir / ".upload.part"
+        path.write_bytes(data)
+        filename, _ = await store_file(self.db, upload_dir, path, ".ply", hashlib.sha256(data).hexdigest())
+        await enqueue_processing(self.db, filename)
+
+        worker = asyncio.create_task(run_processing_jobs(self.db, upload_dir, poll_interval=0.01))
+        try:
+            for _ in range(100):
+                if not self.db.processing_jobs.documents:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            worker.cancel()
+
+        self.assertEqual(self.db.processing_jobs.documents, [])
+        self.assertIn(f"{filename}.gz", storage.bucket.contents)
+        self.assertEqual(list(upload_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
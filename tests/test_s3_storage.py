@@ -0,0 +1,124 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import boto3
+    import requests
+    from moto import mock_aws
+except ImportError:
+    boto3 = None
+
+from backend.services.asset_store import store_direct_upload
+from backend.services.s3_storage import S3Storage, object_headers
+from backend.services.storage import configure_storage
+from tests.fake_mongo import FakeDatabase
+
+BUCKET = "uploads"
+
+
+@unittest.skipIf(boto3 is None, "boto3 and moto are required for S3 storage tests")
+class TestS3Storage(unittest.IsolatedAsyncioTestCase):
+    """Test the S3 storage backend against moto"""
+
+    async def asyncSetUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.client = boto3.client("s3", region_name="us-east-1")
+        self.client.create_bucket(Bucket=BUCKET)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.storage = S3Storage(BUCKET, self.dir, prefix="models/", client=self.client)
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+        self.mock.stop()
+
+    async def test_publish_stat_and_ranged_read(self):
+        (self.dir / "model.ply").write_bytes(b"0123456789")
+        await self.storage.publish("model.ply", self.dir / "model.ply")
+
+        stored = await self.storage.stat("model.ply")
+        self.assertEqual(stored.size, 10)
+        self.assertIn("models/model.ply", stored.url)
+
+        head = self.client.head_object(Bucket=BUCKET, Key="models/model.ply")
+        self.assertEqual(head["ContentType"], "application/ply")
+
+        chunks = [chunk async for chunk in self.storage.range_reader("model.ply", chunk_size=2)(3, 6)]
+        self.assertEqual(b"".join(chunks), b"3456")
+
+    async def test_files_missing_from_bucket_fall_back_to_local(self):
+        (self.dir / "legacy.png").write_bytes(b"png")
+
+        stored = await self.storage.stat("legacy.png")
+        self.assertEqual(stored.size, 3)
+        self.assertIsNone(stored.url)
+        self.assertIsNone(await self.storage.stat("missing.png"))
+
+    async def test_delete_removes_sidecars(self):
+        for name in ("model.ply", "model.ply.gz", "model.ply.low.splat", "model.ply2"):
+            (self.dir / name).write_bytes(b"x")
+            await self.storage.publish(name, self.dir / name)
+
+        await self.storage.delete("model.ply")
+
+        keys = [item["Key"] for item in self.client.list_objects_v2(Bucket=BUCKET).get("Contents", [])]
+        self.assertEqual(keys, ["models/model.ply2"])
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["model.ply2"])
+
+    async def test_direct_upload(self):
+        data = b"gaussians" * 1000
+        upload = await self.storage.create_direct_upload("scene.PLY", len(data))
+
+        self.assertTrue(self.storage.is_incoming_key(upload["key"]))
+        self.assertTrue(upload["key"].endswith(".ply"))
+        self.assertEqual(len(upload["parts"]), 1)
+
+        response = requests.put(upload["parts"][0]["url"], data=data)
+        self.assertEqual(response.status_code, 200)
+        size = await self.storage.complete_direct_upload(
+            upload["upload_id"], upload["key"], [{"part_number": 1, "etag": response.headers["ETag"]}]
+        )
+        self.assertEqual(size, len(data))
+
+        self.assertEqual(await self.storage.incoming_sha256(upload["key"]), hashlib.sha256(data).hexdigest())
+
+        await self.storage.adopt("abc.ply", upload["key"])
+        stored = await self.storage.stat("abc.ply")
+        self.assertEqual(stored.size, len(data))
+        keys = [item["Key"] for item in self.client.list_objects_v2(Bucket=BUCKET)["Contents"]]
+        self.assertEqual(keys, ["models/abc.ply"])
+
+    async def test_completed_direct_upload_is_stored_without_local_bytes(self):
+        configure_storage(self.storage)
+        self.addCleanup(configure_storage, None)
+        db = FakeDatabase()
+        data = b"gaussians" * 1000
+        key = self.storage.incoming_key(".ply")
+        self.client.put_object(Bucket=BUCKET, Key=key, Body=data)
+
+        filename = await store_direct_upload(db, self.dir, key, ".ply", len(data))
+
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertEqual(filename, f"{digest}.ply")
+        self.assertEqual((await db.assets.find_one({"_id": filename}))["refs"], 1)
+        keys = [item["Key"] for item in self.client.list_objects_v2(Bucket=BUCKET)["Contents"]]
+        self.assertEqual(keys, [f"models/{filename}"])
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_incoming_keys_are_validated(self):
+        self.assertFalse(self.storage.is_incoming_key("models/abc.ply"))
+        self.assertFalse(self.storage.is_incoming_key("models/incoming/../abc.ply"))
+
+    def test_precompressed_variants_keep_their_encoding(self):
+        self.assertEqual(
+            object_headers("abc.ply.splat.br"),
+            {"ContentType": "application/splat", "ContentEncoding": "br"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
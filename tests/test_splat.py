@@ -0,0 +1,228 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from backend.services.splat import (
+    SH_C0,
+    SPLAT_DTYPE,
+    PlyFormatError,
+    read_ply_header,
+    convert_ply_to_splat,
+    build_model_tiers,
+    build_progressive_splat,
+    read_model_metadata,
+    importance_milestones,
+    PROGRESSIVE_LEVELS,
+    gaussian_importance,
+    PlySource
+)
+
+
+def write_gaussian_ply(path, count, sh_rest=0, seed=0):
+    """
+    Write a random binary gaussian splat PLY and return its vertex array.
+    """
+    rng = np.random.default_rng(seed)
+    names = (
+        ['x', 'y', 'z', 'nx', 'ny', 'nz', 'f_dc_0', 'f_dc_1', 'f_dc_2']
+        + [f'f_rest_{i}' for i in range(sh_rest)]
+        + ['opacity', 'scale_0', 'scale_1', 'scale_2', 'rot_0', 'rot_1', 'rot_2', 'rot_3']
+    )
+    vertices = np.zeros(count, dtype=[(name, '<f4') for name in names])
+    for name in names:
+        vertices[name] = rng.normal(size=count)
+    for name in ('scale_0', 'scale_1', 'scale_2'):
+        vertices[name] = rng.uniform(-6, -2, size=count)
+
+    header = "ply\nformat binary_little_endian 1.0\n"
+    header += f"element vertex {count}\n"
+    header += "".join(f"property float {name}\n" for name in names)
+    header += "end_header\n"
+    with open(path, 'wb') as f:
+        f.write(header.encode())
+        vertices.tofile(f)
+    return vertices
+
+
+class TestPlyToSplat(unittest.TestCase):
+    """Test PLY to .splat conversion"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_header_parsing(self):
+        write_gaussian_ply(self.dir / "model.ply", 10, sh_rest=9)
+        header = read_ply_header(self.dir / "model.ply")
+        self.assertEqual(header.format, "binary_little_endian")
+        self.assertEqual(header.element('vertex').count, 10)
+        self.assertEqual(len(header.element('vertex').properties), 26)
+
+    def test_conversion_matches_reference(self):
+        """Vectorized conversion matches a per-gaussian reference, across blocks"""
+        vertices = write_gaussian_ply(self.dir / "model.ply", 1000)
+
+        count = convert_ply_to_splat(self.dir / "model.ply", self.dir / "model.splat", block_size=300)
+        rows = np.fromfile(self.dir / "model.splat", dtype=SPLAT_DTYPE)
+
+        self.assertEqual(count, 1000)
+        self.assertEqual(SPLAT_DTYPE.itemsize, 32)
+        self.assertEqual((self.dir / "model.splat").stat().st_size, 32 * 1000)
+
+        v = vertices[123]
+        row = rows[123]
+        np.testing.assert_allclose(row['position'], [v['x'], v['y'], v['z']])
+        np.testing.assert_allclose(row['scale'], np.exp([v['scale_0'], v['scale_1'], v['scale_2']]), rtol=1e-6)
+
+        rgb = np.clip((0.5 + SH_C0 * np.array([v['f_dc_0'], v['f_dc_1'], v['f_dc_2']])) * 255, 0, 255)
+        alpha = 255 / (1 + np.exp(-v['opacity']))
+        np.testing.assert_allclose(row['color'], np.append(rgb, alpha).astype(np.uint8), atol=1)
+
+        quat = np.array([v['rot_0'], v['rot_1'], v['rot_2'], v['rot_3']])
+        quat /= np.linalg.norm(quat)
+        np.testing.assert_allclose(row['rotation'], np.clip(quat * 128 + 128, 0, 255).astype(np.uint8), atol=1)
+
+    def test_rejects_ascii_ply(self):
+        path = self.dir / "mesh.ply"
+        path.write_bytes(b"ply\nformat ascii 1.0\nelement vertex 0\nend_header\n")
+        with self.assertRaises(PlyFormatError):
+            convert_ply_to_splat(path, self.dir / "mesh.splat")
+        self.assertFalse((self.dir / "mesh.splat").exists())
+
+
+class TestModelTiers(unittest.TestCase):
+    """Test importance-pruned device tiers"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tiers_keep_most_important_gaussians(self):
+        write_gaussian_ply(self.dir / "model.ply", 1000)
+
+        counts = build_model_tiers(self.dir / "model.ply", lambda tier: self.dir / f"model.{tier}.splat")
+
+        self.assertEqual(counts, {"medium": 500, "low": 200})
+        low = np.fromfile(self.dir / "model.low.splat", dtype=SPLAT_DTYPE)
+        self.assertEqual(len(low), 200)
+
+        # Every kept gaussian scores at least as high as every dropped one
+        source = PlySource(self.dir / "model.ply")
+        scores = np.sort(gaussian_importance(source.block(0, len(source))))[::-1]
+        kept_volume = np.prod(low['scale'].astype(np.float64), axis=1) * (low['color'][:, 3] / 255.0)
+        self.assertGreaterEqual(kept_volume.min(), scores[200] * 0.9)
+
+    def test_small_models_have_no_tiers(self):
+        write_gaussian_ply(self.dir / "tiny.ply", 1)
+        self.assertEqual(build_model_tiers(self.dir / "tiny.ply", lambda tier: self.dir / tier), {})
+
+
+class TestProgressiveSplat(unittest.TestCase):
+    """Test importance-ordered .splat output and its milestones"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_gaussians_are_written_most_important_first(self):
+        write_gaussian_ply(self.dir / "model.ply", 1000)
+
+        info = build_progressive_splat(self.dir / "model.ply", self.dir / "model.splat")
+
+        self.assertEqual(info["gaussian_count"], 1000)
+        splat = np.fromfile(self.dir / "model.splat", dtype=SPLAT_DTYPE)
+        volume = np.prod(splat['scale'].astype(np.float64), axis=1) * (splat['color'][:, 3] / 255.0)
+        # Quantized alpha makes neighbours compare loosely; the trend must hold
+        self.assertGreater(volume[:100].mean(), volume[-100:].mean() * 10)
+
+        # Same gaussians as the file-order conversion
+        convert_ply_to_splat(self.dir / "model.ply", self.dir / "plain.splat")
+        plain = np.fromfile(self.dir / "plain.splat", dtype=SPLAT_DTYPE)
+        self.assertEqual(sorted(splat.tobytes()[i:i + 32] for i in range(0, splat.nbytes, 32)),
+                         sorted(plain.tobytes()[i:i + 32] for i in range(0, plain.nbytes, 32)))
+
+    def test_milestones_are_increasing_prefixes(self):
+        write_gaussian_ply(self.dir / "model.ply", 1000)
+
+        milestones = build_progressive_splat(self.dir / "model.ply", self.dir / "model.splat")["milestones"]
+
+        self.assertEqual([m["importance"] for m in milestones], list(PROGRESSIVE_LEVELS))
+        counts = [m["gaussians"] for m in milestones]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(counts[-1], 1000)
+        self.assertEqual(milestones[-1]["bytes"], (self.dir / "model.splat").stat().st_size)
+        self.assertLess(counts[0], 500)
+
+    def test_importance_milestones(self):
+        milestones = importance_milestones(np.array([4.0, 3.0, 2.0, 1.0]), (0.5, 0.75, 1.0))
+        self.assertEqual([m["gaussians"] for m in milestones], [2, 3, 4])
+        self.assertEqual(milestones[0]["bytes"], 64)
+        self.assertEqual(importance_milestones(np.array([])), [])
+
+    def test_progressive_tiers_are_prefixes(self):
+        write_gaussian_ply(self.dir / "model.ply", 1000)
+        build_progressive_splat(self.dir / "model.ply", self.dir / "model.splat")
+
+        build_model_tiers(self.dir / "model.ply", lambda tier: self.dir / f"model.{tier}.splat", progressive=True)
+
+        full = (self.dir / "model.splat").read_bytes()
+        low = (self.dir / "model.low.splat").read_bytes()
+        self.assertEqual(full[:len(low)], low)
+
+
+class TestModelMetadata(unittest.TestCase):
+    """Test metadata read from stored models"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ply_metadata(self):
+        write_gaussian_ply(self.dir / "model.ply", 300, sh_rest=45)
+
+        metadata = read_model_metadata(self.dir / "model.ply", block_size=64)
+
+        self.assertEqual(metadata["format"], "ply")
+        self.assertEqual(metadata["format_version"], "binary_little_endian 1.0")
+        self.assertEqual(metadata["gaussian_count"], 300)
+        self.assertEqual(metadata["sh_degree"], 3)
+
+        positions = PlySource(self.dir / "model.ply").positions(0, 300)
+        np.testing.assert_allclose(metadata["bounding_box"]["min"], positions.min(axis=0))
+        np.testing.assert_allclose(metadata["bounding_box"]["max"], positions.max(axis=0))
+
+    def test_splat_metadata_matches_converted_ply(self):
+        write_gaussian_ply(self.dir / "model.ply", 300)
+        convert_ply_to_splat(self.dir / "model.ply", self.dir / "model.splat")
+
+        ply = read_model_metadata(self.dir / "model.ply")
+        splat = read_model_metadata(self.dir / "model.splat")
+
+        self.assertEqual(splat["format"], "splat")
+        self.assertIsNone(splat["format_version"])
+        self.assertEqual(splat["gaussian_count"], 300)
+        self.assertEqual(splat["bounding_box"], ply["bounding_box"])
+
+    def test_empty_model_has_no_bounding_box(self):
+        write_gaussian_ply(self.dir / "empty.ply", 0)
+        metadata = read_model_metadata(self.dir / "empty.ply")
+        self.assertEqual(metadata["gaussian_count"], 0)
+        self.assertIsNone(metadata["bounding_box"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import gzip
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from backend.services.splat import PlySource, SplatSource, convert_ply_to_splat
+from backend.services.spz import (
+    SPZ_HEADER,
+    SPZ_MAGIC,
+    encode_spz,
+    decode_spz,
+    spz_error_metrics
+)
+from backend.services import processing
+from backend.services.processing import encode_compressed_splat
+from tests.fake_mongo import FakeDatabase
+from tests.test_splat import write_gaussian_ply
+
+
+class TestSpzEncoding(unittest.TestCase):
+    """Test SPZ quantized splat encoding"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        write_gaussian_ply(self.dir / "model.ply", 2000, sh_rest=9)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_header_and_round_trip(self):
+        source = PlySource(self.dir / "model.ply")
+        info = encode_spz(source, self.dir / "model.spz", block_size=700)
+
+        self.assertEqual(info["gaussian_count"], 2000)
+        self.assertEqual(info["sh_degree"], 1)
+
+        header = SPZ_HEADER.unpack_from(gzip.decompress((self.dir / "model.spz").read_bytes()))
+        self.assertEqual(header[:4], (SPZ_MAGIC, 2, 2000, 1))
+
+        decoded = decode_spz(self.dir / "model.spz")
+        original = source.block(0, len(source))
+        self.assertEqual(decoded.sh.shape, (2000, 3, 3))
+        np.testing.assert_allclose(decoded.positions, original.positions, atol=2 ** -12)
+        np.testing.assert_allclose(decoded.log_scales, original.log_scales, atol=1 / 32 + 1e-6)
+
+    def test_error_metrics_within_quantization_bounds(self):
+        source = PlySource(self.dir / "model.ply")
+        encode_spz(source, self.dir / "model.spz")
+
+        metrics = spz_error_metrics(source, self.dir / "model.spz", sample_size=500)
+
+        self.assertEqual(metrics["sample_size"], 500)
+        self.assertLess(metrics["position_max"], 2 ** -12)
+        self.assertLess(metrics["opacity_max"], 1 / 255)
+        self.assertLess(metrics["color_rmse"], 0.01)
+        self.assertLess(metrics["rotation_mean_degrees"], 5)
+
+    def test_smaller_than_splat(self):
+        convert_ply_to_splat(self.dir / "model.ply", self.dir / "model.splat")
+        info = encode_spz(SplatSource(self.dir / "model.splat"), self.dir / "model.spz")
+
+        self.assertEqual(info["sh_degree"], 0)
+        self.assertLess(info["byte_size"], (self.dir / "model.splat").stat().st_size * 0.75)
+
+
+
+class TestEncodeCompressedSplat(unittest.IsolatedAsyncioTestCase):
+    """Test the SPZ step of post-upload processing"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        write_gaussian_ply(self.dir / "model.ply", 500)
+        self.db = FakeDatabase()
+        await self.db.assets.insert_one({"_id": "model.ply", "refs": 1})
+
+    async def test_existing_spz_is_not_encoded_again(self):
+        await encode_compressed_splat(self.db, self.dir, "model.ply")
+        asset = await self.db.assets.find_one({"_id": "model.ply"})
+        self.assertEqual(asset["variants"]["spz"], "model.ply.spz")
+        self.assertEqual(asset["spz"]["gaussian_count"], 500)
+
+        with patch.object(processing, "_encode_spz_with_metrics") as encode:
+            await encode_compressed_splat(self.db, self.dir, "model.ply")
+        encode.assert_not_called()
+
+    async def test_spz_without_recorded_metrics_is_rebuilt(self):
+        (self.dir / "model.ply.spz").write_bytes(b"partial")
+
+        await encode_compressed_splat(self.db, self.dir, "model.ply")
+
+        # An interrupted run left a file but no metrics; it is encoded again
+        asset = await self.db.assets.find_one({"_id": "model.ply"})
+        self.assertEqual(asset["spz"]["gaussian_count"], 500)
+        self.assertEqual(len(decode_spz(self.dir / "model.ply.spz").positions), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
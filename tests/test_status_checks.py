@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta
+
+from backend.services.status_checks import (
+    encode_cursor,
+    decode_cursor,
+    list_status_checks,
+    InvalidCursor
+)
+from tests.fake_mongo import FakeDatabase
+
+
+class TestCursor(unittest.TestCase):
+    """Test opaque keyset cursors"""
+
+    def test_round_trip_at_millisecond_precision(self):
+        timestamp = datetime(2024, 5, 1, 12, 30, 15, 123000)
+
+        self.assertEqual(decode_cursor(encode_cursor(timestamp, "a:b")), (timestamp, "a:b"))
+
+    def test_garbage_is_rejected(self):
+        for cursor in ("not base64!", "bm9jb2xvbg", ""):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+
+class TestListStatusChecks(unittest.IsolatedAsyncioTestCase):
+    """Test keyset pagination of status checks"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+        start = datetime(2024, 1, 1)
+        # Pairs share a timestamp so the id tie-breaker matters
+        for index in range(7):
+            await self.db.status_checks.insert_one({
+                "id": f"check-{index}",
+                "client_name": "probe",
+                "timestamp": start + timedelta(seconds=index // 2)
+            })
+
+    async def test_pages_cover_everything_once_newest_first(self):
+        seen = []
+        after = None
+        while True:
+            items, after = await list_status_checks(self.db, limit=3, after=after)
+            seen.extend(item.id for item in items)
+            if after is None:
+                break
+
+        self.assertEqual(seen, [f"check-{index}" for index in range(6, -1, -1)])
+
+    async def test_last_page_has_no_cursor(self):
+        items, next_cursor = await list_status_checks(self.db, limit=7)
+
+        self.assertEqual(len(items), 7)
+        self.assertIsNone(next_cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from backend.services import status_rollups
+from backend.services.status_rollups import (
+    floor_time,
+    claim_rollup_lease,
+    run_rollups,
+    list_rollups,
+    ROLLUP_STEPS
+)
+from tests.fake_mongo import FakeDatabase
+
+
+class TestFloorTime(unittest.TestCase):
+    """Test bucket boundaries"""
+
+    def test_minute_and_hour_buckets(self):
+        value = datetime(2024, 3, 5, 14, 27, 45, 500000)
+
+        self.assertEqual(floor_time(value, ROLLUP_STEPS["minute"]), datetime(2024, 3, 5, 14, 27))
+        self.assertEqual(floor_time(value, ROLLUP_STEPS["hour"]), datetime(2024, 3, 5, 14))
+
+    def test_boundary_is_its_own_bucket(self):
+        value = datetime(2024, 3, 5, 14)
+
+        self.assertEqual(floor_time(value, ROLLUP_STEPS["hour"]), value)
+
+
+class TestRunRollups(unittest.IsolatedAsyncioTestCase):
+    """Test the rollup watermark and lease"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+        self.windows = []
+
+        async def record_window(db, start, end):
+            self.windows.append((start, end))
+
+        patcher = patch.object(status_rollups, "rollup_window", record_window)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_nothing_to_do_without_checks(self):
+        self.assertIsNone(await run_rollups(self.db, datetime(2024, 1, 1)))
+        self.assertEqual(self.windows, [])
+
+    async def test_windows_cover_complete_minutes_once(self):
+        await self.db.status_checks.insert_one({"id": "a", "client_name": "probe", "timestamp": datetime(2024, 1, 1, 9, 15, 30)})
+        now = datetime(2024, 1, 1, 11, 40, 50)
+
+        through = await run_rollups(self.db, now)
+
+        # From the oldest check's minute to the last minute past the lag
+        self.assertEqual(through, datetime(2024, 1, 1, 11, 40))
+        self.assertEqual(self.windows[0][0], datetime(2024, 1, 1, 9, 15))
+        for (_, end), (start, _) in zip(self.windows, self.windows[1:]):
+            self.assertEqual(end, start)
+        self.assertTrue(all(end - start <= timedelta(hours=1) for start, end in self.windows))
+
+        # The next run picks up where this one stopped
+        self.windows.clear()
+        await run_rollups(self.db, now + timedelta(minutes=2))
+        self.assertEqual(self.windows, [(datetime(2024, 1, 1, 11, 40), datetime(2024, 1, 1, 11, 42))])
+
+    async def test_held_lease_skips_the_run(self):
+        await self.db.status_checks.insert_one({"id": "a", "client_name": "probe", "timestamp": datetime(2024, 1, 1, 9)})
+        now = datetime(2024, 1, 1, 10)
+        self.assertIsNotNone(await claim_rollup_lease(self.db, now))
+
+        self.assertIsNone(await run_rollups(self.db, now + timedelta(seconds=1)))
+        self.assertEqual(self.windows, [])
+
+    async def test_lease_is_released_after_a_run(self):
+        await self.db.status_checks.insert_one({"id": "a", "client_name": "probe", "timestamp": datetime(2024, 1, 1, 9)})
+        now = datetime(2024, 1, 1, 10)
+        await run_rollups(self.db, now)
+
+        self.assertIsNotNone(await claim_rollup_lease(self.db, now))
+
+
+class TestListRollups(unittest.IsolatedAsyncioTestCase):
+    """Test reading rollups"""
+
+    async def asyncSetUp(self):
+        self.db = FakeDatabase()
+        start = datetime(2024, 1, 1)
+        for hour in range(4):
+            for client_name in ("web", "api"):
+                await self.db.status_rollups.insert_one({
+                    "granularity": "hour",
+                    "client_name": client_name,
+                    "bucket": start + timedelta(hours=hour),
+                    "count": hour + 1,
+                    "expires_at": start + timedelta(days=400)
+                })
+        await self.db.status_rollups.insert_one({
+            "granularity": "minute",
+            "client_name": "web",
+            "bucket": start,
+            "count": 1,
+            "expires_at": start + timedelta(days=30)
+        })
+
+    async def test_range_is_half_open_and_ordered(self):
+        items = await list_rollups(self.db, "hour", datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 3))
+
+        self.assertEqual(
+            [(item.bucket.hour, item.client_name, item.count) for item in items],
+            [(1, "api", 2), (1, "web", 2), (2, "api", 3), (2, "web", 3)]
+        )
+
+    async def test_filter_by_client(self):
+        items = await list_rollups(self.db, "hour", datetime(2024, 1, 1), datetime(2024, 1, 2), client_name="web")
+
+        self.assertEqual([item.count for item in items], [1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
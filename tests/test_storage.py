@@ -0,0 +1,208 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.services import storage as storage_module
+from backend.services.asset_store import store_file
+from backend.services.processing import process_upload
+from backend.services.storage import (
+    LocalStorage,
+    GridFSStorage,
+    UploadStorage,
+    StatCache,
+    StoredFile,
+    create_storage,
+    configure_storage
+)
+from tests.fake_mongo import FakeDatabase, FakeGridFSBucket
+
+
+class RecordingStorage(UploadStorage):
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, name, local_path):
+        self.published.append(name)
+
+
+class TestLocalStorage(unittest.IsolatedAsyncioTestCase):
+    """Test the local upload directory storage backend"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.storage = LocalStorage(self.dir)
+        (self.dir / "model.ply").write_bytes(b"0123456789")
+        (self.dir / "model.ply.gz").write_bytes(b"gz")
+        (self.dir / "model.ply.low.splat").write_bytes(b"low")
+        (self.dir / ".model.ply.1234.part").write_bytes(b"partial")
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_stat_and_ranged_read(self):
+        stored = await self.storage.stat("model.ply")
+        self.assertEqual(stored.size, 10)
+        self.assertNotEqual(stored.etag(), stored.etag("model.ply"))
+
+        chunks = [chunk async for chunk in self.storage.range_reader("model.ply")(2, 5)]
+        self.assertEqual(b"".join(chunks), b"2345")
+
+    async def test_hidden_and_missing_files_are_not_found(self):
+        self.assertIsNone(await self.storage.stat(".model.ply.1234.part"))
+        self.assertIsNone(await self.storage.stat("missing.ply"))
+        self.assertIsNone(await self.storage.stat("../model.ply"))
+
+    async def test_delete_removes_sidecars(self):
+        (self.dir / "model.ply2").write_bytes(b"other")
+
+        await self.storage.delete("model.ply")
+
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), [".model.ply.1234.part", "model.ply2"])
+
+    async def test_publish_sidecars(self):
+        storage = RecordingStorage()
+        await storage.publish_sidecars("model.ply", self.dir)
+        self.assertEqual(storage.published, ["model.ply.gz", "model.ply.low.splat"])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_storage("ftp", None, self.dir)
+
+    def test_s3_without_bucket(self):
+        with patch.dict("os.environ", {"S3_BUCKET": ""}):
+            with self.assertRaisesRegex(ValueError, "S3_BUCKET"):
+                create_storage("s3", None, self.dir)
+
+
+class TestStatCache(unittest.TestCase):
+    """Test the per-worker stat cache"""
+
+    def setUp(self):
+        self.stored = StoredFile(name="model.ply", size=10, mtime=0, version="v")
+
+    def test_hits_and_misses_are_cached(self):
+        cache = StatCache(ttl=60, miss_ttl=60)
+        cache.put("model.ply", self.stored)
+        cache.put("model.ply.gz", None)
+
+        self.assertEqual(cache.get("model.ply"), (True, self.stored))
+        self.assertEqual(cache.get("model.ply.gz"), (True, None))
+        self.assertEqual(cache.get("other.ply"), (False, None))
+
+    def test_expired_entries_are_misses(self):
+        cache = StatCache(ttl=60, miss_ttl=0)
+        cache.put("model.ply.gz", None)
+
+        self.assertEqual(cache.get("model.ply.gz"), (False, None))
+
+    def test_discard_drops_sidecars(self):
+        cache = StatCache()
+        for name in ("model.ply", "model.ply.gz", "model.ply2"):
+            cache.put(name, self.stored)
+
+        cache.discard("model.ply")
+
+        self.assertFalse(cache.get("model.ply")[0])
+        self.assertFalse(cache.get("model.ply.gz")[0])
+        self.assertTrue(cache.get("model.ply2")[0])
+
+    def test_size_is_bounded(self):
+        cache = StatCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            cache.put(name, self.stored)
+
+        self.assertFalse(cache.get("a")[0])
+        self.assertTrue(cache.get("c")[0])
+
+
+class TestGridFSStorage(unittest.IsolatedAsyncioTestCase):
+    """Test the GridFS storage backend"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.db = FakeDatabase()
+        with patch.object(storage_module, "AsyncIOMotorGridFSBucket", FakeGridFSBucket):
+            self.storage = GridFSStorage(self.db, self.dir)
+
+    async def publish(self, name: str, data: bytes):
+        path = self.dir / f".{name}.part"
+        path.write_bytes(data)
+        await self.storage.publish(name, path)
+        path.unlink()
+
+    async def read(self, name: str, start: int, end: int) -> bytes:
+        return b"".join([chunk async for chunk in self.storage.range_reader(name, chunk_size=3)(start, end)])
+
+    async def test_publish_stat_and_ranged_read(self):
+        await self.publish("model.ply", b"0123456789")
+
+        stored = await self.storage.stat("model.ply")
+        self.assertEqual(stored.size, 10)
+        self.assertIsNone(stored.url)
+        self.assertEqual(await self.read("model.ply", 2, 8), b"2345678")
+        self.assertEqual(await self.read("model.ply", 9, 9), b"9")
+
+    async def test_publishing_a_stored_name_again_uploads_nothing(self):
+        await self.publish("model.ply", b"0123456789")
+        await self.publish("model.ply", b"0123456789")
+
+        self.assertEqual(self.storage.bucket.uploads, 1)
+
+    async def test_files_missing_from_bucket_fall_back_to_local(self):
+        (self.dir / "legacy.ply").write_bytes(b"legacy")
+
+        self.assertEqual((await self.storage.stat("legacy.ply")).size, 6)
+        self.assertEqual(await self.read("legacy.ply", 0, 5), b"legacy")
+        self.assertIsNone(await self.storage.stat("missing.ply"))
+        self.assertIsNone(await self.storage.stat(".hidden.part"))
+
+    async def test_delete_removes_sidecars(self):
+        for name in ("model.ply", "model.ply.gz", "model.ply.low.splat", "model.ply2"):
+            await self.publish(name, name.encode())
+
+        await self.storage.delete("model.ply")
+
+        self.assertEqual(sorted(self.storage.bucket.contents), ["model.ply2"])
+        self.assertIsNone(await self.storage.stat("model.ply.gz"))
+
+    async def test_cached_stat_follows_publish_and_delete(self):
+        self.assertIsNone(await self.storage.cached_stat("model.ply"))
+
+        await self.publish("model.ply", b"0123456789")
+        self.assertEqual((await self.storage.cached_stat("model.ply")).size, 10)
+
+        await self.storage.delete("model.ply")
+        self.assertIsNone(await self.storage.cached_stat("model.ply"))
+
+    async def test_fetch_copies_stored_bytes(self):
+        await self.publish("model.ply", b"0123456789")
+
+        await self.storage.fetch("model.ply", self.dir / "copy.ply")
+
+        self.assertEqual((self.dir / "copy.ply").read_bytes(), b"0123456789")
+        with self.assertRaises(FileNotFoundError):
+            await self.storage.fetch("missing.ply", self.dir / "missing.ply")
+
+    async def test_stored_uploads_keep_no_local_copy(self):
+        configure_storage(self.storage)
+        self.addCleanup(configure_storage, None)
+        data = b"X" * 10_000
+        path = self.dir / ".upload.part"
+        path.write_bytes(data)
+
+        filename, _ = await store_file(self.db, self.dir, path, ".ply", hashlib.sha256(data).hexdigest())
+        await process_upload(self.db, self.dir, filename)
+
+        # Processing worked on a scratch copy and published the sidecars it built
+        self.assertEqual(list(self.dir.iterdir()), [])
+        self.assertEqual(self.storage.bucket.contents[filename], data)
+        self.assertIn(f"{filename}.gz", self.storage.bucket.contents)
+
+
+if __name__ == "__main__":
+    unittest.main()
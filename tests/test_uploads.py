@@ -0,0 +1,121 @@
+import hashlib
+import unittest
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+
+from backend.services.uploads import (
+    stream_upload_to_temp,
+    create_upload_session,
+    write_session_chunk,
+    get_session_status,
+    finalize_upload_session
+)
+
+
+async def _stream(data, piece=1000):
+    for i in range(0, len(data), piece):
+        yield data[i:i + piece]
+
+
+class TestStreamUploadToTemp(unittest.IsolatedAsyncioTestCase):
+    """Test streaming uploads to disk"""
+
+    def setUp(self):
+        """Set up a scratch upload directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.upload_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_writes_file_in_chunks(self):
+        """File content is written intact, with its size and digest"""
+        data = b"X" * 10_000
+        upload = UploadFile(file=BytesIO(data), filename="model.ply")
+        dest = self.upload_dir / ".model.ply.part"
+
+        size, digest = await stream_upload_to_temp(upload, dest, max_size=20_000, chunk_size=1024)
+
+        self.assertEqual(size, len(data))
+        self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+        self.assertEqual(dest.read_bytes(), data)
+
+    async def test_rejects_oversized_file(self):
+        """Oversized uploads fail with 413 before the rest is read"""
+        upload = UploadFile(file=BytesIO(b"X" * 5000), filename="big.ply")
+        dest = self.upload_dir / ".big.ply.part"
+
+        with self.assertRaises(HTTPException) as ctx:
+            await stream_upload_to_temp(upload, dest, max_size=4096, chunk_size=1024)
+
+        self.assertEqual(ctx.exception.status_code, 413)
+        self.assertLessEqual(dest.stat().st_size, 4096)
+
+
+class TestResumableUploadSession(unittest.IsolatedAsyncioTestCase):
+    """Test resumable chunked upload sessions"""
+
+    def setUp(self):
+        """Set up a scratch upload directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.upload_dir = Path(self.tmp.name)
+        self.chunk_size = 256 * 1024
+        self.data = bytes(range(256)) * 3000  # ~750KB, 3 chunks
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _chunk(self, index):
+        return self.data[index * self.chunk_size:(index + 1) * self.chunk_size]
+
+    async def test_out_of_order_chunks_assemble(self):
+        """Chunks sent out of order are assembled into the original file"""
+        session = create_upload_session(
+            self.upload_dir, "scan.ply", len(self.data), max_size=10**9, chunk_size=self.chunk_size
+        )
+        session_id = session["session_id"]
+        self.assertEqual(session["chunk_count"], 3)
+
+        await write_session_chunk(self.upload_dir, session_id, 2, _stream(self._chunk(2)))
+        await write_session_chunk(self.upload_dir, session_id, 0, _stream(self._chunk(0)))
+
+        session_status = get_session_status(self.upload_dir, session_id)
+        self.assertEqual(session_status["received_chunks"], [0, 2])
+        self.assertEqual(session_status["missing_chunks"], [1])
+        self.assertEqual(session_status["offset"], self.chunk_size)
+        self.assertFalse(session_status["complete"])
+
+        dest = self.upload_dir / "scan.ply"
+        with self.assertRaises(HTTPException) as ctx:
+            finalize_upload_session(self.upload_dir, session_id, dest)
+        self.assertEqual(ctx.exception.status_code, 409)
+
+        await write_session_chunk(self.upload_dir, session_id, 1, _stream(self._chunk(1)))
+        finalize_upload_session(self.upload_dir, session_id, dest)
+
+        self.assertEqual(dest.read_bytes(), self.data)
+
+    async def test_short_chunk_is_not_recorded(self):
+        """A truncated chunk is rejected and stays missing"""
+        session = create_upload_session(
+            self.upload_dir, "scan.ply", len(self.data), max_size=10**9, chunk_size=self.chunk_size
+        )
+        session_id = session["session_id"]
+
+        with self.assertRaises(HTTPException) as ctx:
+            await write_session_chunk(self.upload_dir, session_id, 0, _stream(self._chunk(0)[:100]))
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(get_session_status(self.upload_dir, session_id)["missing_chunks"], [0, 1, 2])
+
+    def test_rejects_oversized_session(self):
+        """Sessions larger than the upload limit are refused up front"""
+        with self.assertRaises(HTTPException) as ctx:
+            create_upload_session(self.upload_dir, "scan.ply", 2048, max_size=1024)
+        self.assertEqual(ctx.exception.status_code, 413)
+
+
+if __name__ == "__main__":
+    unittest.main()